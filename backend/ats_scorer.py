@@ -0,0 +1,172 @@
+"""
+Deterministic local ATS scoring
+Computes the keyword matching / placement / density / relevance breakdown without an LLM call,
+weighted 40 / 25 / 15 / 20 (see SCORE_WEIGHTS)
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from keyword_extractor import extract_keywords
+from skill_matcher import SkillMatcher
+
+SCORE_WEIGHTS = {
+    "keyword_matching": 0.40,
+    "keyword_placement": 0.25,
+    "keyword_density": 0.15,
+    "relevance_alignment": 0.20,
+}
+
+# Importance of a JD keyword by how it was found
+KEYWORD_WEIGHTS = {"tool": 3.0, "core": 3.0, "tech": 2.0, "acronyms": 2.0, "phrases": 1.0}
+
+# Occurrences in the resume at which a keyword counts as fully covered
+DENSITY_TARGETS = {"tool": 3, "core": 3}
+DEFAULT_DENSITY_TARGET = 2
+
+# Share of all resume words above which keyword repetition reads as stuffing
+STUFFING_THRESHOLD = 0.25
+
+# Credit for where a keyword appears: Experience highest, Projects medium, Skills lowest
+SECTION_PLACEMENT = [
+    (re.compile(r'experience|employment|work history', re.IGNORECASE), 1.0),
+    (re.compile(r'project', re.IGNORECASE), 0.75),
+    (re.compile(r'summary|profile|objective', re.IGNORECASE), 0.6),
+    (re.compile(r'skill|technolog|tools', re.IGNORECASE), 0.4),
+]
+OTHER_SECTION_PLACEMENT = 0.3
+NO_SECTIONS_PLACEMENT = 0.75
+
+# Cosine similarity at which relevance is treated as perfect alignment
+RELEVANCE_FULL_SIMILARITY = 0.5
+
+WORD_RE = re.compile(r"[a-z][a-z0-9+#]*(?:[.\-/][a-z0-9+#]+)*")
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each either for from further had has have having he her here his how i if in into is it
+its itself just may me more most must my no nor not of off on once only or other our out over own
+per same she should so some such than that the their them then there these they this those through
+to too under until up us very was we were what when where which while who whom why will with within
+would you your yours etc including include includes across well new using use used strong ability
+experience work working team role job position company candidate candidates years year preferred
+required requirements responsibilities plus
+""".split())
+
+
+def _placement_credit(section_title: str) -> float:
+    for pattern, credit in SECTION_PLACEMENT:
+        if pattern.search(section_title):
+            return credit
+    return OTHER_SECTION_PLACEMENT
+
+
+def collect_jd_keywords(
+    job_description: str,
+    is_irrelevant: Optional[Callable[[str], bool]] = None
+) -> List[Tuple[str, float, int]]:
+    """
+    Weighted JD keywords as (display form, weight, density target), highest weight first
+    Keywords rejected by is_irrelevant (cookie/EEO/form text, etc.) are dropped
+    """
+    extraction = extract_keywords(job_description)
+    weighted: Dict[str, Tuple[str, float, int]] = {}
+    order: Dict[str, int] = {}
+    for category, weight in KEYWORD_WEIGHTS.items():
+        target = DENSITY_TARGETS.get(category, DEFAULT_DENSITY_TARGET)
+        for keyword in extraction[category]:
+            key = keyword.lower()
+            if len(key) < 2 or (is_irrelevant and is_irrelevant(keyword)):
+                continue
+            order.setdefault(key, len(order))
+            if key not in weighted or weighted[key][1] < weight:
+                weighted[key] = (keyword, weight, target)
+    return sorted(weighted.values(), key=lambda item: (-item[1], order[item[0].lower()]))
+
+
+def _term_vector(text: str) -> Counter:
+    return Counter(w for w in WORD_RE.findall(text.lower()) if len(w) > 2 and w not in STOPWORDS)
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def score_resume(
+    job_description: str,
+    resume_text: str,
+    sections: List[Tuple[str, str]],
+    is_irrelevant: Optional[Callable[[str], bool]] = None
+) -> Dict:
+    """
+    Score a resume (plain text plus its sections) against a job description
+    Identical inputs always produce identical scores
+
+    Returns:
+        {
+            "ats_score": float,
+            "breakdown": {"keyword_matching", "keyword_placement", "keyword_density", "relevance_alignment"},
+            "found_keywords": List[str],
+            "missing_keywords": List[str]
+        }
+    """
+    jd_keywords = collect_jd_keywords(job_description, is_irrelevant)
+    matcher = SkillMatcher(keyword for keyword, _, _ in jd_keywords)
+
+    total_counts = Counter(term for _, _, term in matcher.find_spans(resume_text))
+
+    # Best placement credit per keyword across the sections it appears in
+    placement: Dict[str, float] = {}
+    titled_sections = [(title, text) for title, text in sections if title != "header"]
+    for title, text in titled_sections:
+        credit = _placement_credit(title)
+        for _, _, term in matcher.find_spans(text):
+            placement[term] = max(placement.get(term, 0.0), credit)
+
+    total_weight = sum(weight for _, weight, _ in jd_keywords)
+    found_weight = placement_sum = density_sum = 0.0
+    found, missing = [], []
+    for keyword, weight, target in jd_keywords:
+        key = keyword.lower()
+        count = total_counts.get(key, 0)
+        if not count:
+            missing.append(keyword)
+            continue
+        found.append(keyword)
+        found_weight += weight
+        credit = placement.get(key, OTHER_SECTION_PLACEMENT) if titled_sections else NO_SECTIONS_PLACEMENT
+        placement_sum += weight * credit
+        density_sum += weight * min(count / target, 1.0)
+
+    keyword_matching = 100.0 * found_weight / total_weight if total_weight else 0.0
+    keyword_placement = 100.0 * placement_sum / found_weight if found_weight else 0.0
+    keyword_density = 100.0 * density_sum / found_weight if found_weight else 0.0
+
+    # Penalize stuffing: keyword occurrences crowding out everything else
+    word_count = max(len(resume_text.split()), 1)
+    stuffing_ratio = sum(total_counts.values()) / word_count
+    if stuffing_ratio > STUFFING_THRESHOLD:
+        keyword_density *= STUFFING_THRESHOLD / stuffing_ratio
+
+    similarity = _cosine(_term_vector(job_description), _term_vector(resume_text))
+    relevance_alignment = 100.0 * min(similarity / RELEVANCE_FULL_SIMILARITY, 1.0)
+
+    breakdown = {
+        "keyword_matching": round(keyword_matching, 1),
+        "keyword_placement": round(keyword_placement, 1),
+        "keyword_density": round(keyword_density, 1),
+        "relevance_alignment": round(relevance_alignment, 1),
+    }
+    ats_score = round(sum(breakdown[name] * weight for name, weight in SCORE_WEIGHTS.items()), 1)
+
+    return {
+        "ats_score": ats_score,
+        "breakdown": breakdown,
+        "found_keywords": found,
+        "missing_keywords": missing,
+    }
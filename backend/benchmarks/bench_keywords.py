@@ -0,0 +1,71 @@
+"""
+Microbenchmark: unified keyword extractor vs. the old per-term re.search loops
+
+Usage (from backend/):
+    python benchmarks/bench_keywords.py
+"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from keyword_extractor import (  # noqa: E402
+    TECH_TERMS, TOOL_TERMS, categorize_for_rewrite, extract_keywords, flatten_keywords
+)
+
+JD_PARAGRAPH = (
+    "We are hiring a Senior Machine Learning Engineer to build Distributed Systems for model serving. "
+    "You will design REST API services in Python and Go on AWS with Docker, Kubernetes and Terraform, "
+    "own CI/CD pipelines, and improve latency, throughput and observability. Experience with PyTorch, "
+    "TensorFlow, PostgreSQL and Redis is a plus. Strong communication, leadership and collaboration. "
+)
+
+
+def legacy_keywords(text: str) -> list:
+    """The old extract_keywords_from_text: one freshly built pattern per dictionary term"""
+    keywords = []
+    text_lower = text.lower()
+    keywords.extend(w for w in re.findall(r'\b[A-Z][A-Za-z0-9+#.]*(?:\s+[A-Z][A-Za-z0-9+#.]*)*\b', text) if len(w) > 2)
+    keywords.extend(re.findall(r'\b[A-Z]{2,6}(?:[/-][A-Z]{2,6})?\b', text))
+    keywords.extend(re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b', text))
+    for tech in TECH_TERMS:
+        if re.search(r'\b' + re.escape(tech) + r'\b', text_lower):
+            keywords.append(tech.title() if ' ' not in tech else tech)
+    return sorted(set(keywords), key=str.lower)
+
+
+def legacy_fast_rewrite_tools(text: str) -> list:
+    """The old inline /fast-rewrite tool loop"""
+    text_lower = text.lower()
+    return [t for t in TOOL_TERMS if re.search(r'\b' + re.escape(t) + r'\b', text_lower)]
+
+
+def legacy_all(text: str):
+    """What one /calculate-ats-score + /fast-rewrite pair used to do on a JD"""
+    legacy_keywords(text)
+    legacy_fast_rewrite_tools(text)
+
+
+def unified_all(text: str):
+    """Same work through the shared extractor (one extraction reused by both consumers)"""
+    extraction = extract_keywords(text)
+    flatten_keywords(extraction)
+    categorize_for_rewrite(extraction)
+
+
+def main():
+    extract_keywords("warm up")  # compile the automaton outside the timed region
+    print(f"{'size':>8} {'legacy ms':>10} {'unified ms':>11} {'speedup':>8}")
+    for repeats in (2, 10, 40):
+        text = JD_PARAGRAPH * repeats
+        runs = 20
+        legacy_s = timeit.timeit(lambda: legacy_all(text), number=runs) / runs
+        unified_s = timeit.timeit(lambda: unified_all(text), number=runs) / runs
+        print(f"{len(text) / 1024:>6.1f}KB {legacy_s * 1000:>10.3f} {unified_s * 1000:>11.3f} {legacy_s / unified_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
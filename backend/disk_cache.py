@@ -0,0 +1,277 @@
+"""
+Persistent content-addressed cache backed by SQLite
+Survives restarts and is shared by every worker process on the same machine
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+def make_cache_key(**parts) -> str:
+    """Build a stable SHA-256 key from the given request parts"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Size-bounded SQLite key/value store with LRU and TTL eviction
+    Values are strings; callers serialize anything else (e.g. JSON) themselves.
+
+    Reads do not write: access times of hits are buffered and flushed in batches, so concurrent readers
+    are not serialized behind SQLite's write lock. Entry count and total size live in a one-row table
+    kept exact by triggers, so a write only evicts when the table is actually over budget, and then walks
+    the accessed_at index from the oldest entry instead of sorting the whole table.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 5000,
+        max_bytes: int = 200 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        access_flush_batch: int = 64,
+        access_flush_seconds: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.access_flush_batch = access_flush_batch
+        self.access_flush_seconds = access_flush_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._pending_access: Dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        # WAL lets several uvicorn workers read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at);
+            CREATE INDEX IF NOT EXISTS idx_cache_created ON cache(created_at);
+            CREATE TABLE IF NOT EXISTS cache_totals (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                entries INTEGER NOT NULL,
+                bytes INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO cache_totals (id, entries, bytes)
+                SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM cache;
+            CREATE TRIGGER IF NOT EXISTS cache_totals_insert AFTER INSERT ON cache BEGIN
+                UPDATE cache_totals SET entries = entries + 1, bytes = bytes + new.size WHERE id = 0;
+            END;
+            CREATE TRIGGER IF NOT EXISTS cache_totals_delete AFTER DELETE ON cache BEGIN
+                UPDATE cache_totals SET entries = entries - 1, bytes = bytes - old.size WHERE id = 0;
+            END;
+            CREATE TRIGGER IF NOT EXISTS cache_totals_update AFTER UPDATE OF size ON cache BEGIN
+                UPDATE cache_totals SET bytes = bytes - old.size + new.size WHERE id = 0;
+            END;
+            COMMIT;
+            """
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value or None; a hit's LRU position is refreshed with the next flush"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._pending_access[key] = now
+            if (len(self._pending_access) >= self.access_flush_batch
+                    or time.monotonic() - self._flushed_at >= self.access_flush_seconds):
+                self._flush_access()
+                self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str):
+        """Store a value and evict expired / least recently used entries if over budget"""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._pending_access.pop(key, None)
+            self._conn.execute(
+                """
+                INSERT INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value, size = excluded.size,
+                    created_at = excluded.created_at, accessed_at = excluded.accessed_at
+                """,
+                (key, value, size, now, now),
+            )
+            self._flush_access()
+            self._evict(now)
+            self._conn.commit()
+
+    def add(self, key: str, value: str, max_age: Optional[float] = None) -> bool:
+        """
+        Store value only if key is absent (or, with max_age, older than max_age seconds)
+        Atomic across processes sharing the file; returns whether this call stored it
+        """
+        now = time.time()
+        with self._lock:
+            if max_age is not None:
+                self._conn.execute("DELETE FROM cache WHERE key = ? AND created_at < ?", (key, now - max_age))
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def update(self, key: str, modify: Callable[[Optional[str]], str]) -> str:
+        """
+        Replace key's value with modify(current value or None) inside one write transaction
+        Atomic across processes sharing the file, so concurrent read-modify-writes never lose an update
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                expired = row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds
+                value = modify(None if row is None or expired else row[0])
+                size = len(value.encode("utf-8"))
+                if size <= self.max_bytes:
+                    self._pending_access.pop(key, None)
+                    self._conn.execute(
+                        """
+                        INSERT INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(key) DO UPDATE SET
+                            value = excluded.value, size = excluded.size,
+                            created_at = excluded.created_at, accessed_at = excluded.accessed_at
+                        """,
+                        (key, value, size, now, now),
+                    )
+                    self._flush_access()
+                    self._evict(now)
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            return value
+
+    def touch(self, key: str):
+        """Restart key's TTL and mark it most recently used"""
+        now = time.time()
+        with self._lock:
+            self._pending_access.pop(key, None)
+            self._conn.execute(
+                "UPDATE cache SET created_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._pending_access.pop(key, None)
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every entry and reset counters"""
+        with self._lock:
+            self._pending_access.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def flush(self):
+        """Write buffered access times now"""
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+
+    def _flush_access(self):
+        """Write buffered hit times in one statement batch (lock held, caller commits)"""
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE cache SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+        self._flushed_at = time.monotonic()
+
+    def _totals(self):
+        """(entries, bytes) from the trigger-maintained totals row"""
+        return self._conn.execute("SELECT entries, bytes FROM cache_totals WHERE id = 0").fetchone()
+
+    def _evict(self, now: float):
+        """Drop expired rows, then the oldest-accessed rows until within budget (lock held)"""
+        if self.ttl_seconds:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self.expirations += max(cursor.rowcount, 0)
+
+        count, total_bytes = self._totals()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        victims = []
+        oldest_first = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC")
+        for key, size in oldest_first:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total_bytes -= size
+        oldest_first.close()
+
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict:
+        """Return entry count, size and hit/miss counters for this process"""
+        with self._lock:
+            count, total_bytes = self._totals()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,148 @@
+"""
+Cached reads of the small on-disk files the API serves (profiles, original resumes)
+Entries are revalidated with one stat() per request and rebuilt only when mtime or size changes.
+Responses carry strong ETags, so a client revalidating an unchanged file gets a 304 with no body.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+class FileSnapshot(NamedTuple):
+    mtime_ns: int
+    size: int
+    value: Any
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for this header)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+def snapshot_response(request: Request, snapshot: FileSnapshot) -> Response:
+    """200 with the cached JSON body, or 304 if the client already holds this version"""
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+class FileSnapshotCache:
+    """Parsed file contents and their serialized JSON responses, keyed by path"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[Path, str], FileSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, build: Callable[[str], Any], variant: str = "") -> FileSnapshot:
+        """
+        Snapshot of path; build(text) turns the file text into the JSON payload
+        Raises FileNotFoundError if the file is gone; build's exceptions propagate and nothing is cached
+        """
+        stat = path.stat()
+        key = (path, variant)
+        entry = self._entries.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            self.hits += 1
+            return entry
+
+        value = build(path.read_text(encoding="utf-8"))
+        body = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        entry = FileSnapshot(stat.st_mtime_ns, stat.st_size, value, body, make_etag(body))
+        with self._lock:
+            self._entries[key] = entry
+            self.misses += 1
+        return entry
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(len(entry.body) for entry in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class ResumeIndex:
+    """
+    The .tex files under the original-resumes directory and the main one among them
+    Built once (at startup) and rescanned only when one of the indexed directories changes
+    """
+
+    def __init__(self, root: Path, preferred_folder: str, preferred_names: List[str]):
+        self.root = root
+        self.preferred_folder = root / preferred_folder
+        self.preferred_names = [name.lower() for name in preferred_names]
+        self.search_dir: Path = root
+        self.tex_files: List[Path] = []
+        self.main_file: Optional[Path] = None
+        self.scans = 0
+        self._directories: Optional[List[Tuple[Path, Optional[int]]]] = None
+        self._lock = threading.Lock()
+
+    def _stale(self) -> bool:
+        return self._directories is None or any(_mtime_ns(d) != mtime for d, mtime in self._directories)
+
+    def _scan(self):
+        search_dir = self.preferred_folder if self.preferred_folder.exists() else self.root
+        directories = [self.root, self.preferred_folder]
+        tex_files: List[Path] = []
+        if search_dir.exists():
+            for current, subdirs, files in os.walk(search_dir):
+                subdirs.sort()
+                directories.append(Path(current))
+                tex_files.extend(Path(current) / name for name in sorted(files) if name.endswith(".tex"))
+
+        main_file = None
+        for name in self.preferred_names:
+            main_file = next((f for f in tex_files if f.name.lower() == name), None)
+            if main_file:
+                break
+        if main_file is None and tex_files:
+            main_file = tex_files[0]
+
+        self.search_dir = search_dir
+        self.tex_files = tex_files
+        self.main_file = main_file
+        self._directories = [(d, _mtime_ns(d)) for d in directories]
+        self.scans += 1
+        print(f"[RESUME-INDEX] {len(tex_files)} .tex files under {search_dir}; main: {main_file.name if main_file else 'none'}")
+
+    def lookup(self) -> Tuple[Path, Optional[Path]]:
+        """(directory searched, main .tex file or None)"""
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    self._scan()
+        return self.search_dir, self.main_file
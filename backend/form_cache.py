@@ -0,0 +1,106 @@
+"""
+Form-structure cache for /analyze-form
+Forms on the same ATS differ only in per-job IDs and values, so analyses are cached under a structural
+fingerprint of the reduced form HTML, scoped to the ATS rule pack (or hostname) serving the form, so a
+form on another site never reuses mappings made without that site's rules. On a hit, IDs and names in
+the cached selectors are rewritten to the ones in the submitted form.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from disk_cache import DiskCache
+from form_rules import detect_site
+from memory_cache import LRUCache, content_digest
+
+FORM_CACHE_ENABLED = os.getenv("FORM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+FORM_CACHE_MAX_ENTRIES = int(os.getenv("FORM_CACHE_MAX_ENTRIES", "512"))
+FORM_CACHE_MAX_BYTES = int(os.getenv("FORM_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+FORM_CACHE_SHARED_PATH = os.getenv("FORM_CACHE_SHARED_PATH")
+
+# Attributes that identify elements (and so end up in selectors); values may embed per-job IDs
+IDENTIFYING_ATTRIBUTE_RE = re.compile(
+    r'\s(id|name|for|aria-labelledby|aria-describedby|aria-controls|aria-owns|data-testid|data-automation-id)="([^"]*)"'
+)
+# Numbers, hex tokens and UUID pieces that change from job to job
+VOLATILE_RE = re.compile(r"[0-9a-f]{8,}|\d+", re.IGNORECASE)
+
+
+def form_skeleton(form_html: str) -> str:
+    """Reduced form HTML with volatile parts of identifying attributes normalized away"""
+    return IDENTIFYING_ATTRIBUTE_RE.sub(
+        lambda m: f' {m.group(1)}="{VOLATILE_RE.sub("#", m.group(2))}"', form_html
+    )
+
+
+def form_scope(url: Optional[str]) -> str:
+    """ATS rule pack serving the page ("greenhouse", "workday", ...), else its hostname ("" without a URL)"""
+    site = detect_site(url)
+    if site is not None:
+        return site
+    return (urlsplit(url).hostname or "").lower() if url else ""
+
+
+def form_fingerprint(form_html: str, scope: str = "") -> str:
+    """Stable digest of the form's tag/type/name/label structure within a scope (see form_scope)"""
+    return content_digest(f"{scope}\n{form_skeleton(form_html)}")
+
+
+def _identifiers(form_html: str) -> List[str]:
+    """Identifying attribute values in document order"""
+    return [m.group(2) for m in IDENTIFYING_ATTRIBUTE_RE.finditer(form_html)]
+
+
+def _rewrite(value: Any, pattern: "re.Pattern", mapping: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return pattern.sub(lambda m: mapping[m.group(0)], value)
+    if isinstance(value, list):
+        return [_rewrite(item, pattern, mapping) for item in value]
+    if isinstance(value, dict):
+        return {key: _rewrite(item, pattern, mapping) for key, item in value.items()}
+    return value
+
+
+class FormAnalysisCache:
+    """LRU of FormAnalysisResponse dicts keyed by form fingerprint"""
+
+    def __init__(self, max_entries: int = FORM_CACHE_MAX_ENTRIES, max_bytes: int = FORM_CACHE_MAX_BYTES,
+                 backend: Optional[DiskCache] = None):
+        self.cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes, backend=backend)
+        self.remapped = 0
+
+    def get(self, form_html: str, url: Optional[str] = None) -> Optional[Dict]:
+        """Cached analysis for a structurally identical form on the same site, with selectors pointing at this form"""
+        entry = self.cache.get(f"form:{form_fingerprint(form_html, form_scope(url))}")
+        if entry is None:
+            return None
+        old_ids = entry["identifiers"]
+        new_ids = _identifiers(form_html)
+        mapping = {old: new for old, new in zip(old_ids, new_ids) if old != new and old}
+        if len(old_ids) != len(new_ids) or not mapping:
+            return entry["analysis"]
+        # Longest first so "q12" is not rewritten as "q1" + "2"
+        pattern = re.compile(
+            r"(?<![\w-])(?:" + "|".join(re.escape(old) for old in sorted(mapping, key=len, reverse=True)) + r")(?![\w-])"
+        )
+        self.remapped += 1
+        return _rewrite(entry["analysis"], pattern, mapping)
+
+    def set(self, form_html: str, analysis: Dict, url: Optional[str] = None):
+        self.cache.set(f"form:{form_fingerprint(form_html, form_scope(url))}", {
+            "analysis": analysis,
+            "identifiers": _identifiers(form_html),
+        })
+
+    def stats(self) -> Dict:
+        stats = self.cache.stats()
+        stats["remapped"] = self.remapped
+        return stats
+
+
+form_analysis_cache: Optional[FormAnalysisCache] = FormAnalysisCache(
+    backend=DiskCache(Path(FORM_CACHE_SHARED_PATH), max_entries=FORM_CACHE_MAX_ENTRIES) if FORM_CACHE_SHARED_PATH else None
+) if FORM_CACHE_ENABLED else None
@@ -0,0 +1,239 @@
+"""
+Form HTML reduction for /analyze-form
+Streams the page HTML through html.parser and keeps only what field analysis needs: form controls,
+labels, legends, options, short question text and the attributes selectors and mappings are built from.
+Scripts, SVGs, styling and layout wrappers are dropped; grouping containers (fieldset, role=group,
+Workday data-automation-id blocks) keep their nesting.
+"""
+
+import os
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+FORM_MAX_SELECT_OPTIONS = int(os.getenv("FORM_MAX_SELECT_OPTIONS", "60"))
+FORM_MAX_TEXT_CHARS = 200          # label / option / button text
+FORM_MAX_LOOSE_TEXT_CHARS = 160    # free text next to controls (e.g. Lever question divs)
+FORM_LOOSE_TEXT_HOPS = 3           # how many control-less wrappers loose text may climb out of
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Elements that are always emitted with their tags
+KEEP_ELEMENTS = {"form", "fieldset", "legend", "label", "select", "optgroup", "option", "textarea", "button"}
+CONTROL_ELEMENTS = {"input", "select", "textarea", "button"}
+# Elements whose text content is kept in full (up to FORM_MAX_TEXT_CHARS)
+TEXT_ELEMENTS = {"label", "legend", "option", "button", "h1", "h2", "h3", "h4", "h5", "h6"}
+# Elements dropped together with everything inside them
+SKIP_ELEMENTS = {
+    "script", "style", "svg", "noscript", "template", "iframe", "head", "canvas",
+    "video", "audio", "picture", "math", "object", "nav", "footer",
+}
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+}
+
+KEPT_ATTRIBUTES = {
+    "id", "name", "type", "for", "placeholder", "required", "multiple", "accept", "role", "autocomplete",
+    "maxlength", "pattern", "disabled", "contenteditable", "data-testid", "data-automation-id", "data-qa",
+}
+# value is user data on text inputs; it only identifies the choice on these
+VALUE_ELEMENTS = {"option", "button"}
+VALUE_INPUT_TYPES = {"radio", "checkbox", "submit", "button"}
+# Layout elements kept (instead of flattened) when they carry one of these
+STRUCTURAL_ROLES = {"group", "radiogroup", "listbox", "dialog", "form", "tabpanel"}
+STRUCTURAL_ATTRIBUTES = {"aria-label", "aria-labelledby", "data-automation-id", "data-testid"}
+# Non-form elements that behave as inputs (rich text editors, custom dropdowns)
+CONTROL_ROLES = {"textbox", "combobox", "checkbox", "radio", "switch", "spinbutton", "slider"}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class _Frame:
+    """One open element; parts are (html, hops) where hops is None for content that contains a control"""
+    __slots__ = ("tag", "open_html", "wrap", "has_control", "parts", "options", "dropped_options", "text")
+
+    def __init__(self, tag: str, open_html: str, wrap: bool, has_control: bool, text: bool):
+        self.tag = tag
+        self.open_html = open_html
+        self.wrap = wrap
+        self.has_control = has_control
+        self.parts: List[Tuple[str, Optional[int]]] = []
+        self.options = 0
+        self.dropped_options = 0
+        self.text = text
+
+
+class FormHTMLReducer(HTMLParser):
+    """Incremental reducer: feed() chunks of HTML, then close() and read result()"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._stack: List[_Frame] = [_Frame("#root", "", False, False, False)]
+        self._skip_depth = 0
+        self._text_depth = 0
+        self.controls = 0
+
+    # --- helpers ------------------------------------------------------------------------------
+
+    def _attributes(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> str:
+        attr_map = {name: value for name, value in attrs}
+        input_type = (attr_map.get("type") or "").lower()
+        kept = []
+        for name, value in attrs:
+            if name in KEPT_ATTRIBUTES or (name.startswith("aria-") and name != "aria-hidden"):
+                pass
+            elif name == "value" and (tag in VALUE_ELEMENTS or input_type in VALUE_INPUT_TYPES):
+                pass
+            elif name == "class" and tag in CONTROL_ELEMENTS and not attr_map.get("id") and not attr_map.get("name"):
+                pass  # only a class is left to build a selector from
+            elif name in ("selected", "checked"):
+                pass
+            else:
+                continue
+            if value is None:
+                kept.append(f" {name}")
+            else:
+                kept.append(f' {name}="{escape(value[:FORM_MAX_TEXT_CHARS], quote=True)}"')
+        return "".join(kept)
+
+    @staticmethod
+    def _is_control(tag: str, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        attr_map = dict(attrs)
+        if tag in CONTROL_ELEMENTS:
+            return True
+        return (attr_map.get("role") or "") in CONTROL_ROLES or attr_map.get("contenteditable") in ("", "true")
+
+    @staticmethod
+    def _is_structural(attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        for name, value in attrs:
+            if name == "role" and value in STRUCTURAL_ROLES:
+                return True
+            if name in STRUCTURAL_ATTRIBUTES and value:
+                return True
+        return False
+
+    def _emit(self, html: str, hops: Optional[int] = 0):
+        self._stack[-1].parts.append((html, hops))
+        if hops is None:
+            self._stack[-1].has_control = True
+
+    def _close_frame(self):
+        frame = self._stack.pop()
+        parent = self._stack[-1]
+        if frame.text:
+            self._text_depth -= 1
+        if frame.dropped_options:
+            frame.parts.append((f"<!-- {frame.dropped_options} more options -->", None))
+
+        if frame.has_control:
+            body = "".join(html for html, _ in frame.parts)
+            if frame.wrap:
+                body = f"{frame.open_html}{body}</{frame.tag}>\n"
+            parent.parts.append((body, None))
+            parent.has_control = True
+            return
+
+        # No control inside: keep the content only while it stays close to one
+        if frame.wrap and frame.parts:
+            body = "".join(html for html, _ in frame.parts)
+            hops = max(h for _, h in frame.parts)
+            if hops < FORM_LOOSE_TEXT_HOPS:
+                parent.parts.append((f"{frame.open_html}{body}</{frame.tag}>", hops + 1))
+            return
+        for html, hops in frame.parts:
+            if hops < FORM_LOOSE_TEXT_HOPS:
+                parent.parts.append((html, hops + 1))
+
+    # --- HTMLParser callbacks -----------------------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if self._skip_depth:
+            if tag not in VOID_ELEMENTS:
+                self._skip_depth += 1
+            return
+        if tag in SKIP_ELEMENTS:
+            self._skip_depth = 1
+            return
+
+        attr_map = dict(attrs)
+        if tag == "input" and (attr_map.get("type") or "").lower() == "hidden":
+            return
+        if tag == "option":
+            select = self._stack[-1] if self._stack[-1].tag in ("select", "optgroup") else None
+            if select is None and len(self._stack) > 1 and self._stack[-2].tag == "select":
+                select = self._stack[-2]
+            if select is not None:
+                select.options += 1
+                if select.options > FORM_MAX_SELECT_OPTIONS:
+                    select.dropped_options += 1
+                    self._skip_depth = 1
+                    return
+
+        if tag in VOID_ELEMENTS:
+            if self._is_control(tag, attrs):
+                self.controls += 1
+                self._emit(f"<{tag}{self._attributes(tag, attrs)}>\n", None)
+            return
+
+        is_control = self._is_control(tag, attrs)
+        wrap = tag in KEEP_ELEMENTS or is_control or self._is_structural(attrs)
+        open_html = f"<{tag}{self._attributes(tag, attrs)}>" if wrap else ""
+        text = tag in TEXT_ELEMENTS
+        if text:
+            self._text_depth += 1
+        if is_control:
+            self.controls += 1
+        self._stack.append(_Frame(tag, open_html, wrap, is_control, text))
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag in VOID_ELEMENTS:
+            self.handle_starttag(tag, attrs)
+        else:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str):
+        if self._skip_depth:
+            if tag not in VOID_ELEMENTS:
+                self._skip_depth -= 1
+            return
+        if tag in VOID_ELEMENTS or not any(frame.tag == tag for frame in self._stack[1:]):
+            return  # stray end tag
+        while self._stack[-1].tag != tag:
+            self._close_frame()
+        self._close_frame()
+
+    def handle_data(self, data: str):
+        if self._skip_depth or self._stack[-1].tag == "textarea":
+            return
+        text = _WHITESPACE_RE.sub(" ", data)  # keep one edge space so "Name <span>*</span>" stays apart
+        if not text.strip():
+            return
+        if self._text_depth:
+            self._emit(escape(text[:FORM_MAX_TEXT_CHARS], quote=False))
+        elif len(text) <= FORM_MAX_LOOSE_TEXT_CHARS:
+            self._emit(escape(text, quote=False))
+
+    # --- result -------------------------------------------------------------------------------
+
+    def result(self) -> str:
+        while len(self._stack) > 1:
+            self._close_frame()
+        root = self._stack[0]
+        return "".join(html for html, hops in root.parts if hops is None or root.has_control)
+
+
+def minify_form_html(form_html: str) -> str:
+    """Reduce page/form HTML to the controls, labels and structure needed for field analysis"""
+    if not form_html:
+        return form_html
+    reducer = FormHTMLReducer()
+    for start in range(0, len(form_html), FEED_CHUNK_SIZE):
+        reducer.feed(form_html[start:start + FEED_CHUNK_SIZE])
+    reducer.close()
+    reduced = reducer.result()
+    if not reducer.controls:
+        return form_html  # nothing recognizable; let the budgeter cut the raw HTML instead
+    ratio = len(form_html) / max(1, len(reduced))
+    print(f"[FORM-MINIFY] {len(form_html)} -> {len(reduced)} chars ({ratio:.1f}x, {reducer.controls} controls)")
+    return reduced
@@ -0,0 +1,349 @@
+"""
+Rule-based field mapping for known ATS sites
+Extracts the controls from reduced form HTML and maps the standard ones (name, email, phone, resume,
+LinkedIn, work authorization, ...) with per-site rule packs keyed off the page URL. Only the controls
+no rule recognizes are left for the LLM.
+"""
+
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+# Host patterns per ATS vendor (same vendors FORM_ANALYSIS_PROMPT asks the LLM to detect)
+SITE_PATTERNS = [
+    ("greenhouse", re.compile(r"(^|\.)greenhouse\.io$|(^|\.)grnh\.se$")),
+    ("lever", re.compile(r"(^|\.)lever\.co$")),
+    ("workday", re.compile(r"(^|\.)myworkdayjobs\.com$|(^|\.)myworkdaysite\.com$|(^|\.)workday\.com$")),
+    ("linkedin", re.compile(r"(^|\.)linkedin\.com$")),
+]
+_HOST_RE = re.compile(r"^[a-z][a-z0-9+.-]*://([^/:?#]+)", re.IGNORECASE)
+
+# Values understood by the extension's form filler (getValueForField)
+FILE_UPLOAD_TYPES = {"resume", "coverLetter"}
+
+
+class FieldRule(NamedTuple):
+    mapped_to: str
+    identifier: Optional[Pattern] = None   # matched against id, name and data-automation-id
+    label: Optional[Pattern] = None        # matched against label, aria-label and placeholder
+    types: Tuple[str, ...] = ()            # restrict to these control types
+
+
+def _rule(mapped_to: str, identifier: str = None, label: str = None, types: Tuple[str, ...] = ()) -> FieldRule:
+    return FieldRule(
+        mapped_to,
+        re.compile(identifier, re.IGNORECASE) if identifier else None,
+        re.compile(label, re.IGNORECASE) if label else None,
+        types,
+    )
+
+
+# Vendor field naming is stable across every employer on the platform
+SITE_RULES: Dict[str, List[FieldRule]] = {
+    "greenhouse": [
+        _rule("firstName", identifier=r"^(job_application\[)?first_name\]?$"),
+        _rule("lastName", identifier=r"^(job_application\[)?last_name\]?$"),
+        _rule("email", identifier=r"^(job_application\[)?email\]?$"),
+        _rule("phone", identifier=r"^(job_application\[)?phone\]?$"),
+        _rule("resume", identifier=r"^resume(_text)?$", types=("file", "textarea")),
+        _rule("coverLetter", identifier=r"^cover_letter(_text)?$", types=("file", "textarea")),
+    ],
+    "lever": [
+        _rule("fullName", identifier=r"^name$"),
+        _rule("email", identifier=r"^email$"),
+        _rule("phone", identifier=r"^phone$"),
+        _rule("linkedin", identifier=r"^urls\[linkedin\]$"),
+        _rule("resume", identifier=r"^resume$", types=("file",)),
+    ],
+    "workday": [
+        _rule("firstName", identifier=r"(legalName.*)?firstName$"),
+        _rule("lastName", identifier=r"(legalName.*)?lastName$"),
+        _rule("email", identifier=r"^email(Address)?$"),
+        _rule("phoneType", identifier=r"phone-device-type|phoneType"),
+        _rule("phone", identifier=r"phone-?number$"),
+        _rule("address", identifier=r"addressLine1$"),
+        _rule("city", identifier=r"(address.*)?city$"),
+        _rule("zip", identifier=r"postalCode$"),
+        _rule("country", identifier=r"countryDropdown$|^country$"),
+        _rule("resume", identifier=r"file-upload-input-ref|select-files", types=("file",)),
+        _rule("linkedin", identifier=r"linkedin"),
+    ],
+    "linkedin": [],
+}
+
+# Label-based rules applied on every known site after its own pack; order matters (first match wins)
+COMMON_RULES: List[FieldRule] = [
+    _rule("email", types=("email",)),
+    _rule("phone", types=("tel",)),
+    _rule("phoneType", label=r"phone\s+(device\s+)?type"),
+    _rule("firstName", label=r"^\W*(legal\s+|preferred\s+)?first\s+name\b|\bgiven\s+name"),
+    _rule("lastName", label=r"^\W*(legal\s+)?(last\s+name|surname|family\s+name)\b"),
+    _rule("fullName", label=r"^\W*(full\s+)?name\W*$"),
+    _rule("email", label=r"^\W*e-?mail(\s+address)?\W*$"),
+    _rule("phone", label=r"^\W*(phone|mobile)(\s+number)?\W*$"),
+    _rule("linkedin", label=r"linkedin"),
+    _rule("resume", label=r"resume|\bcv\b|curriculum vitae", types=("file",)),
+    _rule("coverLetter", label=r"cover\s+letter", types=("file",)),
+    _rule("workAuthorization",
+          label=r"(legally\s+)?authori[sz]ed\s+to\s+work|work\s+authori[sz]ation|"
+                r"(eligible|eligibility)\s+to\s+work|right\s+to\s+work",
+          types=("select", "radio", "checkbox", "combobox")),
+]
+
+
+def detect_site(url: Optional[str]) -> Optional[str]:
+    """ATS vendor serving the page ("greenhouse", "lever", "workday", "linkedin") or None"""
+    match = _HOST_RE.match(url or "")
+    if not match:
+        return None
+    host = match.group(1).lower()
+    for site, pattern in SITE_PATTERNS:
+        if pattern.search(host):
+            return site
+    return None
+
+
+class FormFieldExtractor(HTMLParser):
+    """Collects controls with their labels from reduced form HTML (see form_minifier)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields: List[Dict] = []
+        self._label_for: Dict[str, str] = {}
+        self._text_by_id: Dict[str, List[str]] = {}
+        self._open: List[Tuple[str, Dict]] = []       # open non-void elements: (tag, attrs)
+        self._label_fields: List[List[Dict]] = []       # controls inside each open <label>
+        self._label_text: List[List[str]] = []
+        self._legend: List[str] = []                    # per open fieldset
+        self._select: Optional[Dict] = None
+        self._option_text: Optional[List[str]] = None
+        self._recent_text = ""
+
+    def _new_field(self, tag: str, attrs: Dict) -> Dict:
+        if tag == "input":
+            control_type = (attrs.get("type") or "text").lower()
+        elif tag in ("select", "textarea"):
+            control_type = tag
+        elif attrs.get("contenteditable") is not None:
+            control_type = "contenteditable"
+        else:
+            control_type = attrs.get("role") or tag
+        automation_id = attrs.get("data-automation-id") or next(
+            (a.get("data-automation-id") for _, a in reversed(self._open) if a.get("data-automation-id")), None
+        )
+        field = {
+            "id": attrs.get("id"),
+            "name": attrs.get("name"),
+            "type": control_type,
+            "label": attrs.get("aria-label"),
+            "placeholder": attrs.get("placeholder"),
+            "selector": self._selector(tag, attrs, automation_id),
+            "required": "required" in attrs or attrs.get("aria-required") == "true",
+            "mappedTo": None,
+            "options": [],
+            "_automation_id": automation_id,
+            "_labelledby": attrs.get("aria-labelledby"),
+            "_fallback_label": self._legend[-1] if self._legend and control_type in ("radio", "checkbox") else self._recent_text,
+            "_value": attrs.get("value"),
+            "_accept": attrs.get("accept"),
+        }
+        self._recent_text = ""  # question text labels one control only
+        self.fields.append(field)
+        if self._label_fields:
+            self._label_fields[-1].append(field)
+        return field
+
+    @staticmethod
+    def _selector(tag: str, attrs: Dict, automation_id: Optional[str]) -> str:
+        if attrs.get("id"):
+            return f"#{attrs['id']}"
+        if attrs.get("name"):
+            return f'[name="{attrs["name"]}"]'
+        if attrs.get("data-automation-id"):
+            return f'[data-automation-id="{attrs["data-automation-id"]}"]'
+        if attrs.get("aria-label"):
+            return f'{tag}[aria-label="{attrs["aria-label"]}"]'
+        if automation_id:
+            return f'[data-automation-id="{automation_id}"] {tag}'
+        if attrs.get("class"):
+            return "." + ".".join(attrs["class"].split())
+        return tag
+
+    def handle_starttag(self, tag: str, attr_list: List[Tuple[str, Optional[str]]]):
+        attrs = {name: ("" if value is None else value) for name, value in attr_list}
+        if tag == "input":
+            if (attrs.get("type") or "").lower() not in ("submit", "button", "reset", "image"):
+                self._new_field(tag, attrs)
+            return
+        self._open.append((tag, attrs))
+        if attrs.get("id"):
+            self._text_by_id[attrs["id"]] = []
+        if tag == "label":
+            self._label_fields.append([])
+            self._label_text.append([])
+            if attrs.get("for"):
+                self._label_for.setdefault(attrs["for"], "")
+        elif tag == "fieldset":
+            self._legend.append("")
+        elif tag == "select":
+            self._select = self._new_field(tag, attrs)
+        elif tag == "option":
+            self._option_text = []
+        elif tag == "textarea" or attrs.get("contenteditable") is not None or \
+                attrs.get("role") in ("textbox", "combobox", "checkbox", "radio", "switch", "spinbutton", "slider"):
+            self._new_field(tag, attrs)
+        elif tag == "button" and attrs.get("aria-haspopup") == "listbox":
+            self._new_field(tag, dict(attrs, role="combobox"))  # Workday-style dropdown
+
+    def handle_endtag(self, tag: str):
+        if not any(open_tag == tag for open_tag, _ in self._open):
+            return
+        while self._open:
+            open_tag, attrs = self._open.pop()
+            self._close(open_tag, attrs)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag: str, attrs: Dict):
+        if tag == "label":
+            fields = self._label_fields.pop()
+            text = " ".join("".join(self._label_text.pop()).split())
+            if attrs.get("for"):
+                self._label_for[attrs["for"]] = text
+            for field in fields:
+                if field["type"] in ("radio", "checkbox"):
+                    field["_choice"] = text
+                elif not field["label"]:
+                    field["label"] = text
+            self._recent_text = text
+        elif tag == "fieldset" and self._legend:
+            self._legend.pop()
+        elif tag == "option" and self._select is not None and self._option_text is not None:
+            self._select["options"].append(" ".join("".join(self._option_text).split()))
+            self._option_text = None
+        elif tag == "select":
+            self._select = None
+
+    def handle_data(self, data: str):
+        for _, attrs in self._open:
+            if attrs.get("id") in self._text_by_id:
+                self._text_by_id[attrs["id"]].append(data)
+        if self._option_text is not None:
+            self._option_text.append(data)
+            return
+        if self._label_text:
+            self._label_text[-1].append(data)
+        text = " ".join(data.split())
+        if not text or self._select is not None or any(tag == "button" for tag, _ in self._open):
+            return
+        if self._open and self._open[-1][0] == "legend" and self._legend:
+            self._legend[-1] = (self._legend[-1] + " " + text).strip()
+        elif not self._label_text:
+            self._recent_text = text
+
+    def result(self) -> List[Dict]:
+        """Fields in document order; radio/checkbox inputs sharing a name become one field with options"""
+        fields: List[Dict] = []
+        groups: Dict[str, Dict] = {}
+        for field in self.fields:
+            if not field["label"] and field["id"] and self._label_for.get(field["id"]):
+                field["label"] = self._label_for[field["id"]]
+            if not field["label"] and field["_labelledby"]:
+                field["label"] = " ".join(
+                    " ".join("".join(self._text_by_id.get(ref, [])).split()) for ref in field["_labelledby"].split()
+                ).strip() or None
+            if field["type"] in ("radio", "checkbox") and field["name"]:
+                choice = field.pop("_choice", None) or field["label"] or field["_value"]
+                group = groups.get(field["name"])
+                if group is not None:
+                    if choice:
+                        group["options"].append(choice)
+                    continue
+                field["selector"] = f'[name="{field["name"]}"]'
+                field["label"] = field["_fallback_label"] or field["label"]
+                field["options"] = [choice] if choice else []
+                groups[field["name"]] = field
+            if not field["label"]:
+                field["label"] = field["_fallback_label"] or None
+            fields.append(field)
+        return fields
+
+
+def extract_form_fields(form_html: str) -> List[Dict]:
+    """Controls of a reduced form with id, name, type, label, placeholder, selector, required and options"""
+    extractor = FormFieldExtractor()
+    extractor.feed(form_html)
+    extractor.close()
+    return extractor.result()
+
+
+def _matches(rule: FieldRule, field: Dict) -> bool:
+    if rule.types and field["type"] not in rule.types:
+        return False
+    if rule.identifier is not None:
+        identifiers = [field["id"], field["name"], field["_automation_id"]]
+        if not any(value and rule.identifier.search(value) for value in identifiers):
+            return False
+    if rule.label is not None:
+        labels = [field["label"], field["placeholder"]]
+        if not any(value and rule.label.search(value) for value in labels):
+            return False
+    return rule.identifier is not None or rule.label is not None or bool(rule.types)
+
+
+def public_field(field: Dict) -> Dict:
+    """Field dict as returned by /analyze-form (internal keys dropped)"""
+    return {key: value for key, value in field.items() if not key.startswith("_")}
+
+
+def map_form_fields(fields: List[Dict], site: str) -> Tuple[List[Dict], List[Dict]]:
+    """(mapped, leftover): fields a rule in the site's pack (or the common rules) recognizes, and the rest"""
+    rules = SITE_RULES.get(site, []) + COMMON_RULES
+    mapped, leftover = [], []
+    for field in fields:
+        rule = next((rule for rule in rules if _matches(rule, field)), None)
+        if rule is None:
+            leftover.append(field)
+        else:
+            field["mappedTo"] = rule.mapped_to
+            mapped.append(field)
+    return mapped, leftover
+
+
+def file_upload_entries(fields: List[Dict]) -> List[Dict]:
+    """file_uploads entries for the mapped file inputs"""
+    return [
+        {
+            "selector": field["selector"],
+            "type": field["mappedTo"] if field["mappedTo"] in FILE_UPLOAD_TYPES else "other",
+            "accept": field["_accept"] or None,
+        }
+        for field in fields if field["type"] == "file"
+    ]
+
+
+def render_fields_html(fields: List[Dict]) -> str:
+    """Compact HTML for the leftover controls, used as the LLM prompt input"""
+    lines = []
+    for field in fields:
+        attrs = "".join(
+            f' {name}="{escape(str(field[key]), quote=True)}"'
+            for name, key in (("id", "id"), ("name", "name"), ("placeholder", "placeholder"))
+            if field[key]
+        )
+        if field["_automation_id"]:
+            attrs += f' data-automation-id="{escape(field["_automation_id"], quote=True)}"'
+        if field["required"]:
+            attrs += " required"
+        label_for = f' for="{escape(field["id"], quote=True)}"' if field["id"] else ""
+        label = f'<label{label_for}>{escape(field["label"] or "", quote=False)}</label>'
+        if field["type"] in ("select", "radio", "checkbox") and field["options"]:
+            options = "".join(f"<option>{escape(option, quote=False)}</option>" for option in field["options"])
+            tag = "select" if field["type"] == "select" else f'fieldset data-type="{field["type"]}"'
+            lines.append(f"{label}<{tag}{attrs}>{options}</{tag.split()[0]}>")
+        elif field["type"] in ("textarea", "contenteditable"):
+            lines.append(f"{label}<textarea{attrs}></textarea>")
+        else:
+            lines.append(f'{label}<input type="{escape(field["type"], quote=True)}"{attrs}>')
+    return "\n".join(lines)
@@ -0,0 +1,244 @@
+"""
+Per-session form analysis state for multi-step applications
+Remembers which controls of a session's forms were already analyzed, so each new step only sends its
+new or changed controls to the LLM; responses merge the new results with the earlier ones.
+Sessions live in a SQLite file shared by all uvicorn workers, so a step may land on any worker.
+"""
+
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from disk_cache import DiskCache
+
+FORM_SESSION_PATH = Path(os.getenv(
+    "FORM_SESSION_PATH", str(Path(__file__).resolve().parent / ".cache" / "form_sessions.sqlite3")
+))
+# Sessions expire this long after their last analyzed step
+FORM_SESSION_TTL_SECONDS = float(os.getenv("FORM_SESSION_TTL_SECONDS", "1800"))
+FORM_SESSION_MAX_SESSIONS = int(os.getenv("FORM_SESSION_MAX_SESSIONS", "1000"))
+
+# Query parameters that carry the job / requisition ID on ATS pages (compared lowercased)
+REQUISITION_PARAMS = ("gh_jid", "token", "jobid", "job_id", "jid", "jobreqid", "requisitionid", "reqid", "req", "postingid")
+# Path segments where the per-step part of an application URL starts (Lever .../apply, Workday .../apply/applyManually)
+APPLY_SEGMENT_RE = re.compile(r"^(apply|application$)", re.IGNORECASE)
+
+
+def application_key(url: Optional[str]) -> str:
+    """
+    Identity of the job application a page belongs to: host plus requisition ID, or host plus the job path
+    with its apply-step segments cut off. Mirrored by getApplicationKey() in chrome-extension/form-filler.js.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    params = {key.lower(): value for key, value in parse_qsl(parts.query)}
+    for param in REQUISITION_PARAMS:
+        if params.get(param):
+            return f"{host}?{param}={params[param]}"
+    segments = []
+    for segment in parts.path.split("/"):
+        if APPLY_SEGMENT_RE.match(segment):
+            break
+        if segment:
+            segments.append(segment)
+    return host + "/" + "/".join(segments)
+
+
+def control_signature(field: Dict) -> Tuple:
+    """What makes a control "the same" between submissions: a changed label or option list is re-analyzed"""
+    return (field.get("type"), field.get("label"), tuple(field.get("options") or ()))
+
+
+class FormSession:
+    """Analyzed fields of one application session, keyed by selector in first-seen order"""
+
+    def __init__(self, application: str = ""):
+        self.application = application
+        self.fields: "OrderedDict[str, Dict]" = OrderedDict()
+        self.signatures: Dict[str, Tuple] = {}
+        self.steps: List[Dict] = []
+        self.file_uploads: "OrderedDict[str, Dict]" = OrderedDict()
+        self.site_type: Optional[str] = None
+        self.touched = time.monotonic()
+
+    @property
+    def analyzed(self) -> bool:
+        return bool(self.signatures)
+
+    def new_controls(self, controls: List[Dict]) -> List[Dict]:
+        """Controls not analyzed yet in this session, or changed since"""
+        return [c for c in controls if self.signatures.get(c["selector"]) != control_signature(c)]
+
+    def record(self, controls: List[Dict], analysis: Dict):
+        """Store an analysis of `controls`; analyzed fields are matched back to controls by id or name"""
+        by_identifier = {}
+        for control in controls:
+            for key in ("id", "name"):
+                if control.get(key):
+                    by_identifier.setdefault((key, control[key]), control["selector"])
+        for field in analysis.get("fields") or []:
+            selector = next(
+                (by_identifier[(key, field[key])] for key in ("id", "name") if field.get(key) and (key, field[key]) in by_identifier),
+                field.get("selector")
+            )
+            if selector:
+                self.fields[selector] = field
+        for control in controls:
+            self.signatures[control["selector"]] = control_signature(control)
+        for upload in analysis.get("file_uploads") or []:
+            self.file_uploads[upload.get("selector")] = upload
+        known_steps = {step.get("name") for step in self.steps}
+        self.steps.extend(step for step in analysis.get("steps") or [] if step.get("name") not in known_steps)
+        self.site_type = self.site_type or analysis.get("site_type")
+
+    def to_dict(self) -> Dict:
+        return {
+            "application": self.application,
+            "fields": list(self.fields.items()),
+            "signatures": self.signatures,
+            "steps": self.steps,
+            "file_uploads": list(self.file_uploads.items()),
+            "site_type": self.site_type,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FormSession":
+        session = cls(data.get("application", ""))
+        session.fields = OrderedDict(data.get("fields") or [])
+        # JSON turns the signature tuples into lists; rebuild them so they compare equal to control_signature()
+        session.signatures = {
+            selector: (kind, label, tuple(options)) for selector, (kind, label, options) in (data.get("signatures") or {}).items()
+        }
+        session.steps = data.get("steps") or []
+        session.file_uploads = OrderedDict(data.get("file_uploads") or [])
+        session.site_type = data.get("site_type")
+        return session
+
+    def response(self) -> Dict:
+        """FormAnalysisResponse fields for everything analyzed in the session so far"""
+        return {
+            "fields": list(self.fields.values()),
+            "steps": self.steps or None,
+            "site_type": self.site_type,
+            "file_uploads": list(self.file_uploads.values()),
+        }
+
+
+class FormSessionStore:
+    """
+    Sessions by client-chosen ID
+    With a shared backend every get() reads the latest state and restarts its TTL, and record() merges a step's
+    analysis into the stored state in one transaction, so steps handled by different workers (even at the same
+    time) see each other's analyses and never overwrite them; expiry and eviction are the backend's TTL/LRU.
+    Without one, sessions are kept in this process, evicted least-recently-used and after
+    FORM_SESSION_TTL_SECONDS idle.
+    """
+
+    def __init__(self, max_sessions: int = FORM_SESSION_MAX_SESSIONS, ttl_seconds: float = FORM_SESSION_TTL_SECONDS,
+                 backend: Optional[DiskCache] = None):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.evictions = 0
+        self.resets = 0
+        self.incremental = 0
+        self.controls_skipped = 0
+        self._sessions: "OrderedDict[str, FormSession]" = OrderedDict()
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"form-session:{session_id}"
+
+    def get(self, session_id: str, application: str = "") -> FormSession:
+        """
+        The session for session_id, created if missing or expired
+        A session ID reused for a different application (see application_key) starts a fresh session,
+        so another job's field mappings are never merged in
+        """
+        if self.backend is not None:
+            stored = self.backend.get(self._key(session_id))
+            session = FormSession.from_dict(json.loads(stored)) if stored is not None else None
+            if session is not None and session.application == application:
+                self.backend.touch(self._key(session_id))  # a step with nothing new still keeps the session alive
+        else:
+            session = self._local(session_id)
+
+        if session is not None and session.application != application:
+            print(f"[FORM-SESSION] {session_id}: application changed ({session.application or 'unknown'} -> "
+                  f"{application or 'unknown'}), starting over")
+            session = None
+            self.resets += 1
+        if session is None:
+            session = FormSession(application)
+            if self.backend is None:
+                self._sessions[session_id] = session
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evictions += 1
+        return session
+
+    def record(self, session_id: str, session: FormSession, controls: List[Dict], analysis: Dict) -> FormSession:
+        """
+        Record a step's analysis of `controls` and return the session to respond from
+        With a shared backend the analysis is merged into the latest stored state, which may hold steps
+        recorded by other workers since get(); in-process sessions are updated in place
+        """
+        if self.backend is None:
+            session.record(controls, analysis)
+            return session
+
+        merged = session
+
+        def merge(stored: Optional[str]) -> str:
+            nonlocal merged
+            merged = FormSession.from_dict(json.loads(stored)) if stored is not None else None
+            if merged is None or merged.application != session.application:
+                merged = FormSession(session.application)
+            merged.record(controls, analysis)
+            return json.dumps(merged.to_dict())
+
+        self.backend.update(self._key(session_id), merge)
+        return merged
+
+    def _local(self, session_id: str) -> Optional[FormSession]:
+        """In-process session for session_id, after dropping expired ones"""
+        now = time.monotonic()
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if now - oldest.touched <= self.ttl_seconds:
+                break
+            del self._sessions[oldest_id]
+            self.evictions += 1
+
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            session.touched = now
+        return session
+
+    def stats(self) -> Dict:
+        stats = {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "incremental_analyses": self.incremental,
+            "controls_skipped": self.controls_skipped,
+            "evictions": self.evictions,
+            "resets": self.resets,
+        }
+        if self.backend is not None:
+            backend = self.backend.stats()
+            stats.update(sessions=backend["entries"], evictions=backend["evictions"] + backend["expirations"])
+        return stats
+
+
+form_sessions = FormSessionStore(backend=DiskCache(
+    FORM_SESSION_PATH, max_entries=FORM_SESSION_MAX_SESSIONS, ttl_seconds=FORM_SESSION_TTL_SECONDS
+))
@@ -0,0 +1,283 @@
+"""
+Job description cleaning
+Removes boilerplate paragraphs (cookie banners, EEO statements, application-form and footer text) from
+scraped job descriptions before they are put into prompts, and holds the keyword-level rules that keep
+that kind of text and non-actionable requirements out of ATS keyword lists. All rules are compiled once.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Tuple
+
+from metrics import JD_TOKENS_REMOVED
+from prompt_budget import LOW_VALUE_HEADING_RE, REQUIREMENT_CUE_RE, count_tokens
+from skill_matcher import get_skill_matcher
+
+# --- keyword-level rules (used to filter extracted JD keywords) ---------------------------------
+
+# Cookie/privacy/form keywords that should NOT appear in job requirements
+IRRELEVANT_KEYWORDS = [
+    'cookie', 'cookies', 'consent', 'privacy policy', 'privacy', 'personal data',
+    'data protection', 'gdpr', 'tracking', 'targeting',
+    'apply now', 'submit', 'upload', 'browse', 'choose file', 'required field',
+    'first name', 'last name', 'email', 'phone', 'address', 'city', 'state', 'zip',
+    'click here', 'learn more', 'read more', 'view job', 'share job', 'save job',
+    'follow us', 'connect with us', 'social media', 'copyright', 'all rights reserved'
+]
+
+# Non-actionable requirements (qualifications/eligibility, not technical skills)
+NON_ACTIONABLE_PATTERNS = [
+    r'\b\d+\s*(months?|years?|weeks?)\s*(of\s*)?(experience|work|employment)',
+    r'\bless\s+than\s+or\s+equal\s+to\s+\d+',
+    r'\bmore\s+than\s+\d+',
+    r'\bat\s+least\s+\d+',
+    r'\bminimum\s+of\s+\d+',
+    r'\bmaximum\s+of\s+\d+',
+    r'\bsecurity\s+clearance',
+    r'\bability\s+to\s+obtain\s+clearance',
+    r'\bobtain\s+and\s+maintain\s+clearance',
+    r'\beligible\s+for\s+clearance',
+    r'\bBachelor\'?s?\s+(degree|of\s+Science|of\s+Arts)',
+    r'\bMaster\'?s?\s+(degree|of\s+Science|of\s+Arts)',
+    r'\bPhD\b',
+    r'\bDoctorate\b',
+    r'\bdegree\s+in\s+[A-Z]',
+    r'\bmust\s+be\s+located',
+    r'\bwilling\s+to\s+relocate',
+    r'\bwork\s+authorization',
+    r'\blegal\s+right\s+to\s+work',
+    r'\bUS\s+citizen',
+    r'\bpermanent\s+resident',
+]
+
+# Only irrelevant alone or next to cookie terms (e.g. "analytics" in a cookie banner)
+CONTEXT_DEPENDENT_KEYWORDS = ['analytics', 'performance']
+COOKIE_CONTEXT_TERMS = ['cookie', 'privacy', 'consent', 'tracking', 'targeting']
+COOKIE_PHRASES = [
+    'cookie', 'cookies', 'privacy', 'consent', 'personal data',
+    'data privacy', 'cookie consent', 'cookie policy'
+]
+
+# Generic soft-skill phrasing, filtered only when the keyword is short (< 8 words)
+GENERIC_NON_TECHNICAL = [
+    'must be', 'required to be', 'must have', 'should have',
+    'team player', 'good communication', 'strong communication',
+    'work well in', 'collaborative', 'self-motivated'
+]
+
+IRRELEVANT_KEYWORD_RE = re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in IRRELEVANT_KEYWORDS) + r')\b')
+NON_ACTIONABLE_RE = re.compile('|'.join(f'(?:{p})' for p in NON_ACTIONABLE_PATTERNS), re.IGNORECASE)
+CONTEXT_DEPENDENT_RE = re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in CONTEXT_DEPENDENT_KEYWORDS) + r')\b')
+CONTEXT_DEPENDENT_ALONE = frozenset(CONTEXT_DEPENDENT_KEYWORDS + [k + 's' for k in CONTEXT_DEPENDENT_KEYWORDS])
+COOKIE_CONTEXT_RE = re.compile('|'.join(re.escape(t) for t in COOKIE_CONTEXT_TERMS))
+COOKIE_PHRASE_RE = re.compile('|'.join(re.escape(p) for p in COOKIE_PHRASES))
+GENERIC_NON_TECHNICAL_RE = re.compile('|'.join(re.escape(p) for p in GENERIC_NON_TECHNICAL))
+
+
+def is_irrelevant_keyword(text: str) -> bool:
+    """Check if a keyword is cookie/privacy/form text or a non-actionable requirement"""
+    if not text:
+        return False
+    text_lower = text.lower().strip()
+
+    if IRRELEVANT_KEYWORD_RE.search(text_lower):
+        return True
+    if NON_ACTIONABLE_RE.search(text_lower):
+        return True
+    if CONTEXT_DEPENDENT_RE.search(text_lower):
+        if text_lower in CONTEXT_DEPENDENT_ALONE or COOKIE_CONTEXT_RE.search(text_lower):
+            return True
+    if COOKIE_PHRASE_RE.search(text_lower):
+        return True
+    if len(text_lower.split()) < 8 and GENERIC_NON_TECHNICAL_RE.search(text_lower):
+        return True
+    return False
+
+
+# --- paragraph-level rules (used to clean the JD text itself) -----------------------------------
+
+# Phrases that mark boilerplate. A single mention is not enough to drop text - privacy, security and
+# accessibility roles name GDPR, personal data or disabilities in their actual requirements - so a
+# paragraph or line is dropped only when it opens like boilerplate (BOILERPLATE_LEAD_RULES) or these
+# phrases dominate it. Eligibility text (clearance, degree, work authorization) is never boilerplate.
+BOILERPLATE_PARAGRAPH_RULES = {
+    "cookie": r'\bcookies?\b|cookie (policy|settings|preferences)|we use cookies|accept all|'
+              r'privacy (policy|notice|statement)|personal data|gdpr|do not sell',
+    "eeo": r'equal (employment )?opportunity|without regard to|race, colou?r|sexual orientation|'
+           r'gender identity|protected veteran|veteran status|national origin|disabilit(y|ies)|'
+           r'reasonable accommodations?|e-verify|affirmative action|pay transparency',
+    "form": r'\bapply (now|for this job)\b|upload (your )?(resume|cv)|choose file|required field|'
+            r'first name|last name|drag and drop|submit (your )?application|attach (resume|cv)',
+    "footer": r'all rights reserved|copyright|©|follow us|connect with us|share (this )?job|save job|'
+              r'view (all )?jobs|back to (jobs|search)|powered by (greenhouse|lever|workday)',
+}
+# How boilerplate text typically starts; a match here drops the unit on its own
+BOILERPLATE_LEAD_RULES = {
+    "cookie": r'(we|this (web)?site) uses? cookies|by (clicking|continuing|using)\b.{0,60}\b(cookies|consent)|'
+              r'cookie (policy|notice|settings|preferences)\b|accept all( cookies)?\b|do not sell',
+    "eeo": r'([\w&.,\'() -]{0,80}\b(is|are) )?(an? |proud(ly)? )?(equal (employment )?opportunity|'
+           r'affirmative action)|e-verify|pay transparency|'
+           r'we (do not|don\'t) discriminate|(applicants|candidates) (will be considered|receive consideration)',
+    "form": r'apply (now|for this job)\b|upload (your )?(resume|cv)|choose file|\*?\s*required field|'
+            r'first name|last name|drag and drop|submit (your )?application|attach (resume|cv)',
+    "footer": r'©|copyright\b|all rights reserved|follow us|connect with us|share (this )?job|save job|'
+              r'view (all )?jobs|back to (jobs|search)|powered by (greenhouse|lever|workday)',
+}
+# Phrases are "dominant" when there are at least this many and one per this many words or fewer
+BOILERPLATE_MIN_HITS = 2
+BOILERPLATE_WORDS_PER_HIT = 12
+# Form and footer text is page chrome: a short line with one such phrase is enough
+CHROME_RULES = ("form", "footer")
+CHROME_MAX_WORDS = 6
+
+BOILERPLATE_PARAGRAPH_RES = {
+    name: re.compile(pattern, re.IGNORECASE) for name, pattern in BOILERPLATE_PARAGRAPH_RULES.items()
+}
+BOILERPLATE_LEAD_RES = {
+    name: re.compile(r'^[\s\W]*(?:' + pattern + ')', re.IGNORECASE) for name, pattern in BOILERPLATE_LEAD_RULES.items()
+}
+LIST_ITEM_RE = re.compile(r'^\s*(?:[-*•·▪●◦‣–]|\d{1,2}[.)])\s+')
+# Requirement and responsibility headings protect the text under them
+PROTECTED_HEADING_RE = re.compile(
+    r'requirement|qualification|responsibilit|what you.?ll (do|bring|need)|what we.?re looking for|'
+    r'must.have|nice.to.have|preferred|skills|duties|you will|you have|your role|the role',
+    re.IGNORECASE
+)
+
+PARAGRAPH_BREAK_RE = re.compile(r'(\n\s*\n)')
+
+
+class CleanedJobDescription(NamedTuple):
+    text: str
+    paragraphs_removed: int
+    tokens_removed: int
+    rules_hit: List[str]
+    lines_removed: int = 0
+
+
+def boilerplate_rule(text: str) -> str:
+    """
+    Name of the boilerplate rule a paragraph or line matches ("" if it is real content)
+    Matches when the text opens like boilerplate, or when one rule's phrases dominate it and it names no
+    known skill and states no requirement
+    """
+    words = len(text.split())
+    if not words:
+        return ""
+    for name, lead in BOILERPLATE_LEAD_RES.items():
+        if lead.search(text):
+            return name
+    for name, pattern in BOILERPLATE_PARAGRAPH_RES.items():
+        hits = len(pattern.findall(text))
+        if not hits:
+            continue
+        chrome = name in CHROME_RULES and words <= CHROME_MAX_WORDS
+        dominant = hits >= BOILERPLATE_MIN_HITS and words <= hits * BOILERPLATE_WORDS_PER_HIT
+        if not (chrome or dominant):
+            continue
+        if get_skill_matcher().find_spans(text) or REQUIREMENT_CUE_RE.search(text):
+            return ""  # job content that mentions the topic
+        return name
+    return ""
+
+
+def _heading(line: str) -> bool:
+    """Short line that introduces a section ("Requirements:", "## What you'll do", "BENEFITS")"""
+    line = line.strip()
+    if not line or len(line) > 80 or len(line.split()) > 8 or LIST_ITEM_RE.match(line):
+        return False
+    if line.startswith("#") or line.endswith(":"):
+        return True
+    return not re.search(r'[.!?,;]$', line) and bool(PROTECTED_HEADING_RE.search(line) or LOW_VALUE_HEADING_RE.search(line))
+
+
+def _split_keeping_separators(text: str) -> Tuple[List[str], bool]:
+    """
+    ([unit, separator, unit, separator, ...], paragraph mode)
+    Units are blank-line paragraphs, or lines for single-newline text
+    """
+    parts = PARAGRAPH_BREAK_RE.split(text)
+    if len(parts) >= 7:  # at least 4 paragraphs
+        return parts, True
+    parts = []
+    for line in text.splitlines(keepends=True):
+        body = line.rstrip('\r\n')
+        parts.extend([body, line[len(body):]])
+    return parts, False
+
+
+def clean_job_description(job_description: str, log_tag: str = "JD-CLEAN") -> CleanedJobDescription:
+    """
+    Remove boilerplate from a job description, reporting how many tokens that saved
+    Whole paragraphs go only when boilerplate dominates them; otherwise just their boilerplate lines do.
+    Nothing under a requirement or responsibility heading is removed.
+    """
+    if not job_description:
+        return CleanedJobDescription(job_description, 0, 0, [])
+
+    parts, paragraph_mode = _split_keeping_separators(job_description)
+    kept: List[str] = []
+    removed = 0
+    lines_removed = 0
+    tokens_by_rule: Dict[str, int] = {}
+    protected = False
+    seen_content = seen_items = False
+
+    for i in range(0, len(parts), 2):
+        unit = parts[i]
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        if not unit.strip():
+            kept.append(unit + separator)
+            continue
+
+        # Track the section: a protected section ends at the next heading, at prose after its list,
+        # at page chrome ("Apply now", "© Acme") or, in paragraph mode, after its first prose paragraph
+        lines = unit.splitlines(keepends=True)
+        first_line = lines[0].strip()
+        if _heading(first_line):
+            protected = bool(PROTECTED_HEADING_RE.search(first_line))
+            seen_content = seen_items = False
+            body_lines = [line for line in lines[1:] if line.strip()]
+        else:
+            body_lines = [line for line in lines if line.strip()]
+            is_list = bool(LIST_ITEM_RE.match(first_line))
+            page_chrome = any(BOILERPLATE_LEAD_RES[name].search(first_line) for name in CHROME_RULES)
+            if protected and not is_list and (seen_items or (paragraph_mode and seen_content) or page_chrome):
+                protected = False
+        if body_lines:
+            seen_content = True
+            seen_items = seen_items or any(LIST_ITEM_RE.match(line) for line in body_lines)
+        if protected:
+            kept.append(unit + separator)
+            continue
+
+        # A paragraph goes whole only if it also opens with boilerplate; otherwise line by line
+        rule = boilerplate_rule(unit)
+        if rule and (len(lines) == 1 or boilerplate_rule(lines[0])):
+            removed += 1
+            tokens_by_rule[rule] = tokens_by_rule.get(rule, 0) + count_tokens(unit)
+            continue
+
+        if len(lines) > 1:
+            kept_lines = []
+            for line in lines:
+                rule = boilerplate_rule(line)
+                if rule:
+                    lines_removed += 1
+                    tokens_by_rule[rule] = tokens_by_rule.get(rule, 0) + count_tokens(line)
+                else:
+                    kept_lines.append(line)
+            unit = "".join(kept_lines).rstrip('\r\n')
+        kept.append(unit + separator)
+
+    if not tokens_by_rule:
+        return CleanedJobDescription(job_description, 0, 0, [])
+
+    cleaned = "".join(kept).strip()
+    tokens_before = count_tokens(job_description)
+    tokens_after = count_tokens(cleaned)
+    tokens_removed = tokens_before - tokens_after
+    for rule, tokens in tokens_by_rule.items():
+        JD_TOKENS_REMOVED.labels(rule).inc(tokens)
+    print(f"[{log_tag}] Removed {removed} boilerplate paragraphs and {lines_removed} lines ({', '.join(tokens_by_rule)}): "
+          f"{tokens_before} -> {tokens_after} tokens ({tokens_removed} removed)")
+    return CleanedJobDescription(cleaned, removed, tokens_removed, list(tokens_by_rule), lines_removed)
@@ -0,0 +1,172 @@
+"""
+Unified keyword extraction engine
+Shared by /fast-rewrite, /calculate-ats-score and keyword logging: dictionary terms are found in one
+Aho-Corasick pass and the capitalized-term / acronym / phrase patterns are compiled once at import
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+from skill_matcher import SkillMatcher
+
+# Tool/platform keywords (programming languages, frameworks, tools)
+TOOL_TERMS = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue', 'node.js',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
+    'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
+    'go', 'golang', 'rust', 'c++', 'c#', '.net', 'spring boot', 'django', 'flask', 'fastapi',
+    'git', 'linux', 'unix', 'bash', 'shell scripting', 'graphql', 'rest api', 'ci/cd'
+]
+
+# Core keywords: domain concepts, methodologies, important terms
+CORE_TERMS = [
+    'machine learning', 'deep learning', 'data science', 'nlp', 'computer vision',
+    'microservices', 'distributed systems', 'cloud-native', 'serverless',
+    'agile', 'scrum', 'devops', 'ci/cd', 'continuous integration',
+    'inference', 'model serving', 'latency', 'throughput', 'scalability', 'concurrency',
+    'api design', 'restful', 'graphql', 'event-driven', 'reactive',
+    'monitoring', 'observability', 'logging', 'metrics', 'tracing'
+]
+
+# Secondary keywords: contextual terms, soft skills, domain-specific
+SECONDARY_TERMS = [
+    'communication', 'leadership', 'problem solving', 'teamwork', 'collaboration',
+    'architecture', 'design', 'implementation', 'optimization', 'performance',
+    'testing', 'quality assurance', 'automation', 'deployment'
+]
+
+# General technology vocabulary used for keyword logging and ATS comparison
+TECH_TERMS = TOOL_TERMS + [
+    'machine learning', 'deep learning', 'data science', 'nlp', 'computer vision',
+    'microservices', 'distributed systems', 'cloud-native', 'serverless',
+    'agile', 'scrum', 'devops', 'continuous integration',
+    'api design', 'restful', 'event-driven', 'reactive',
+    'monitoring', 'observability', 'logging', 'metrics', 'tracing'
+]
+
+EXCLUDE_WORDS = frozenset([
+    'The', 'This', 'That', 'With', 'From', 'For', 'And', 'Are', 'You', 'Your',
+    'Our', 'Company', 'Team', 'Work', 'Job', 'Position', 'Role', 'Will',
+    'Must', 'Should', 'Have', 'Has', 'Been', 'Being', 'Apply', 'Submit'
+])
+
+CAPITALIZED_RE = re.compile(r'\b[A-Z][A-Za-z0-9+#.]*(?:\s+[A-Z][A-Za-z0-9+#.]*)*\b')
+ACRONYM_RE = re.compile(r'\b[A-Z]{2,6}(?:[/-][A-Z]{2,6})?\b')
+PHRASE_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b')
+
+_CATEGORIES = {
+    "tool": TOOL_TERMS,
+    "core": CORE_TERMS,
+    "secondary": SECONDARY_TERMS,
+    "tech": TECH_TERMS,
+}
+
+
+@lru_cache(maxsize=1)
+def _get_term_matcher() -> SkillMatcher:
+    """One automaton over every dictionary term, compiled once per process"""
+    return SkillMatcher(term for terms in _CATEGORIES.values() for term in terms)
+
+
+@lru_cache(maxsize=1)
+def _get_term_categories() -> Dict[str, frozenset]:
+    """Map each dictionary term to the categories it belongs to"""
+    categories: Dict[str, set] = {}
+    for category, terms in _CATEGORIES.items():
+        for term in terms:
+            categories.setdefault(term, set()).add(category)
+    return {term: frozenset(cats) for term, cats in categories.items()}
+
+
+def _unique(items: Iterable[str]) -> List[str]:
+    """Deduplicate case-insensitively, keeping first-seen order (deterministic prompts)"""
+    seen = set()
+    result = []
+    for item in items:
+        key = item.lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def _display(term: str, title_multiword: bool) -> str:
+    """Display form of a dictionary term"""
+    return term.title() if title_multiword or ' ' not in term else term
+
+
+def extract_keywords(text: str) -> Dict:
+    """
+    Extract categorized keywords from text in one pass per pattern family
+    Returns:
+        {
+            "tool", "core", "secondary", "tech": dictionary terms found, in order of appearance,
+            "acronyms", "phrases", "capitalized": surface patterns found, in order of appearance,
+            "counts": {keyword: occurrences}
+        }
+    """
+    categories = _get_term_categories()
+    spans = _get_term_matcher().find_spans(text)
+    term_counts = Counter(term for _, _, term in spans)
+
+    found: Dict[str, List[str]] = {category: [] for category in _CATEGORIES}
+    for term in dict.fromkeys(term for _, _, term in spans):
+        for category in categories.get(term, ()):
+            found[category].append(term)
+
+    acronyms = ACRONYM_RE.findall(text)
+    phrases = PHRASE_RE.findall(text)
+    capitalized = CAPITALIZED_RE.findall(text)
+
+    counts = Counter()
+    counts.update(term_counts)
+    counts.update(acronyms)
+    counts.update(phrases)
+
+    return {
+        "tool": _unique(_display(t, False) for t in found["tool"]),
+        "core": _unique(_display(t, True) for t in found["core"]),
+        "secondary": _unique(_display(t, True) for t in found["secondary"]),
+        "tech": _unique(_display(t, False) for t in found["tech"]),
+        "acronyms": _unique(acronyms),
+        "phrases": _unique(p for p in phrases if p not in EXCLUDE_WORDS),
+        "capitalized": _unique(w for w in capitalized if len(w) > 2 and w not in EXCLUDE_WORDS),
+        "counts": dict(counts),
+    }
+
+
+def flatten_keywords(extraction: Dict) -> List[str]:
+    """
+    Flat, sorted list of unique keywords (technical terms, tools, concepts)
+    Used for logging and JD/resume comparison
+    """
+    keywords = (
+        extraction["capitalized"]
+        + extraction["acronyms"]
+        + extraction["phrases"]
+        + extraction["tech"]
+    )
+    keywords = [kw for kw in set(keywords) if kw not in EXCLUDE_WORDS and len(kw) > 2]
+    return sorted(keywords, key=str.lower)
+
+
+def categorize_for_rewrite(extraction: Dict) -> Dict[str, List[str]]:
+    """
+    CORE / TOOLS / SECONDARY keyword buckets for the fast rewrite prompt
+    Returns {"core": [...], "tool": [...], "secondary": [...]}
+    """
+    # Tools: dictionary tools plus acronyms (API, AWS, ML, AI, CI/CD, etc.)
+    tool_keywords = _unique(extraction["tool"] + extraction["acronyms"])[:25]
+
+    # Core: domain concepts plus multi-word technical phrases (2-4 words)
+    core_keywords = _unique(extraction["core"] + extraction["phrases"][:15])[:20]
+
+    # Secondary: contextual terms plus capitalized words that aren't tools or core
+    taken = {kw.lower() for kw in tool_keywords + core_keywords}
+    additional_secondary = [w for w in extraction["capitalized"] if w.lower() not in taken]
+    secondary_keywords = _unique(extraction["secondary"] + additional_secondary[:15])[:20]
+
+    return {"core": core_keywords, "tool": tool_keywords, "secondary": secondary_keywords}
@@ -0,0 +1,396 @@
+"""
+Async pdflatex compile service
+Runs pdflatex as asyncio subprocesses behind a bounded worker pool and caches finished PDFs
+by the SHA-256 of their LaTeX source. Document preambles are precompiled once into format
+files so most compiles only typeset the body.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from metrics import PDFLATEX_ACTIVE, PDFLATEX_COMPILE_SECONDS, PDFLATEX_QUEUE_DEPTH
+from single_flight import SingleFlight
+
+try:
+    import resource
+except ImportError:  # Windows: no per-process rlimits
+    resource = None
+
+LATEX_MAX_WORKERS = int(os.getenv("LATEX_MAX_WORKERS", str(max(1, min(4, os.cpu_count() or 1)))))
+LATEX_MAX_QUEUE = int(os.getenv("LATEX_MAX_QUEUE", "16"))
+LATEX_PASS_TIMEOUT = float(os.getenv("LATEX_PASS_TIMEOUT", "30"))
+LATEX_MEMORY_LIMIT_MB = int(os.getenv("LATEX_MEMORY_LIMIT_MB", "1024"))
+PDF_CACHE_DIR = Path(os.getenv(
+    "PDF_CACHE_DIR", str(Path(__file__).resolve().parent / ".cache" / "pdf")
+))
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", "200"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+LATEX_FORMAT_CACHE_ENABLED = os.getenv("LATEX_FORMAT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LATEX_FORMAT_DIR = Path(os.getenv(
+    "LATEX_FORMAT_DIR", str(Path(__file__).resolve().parent / ".cache" / "fmt")
+))
+LATEX_FORMAT_MAX_ENTRIES = int(os.getenv("LATEX_FORMAT_MAX_ENTRIES", "20"))
+
+BEGIN_DOCUMENT = "\\begin{document}"
+
+
+class LatexCompileError(Exception):
+    """pdflatex ran but produced no PDF"""
+
+
+class LatexCompileTimeout(LatexCompileError):
+    """A pdflatex pass exceeded its time limit"""
+
+
+class CompileQueueFull(Exception):
+    """Too many compiles are already running or waiting"""
+
+
+def latex_digest(latex_code: str) -> str:
+    """Cache key for a LaTeX source"""
+    return hashlib.sha256(latex_code.encode("utf-8")).hexdigest()
+
+
+class PDFCache:
+    """Directory of <sha256>.pdf files bounded by count and bytes (least recently used evicted first)"""
+
+    def __init__(self, directory: Path, max_entries: int, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.pdf"
+
+    def get(self, digest: str) -> Optional[bytes]:
+        path = self._path(digest)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(path)  # refresh LRU position
+        self.hits += 1
+        return data
+
+    def set(self, digest: str, pdf_bytes: bytes):
+        path = self._path(digest)
+        # Unique temp name per writer, so workers sharing the directory never interleave writes
+        with tempfile.NamedTemporaryFile(dir=self.directory, prefix=f"{digest}.", suffix=".tmp",
+                                         delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+            try:
+                tmp.write(pdf_bytes)
+            except BaseException:
+                tmp.close()
+                tmp_path.unlink(missing_ok=True)
+                raise
+        os.replace(tmp_path, path)  # atomic, so concurrent readers never see a partial PDF
+        self._evict()
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        count = len(entries)
+        total_bytes = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            count -= 1
+            total_bytes -= stat.st_size
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(entries),
+            "bytes": sum(stat.st_size for _, stat in entries),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+def _limit_child_resources():
+    """preexec_fn for pdflatex: cap address space so a runaway document cannot exhaust memory"""
+    if resource is not None and LATEX_MEMORY_LIMIT_MB > 0:
+        limit = LATEX_MEMORY_LIMIT_MB * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+async def run_pdflatex(args: List[str], timeout: float, env: Optional[Dict[str, str]] = None) -> Tuple[int, str]:
+    """Run pdflatex with args, killing it if it exceeds timeout; returns (returncode, output)"""
+    process = await asyncio.create_subprocess_exec(
+        'pdflatex', '-interaction=nonstopmode', *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        stdin=asyncio.subprocess.DEVNULL,
+        env=env,
+        preexec_fn=_limit_child_resources if os.name == "posix" else None,
+    )
+    try:
+        output, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise LatexCompileTimeout("LaTeX compilation timed out")
+    return process.returncode, output.decode("utf-8", errors="replace")
+
+
+def split_preamble(latex_code: str) -> Tuple[str, str]:
+    """Split LaTeX into (preamble, body starting at \\begin{document}); preamble is "" if there is none"""
+    index = latex_code.find(BEGIN_DOCUMENT)
+    if index <= 0 or "\\documentclass" not in latex_code[:index]:
+        return "", latex_code
+    return latex_code[:index], latex_code[index:]
+
+
+class FormatCache:
+    """
+    Precompiled pdflatex format files (.fmt) keyed by the SHA-256 of a document preamble
+    Each preamble is dumped once; bodies are then compiled against the cached format
+    """
+
+    def __init__(self, directory: Path, max_entries: int, build_timeout: float):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.build_timeout = build_timeout
+        self.hits = 0
+        self.builds = 0
+        self.build_failures = 0
+        self.fallbacks = 0
+        self._building: Dict[str, asyncio.Future] = {}
+        self._failed = set()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def env(self) -> Dict[str, str]:
+        """Environment that lets pdflatex find cached formats by name"""
+        env = dict(os.environ)
+        env["TEXFORMATS"] = f"{self.directory}{os.pathsep}{env.get('TEXFORMATS', '')}"
+        return env
+
+    async def get_format(self, preamble: str) -> Optional[str]:
+        """Return the format name for preamble, building it on first use; None if it cannot be built"""
+        name = f"preamble-{latex_digest(preamble)[:32]}"
+        fmt_path = self.directory / f"{name}.fmt"
+        if name in self._failed:
+            return None
+        if fmt_path.exists():
+            os.utime(fmt_path)  # refresh LRU position
+            self.hits += 1
+            return name
+
+        # Concurrent compiles of the same template share one build
+        pending = self._building.get(name)
+        if pending is None:
+            pending = asyncio.ensure_future(self._build(name, preamble))
+            self._building[name] = pending
+            pending.add_done_callback(lambda _: self._building.pop(name, None))
+        built = await asyncio.shield(pending)
+        return name if built else None
+
+    async def _build(self, name: str, preamble: str) -> bool:
+        # Built inside the format directory so the final rename stays on one filesystem (and atomic)
+        try:
+            with tempfile.TemporaryDirectory(dir=self.directory) as tmpdir:
+                source = Path(tmpdir) / f"{name}.tex"
+                source.write_text(preamble + "\n\\dump\n", encoding="utf-8")
+                returncode, output = await run_pdflatex(
+                    ['-ini', f'-jobname={name}', '-output-directory', tmpdir, '&pdflatex', str(source)],
+                    timeout=self.build_timeout
+                )
+                built = Path(tmpdir) / f"{name}.fmt"
+                if returncode != 0 or not built.exists():
+                    raise LatexCompileError(output[-300:])
+                os.replace(built, self.directory / f"{name}.fmt")
+        except Exception as e:
+            print(f"[LATEX] Could not precompile preamble {name}, using full compiles: {type(e).__name__}: {e}")
+            self._failed.add(name)
+            self.build_failures += 1
+            return False
+
+        self.builds += 1
+        self._evict()
+        return True
+
+    def mark_unusable(self, name: str):
+        """Stop using a format whose body compile failed (fall back to full compiles)"""
+        self._failed.add(name)
+        self.fallbacks += 1
+        (self.directory / f"{name}.fmt").unlink(missing_ok=True)
+
+    def _evict(self):
+        formats = sorted(self.directory.glob("*.fmt"), key=lambda path: path.stat().st_mtime)
+        for path in formats[:max(len(formats) - self.max_entries, 0)]:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        return {
+            "formats": len(list(self.directory.glob("*.fmt"))),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "builds": self.builds,
+            "build_failures": self.build_failures,
+            "fallbacks": self.fallbacks,
+        }
+
+
+class LatexCompiler:
+    """
+    Bounded pool of pdflatex workers
+    At most max_workers compiles run at once and at most max_queue more may wait;
+    anything beyond that is rejected with CompileQueueFull instead of piling up
+    """
+
+    def __init__(
+        self,
+        max_workers: int = LATEX_MAX_WORKERS,
+        max_queue: int = LATEX_MAX_QUEUE,
+        pass_timeout: float = LATEX_PASS_TIMEOUT,
+        cache: Optional[PDFCache] = None,
+        formats: Optional[FormatCache] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pass_timeout = pass_timeout
+        self.cache = cache
+        self.formats = formats
+        self.active = 0
+        self.queued = 0
+        self.compiled = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_compile_seconds = 0.0
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._single_flight = SingleFlight("latex-coalesce")
+
+    async def compile(self, latex_code: str) -> bytes:
+        """Return the PDF for latex_code, from cache when possible; identical concurrent requests share one compile"""
+        digest = latex_digest(latex_code)
+        return await self._single_flight.do(digest, lambda: self._compile(digest, latex_code))
+
+    async def _compile(self, digest: str, latex_code: str) -> bytes:
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, digest)
+            if cached is not None:
+                return cached
+
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise CompileQueueFull(
+                f"LaTeX compile queue is full ({self.active} running, {self.queued} waiting)"
+            )
+
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.active += 1
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            pdf_bytes = await self._run_pdflatex(latex_code)
+            self.compiled += 1
+            outcome = "ok"
+        except LatexCompileTimeout:
+            self.failed += 1
+            outcome = "timeout"
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.total_compile_seconds += elapsed
+            PDFLATEX_COMPILE_SECONDS.labels(outcome).observe(elapsed)
+            self.active -= 1
+            self._semaphore.release()
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, digest, pdf_bytes)
+        return pdf_bytes
+
+    async def _compile_passes(self, tmpdir: str, latex_file: Path, extra_args: List[str] = None,
+                              env: Optional[Dict[str, str]] = None) -> str:
+        """Run pdflatex, with a second pass after errors or when LaTeX asks for it (cross-references)"""
+        args = (extra_args or []) + ['-output-directory', tmpdir, str(latex_file)]
+        returncode, output = await run_pdflatex(args, self.pass_timeout, env)
+        if returncode != 0 or "Rerun to get" in output or "Label(s) may have changed" in output:
+            returncode, output = await run_pdflatex(args, self.pass_timeout, env)
+        return output
+
+    async def _run_pdflatex(self, latex_code: str) -> bytes:
+        preamble, body = split_preamble(latex_code)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            latex_file = Path(tmpdir) / "resume.tex"
+            pdf_file = Path(tmpdir) / "resume.pdf"
+
+            # Fast path: typeset only the body against the precompiled preamble
+            format_name = None
+            if self.formats is not None and preamble:
+                format_name = await self.formats.get_format(preamble)
+            if format_name:
+                latex_file.write_text(body, encoding='utf-8')
+                output = await self._compile_passes(
+                    tmpdir, latex_file, [f'-fmt={format_name}'], self.formats.env()
+                )
+                if pdf_file.exists():
+                    return pdf_file.read_bytes()
+
+            latex_file.write_text(latex_code, encoding='utf-8')
+            output = await self._compile_passes(tmpdir, latex_file)
+
+            if not pdf_file.exists():
+                raise LatexCompileError(output[-500:] or "Unknown LaTeX compilation error")
+            if format_name:
+                # The full document compiles but not against the format: the preamble cannot be dumped
+                self.formats.mark_unusable(format_name)
+            return pdf_file.read_bytes()
+
+    def stats(self) -> Dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "compiled": self.compiled,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_compile_seconds": round(self.total_compile_seconds / (self.compiled + self.failed), 3)
+            if (self.compiled + self.failed) else 0.0,
+            "coalesced": self._single_flight.coalesced,
+            "formats": self.formats.stats() if self.formats is not None else {"enabled": False},
+        }
+
+
+latex_compiler = LatexCompiler(
+    cache=PDFCache(PDF_CACHE_DIR, PDF_CACHE_MAX_ENTRIES, PDF_CACHE_MAX_BYTES),
+    formats=FormatCache(LATEX_FORMAT_DIR, LATEX_FORMAT_MAX_ENTRIES, LATEX_PASS_TIMEOUT * 2)
+    if LATEX_FORMAT_CACHE_ENABLED else None
+)
+PDFLATEX_QUEUE_DEPTH.set_function(lambda: latex_compiler.queued)
+PDFLATEX_ACTIVE.set_function(lambda: latex_compiler.active)
@@ -0,0 +1,306 @@
+"""
+Single-pass LaTeX tokenizer
+Produces plain text, section boundaries and a map from every text span back to its source offsets,
+so callers can count keywords per section and patch exactly the right source range
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Commands whose brace arguments are not document text: name -> number of arguments to drop
+DROPPED_ARGUMENTS: Dict[str, int] = {
+    'documentclass': 1, 'usepackage': 1, 'RequirePackage': 1, 'end': 1,
+    'vspace': 1, 'hspace': 1, 'setlength': 2, 'addtolength': 2, 'setcounter': 2,
+    'newcommand': 2, 'renewcommand': 2, 'providecommand': 2,
+    'newenvironment': 3, 'renewenvironment': 3,
+    'label': 1, 'ref': 1, 'pageref': 1, 'cite': 1, 'pagestyle': 1, 'thispagestyle': 1,
+    'geometry': 1, 'hypersetup': 1, 'urlstyle': 1, 'includegraphics': 1, 'input': 1, 'include': 1,
+    'titleformat': 5, 'titlespacing': 4, 'titlerule': 0, 'definecolor': 3, 'color': 1, 'textcolor': 1,
+    'fontsize': 2, 'addcontentsline': 3, 'raisebox': 1, 'rule': 2, 'href': 1, 'pdfgentounicode': 0,
+}
+
+# Extra arguments after \begin{env} that are layout specs, not text
+ENVIRONMENT_SPEC_ARGUMENTS: Dict[str, int] = {
+    'tabular': 1, 'tabular*': 2, 'tabularx': 2, 'array': 1, 'minipage': 1, 'multicols': 1,
+}
+
+SECTION_COMMANDS = frozenset(['section'])
+
+# Control symbols that stand for a literal character
+LITERAL_SYMBOLS = frozenset('%&$#_{}')
+SPACE_SYMBOLS = frozenset(' ,;:!\\')
+# Unescaped characters that only separate words (~ is a tie, & a table column)
+SEPARATOR_CHARS = frozenset('~&')
+
+# A run of ordinary text characters, copied to the output in one step
+PLAIN_RUN_RE = re.compile(r'[^\\%{}$~&\s]+')
+
+
+class TextSpan(NamedTuple):
+    """Text [text_start, text_end) maps char for char onto source [source_start, source_end)
+    (a text space may stand for any whitespace, ~, & or control sequence in the source)"""
+    text_start: int
+    text_end: int
+    source_start: int
+    source_end: int
+
+
+class LatexSection(NamedTuple):
+    """A \\section and its extent in both the plain text and the LaTeX source (body_start: text after the title)"""
+    title: str
+    text_start: int
+    body_start: int
+    text_end: int
+    source_start: int
+    source_end: int
+
+
+class LatexDocument:
+    """Result of tokenizing a LaTeX source: plain text, sections and the text -> source offset map"""
+
+    def __init__(self, source: str, text: str, spans: List[TextSpan], sections: List[LatexSection]):
+        self.source = source
+        self.text = text
+        self.spans = spans
+        self.sections = sections
+        self._span_starts = [span.text_start for span in spans]
+
+    def source_offset(self, text_offset: int) -> Optional[int]:
+        """Source offset of the character at text_offset (None if out of range)"""
+        index = bisect_right(self._span_starts, text_offset) - 1
+        if index < 0:
+            return None
+        span = self.spans[index]
+        if text_offset >= span.text_end:
+            return None
+        return span.source_start + (text_offset - span.text_start)
+
+    def source_range(self, text_start: int, text_end: int) -> Optional[Tuple[int, int]]:
+        """Source range covering the text range [text_start, text_end)"""
+        start = self.source_offset(text_start)
+        end = self.source_offset(text_end - 1) if text_end > text_start else start
+        if start is None or end is None:
+            return None
+        return start, end + 1 if text_end > text_start else end
+
+    def section_text(self, section: LatexSection) -> str:
+        """Plain text of a section body, without its title"""
+        return self.text[section.body_start:section.text_end]
+
+
+class _Tokenizer:
+    def __init__(self, source: str):
+        self.source = source
+        self.n = len(source)
+        self.chars: List[str] = []
+        self.length = 0
+        # Open spans as mutable [text_start, text_end, source_start, source_end]
+        self.spans: List[List[int]] = []
+        self.sections: List[LatexSection] = []
+        self._section_start: Optional[Tuple[str, int, int, int]] = None
+
+    # --- output -------------------------------------------------------------------------------
+
+    def emit(self, chunk: str, source_pos: int):
+        """Append text copied verbatim from source_pos, or a single whitespace char collapsed to one space"""
+        if chunk.isspace():
+            if not self.length or self.chars[-1] == ' ':
+                return
+            chunk = ' '
+        text_pos = self.length
+        self.chars.append(chunk)
+        self.length += len(chunk)
+        if self.spans:
+            last = self.spans[-1]
+            if last[1] == text_pos and last[3] == source_pos:
+                last[1] = self.length
+                last[3] = source_pos + len(chunk)
+                return
+        self.spans.append([text_pos, self.length, source_pos, source_pos + len(chunk)])
+
+    def separator(self, source_pos: int):
+        self.emit(' ', source_pos)
+
+    # --- scanning helpers ---------------------------------------------------------------------
+
+    def skip_comment(self, i: int) -> int:
+        end = self.source.find('\n', i)
+        return self.n if end < 0 else end
+
+    def skip_group(self, i: int, open_ch: str = '{', close_ch: str = '}') -> int:
+        """i points at open_ch; return the index just past the matching close_ch"""
+        depth = 0
+        while i < self.n:
+            ch = self.source[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == '%':
+                i = self.skip_comment(i)
+                continue
+            if ch == open_ch:
+                depth += 1
+            elif ch == close_ch:
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return self.n
+
+    def skip_spaces(self, i: int) -> int:
+        while i < self.n and self.source[i] in ' \t':
+            i += 1
+        return i
+
+    def skip_options(self, i: int) -> int:
+        """Skip any [optional] arguments immediately following position i"""
+        while i < self.n and self.source[i] == '[':
+            i = self.skip_group(i, '[', ']')
+        return i
+
+    def skip_arguments(self, i: int, count: int) -> Tuple[int, List[str]]:
+        """Skip up to count brace arguments (and interleaved options); returns (index, raw arguments)"""
+        arguments = []
+        for _ in range(count):
+            j = self.skip_options(self.skip_spaces(i))
+            if j >= self.n or self.source[j] != '{':
+                break
+            end = self.skip_group(j)
+            arguments.append(self.source[j + 1:end - 1])
+            i = end
+        return self.skip_options(i), arguments
+
+    # --- sections -----------------------------------------------------------------------------
+
+    def close_section(self, source_end: int):
+        if self._section_start is None:
+            return
+        title, text_start, body_start, source_start = self._section_start
+        text_end = self.length
+        if text_end > body_start and self.chars[-1] == ' ':
+            text_end -= 1
+        self.sections.append(LatexSection(title, text_start, body_start, text_end, source_start, source_end))
+        self._section_start = None
+
+    # --- main loop ----------------------------------------------------------------------------
+
+    def run(self) -> LatexDocument:
+        source = self.source
+        begin = source.find('\\begin{document}')
+        i = begin + len('\\begin{document}') if begin >= 0 else 0
+        end_document = source.find('\\end{document}', i)
+        stop = end_document if end_document >= 0 else self.n
+
+        while i < stop:
+            ch = source[i]
+            if ch == '%':
+                i = self.skip_comment(i)
+            elif ch == '\\':
+                i = self.command(i, stop)
+            elif ch == '{':
+                i += 1
+            elif ch == '}':
+                # Adjacent arguments like {Company}{2020} become separate words
+                if i + 1 < self.n and source[i + 1] == '{':
+                    self.separator(i)
+                i += 1
+            elif ch == '$':
+                i += 1
+            elif ch in SEPARATOR_CHARS:
+                self.separator(i)
+                i += 1
+            elif ch.isspace():
+                self.emit(ch, i)
+                i += 1
+            else:
+                end = PLAIN_RUN_RE.match(source, i, stop).end()
+                self.emit(source[i:end], i)
+                i = end
+
+        self.close_section(stop)
+        if self.chars and self.chars[-1] == ' ':
+            self.chars.pop()
+            self.length -= 1
+            last = self.spans[-1]
+            if last[1] - last[0] <= 1:
+                self.spans.pop()
+            else:
+                last[1] -= 1
+                last[3] -= 1
+        spans = [TextSpan(*span) for span in self.spans]
+        return LatexDocument(source, ''.join(self.chars), spans, self.sections)
+
+    def command(self, i: int, stop: int) -> int:
+        """Handle the control sequence starting at i; return the index after it"""
+        source = self.source
+        j = i + 1
+        if j >= self.n:
+            return j
+
+        if not source[j].isalpha():
+            symbol = source[j]
+            if symbol in LITERAL_SYMBOLS:
+                self.emit(symbol, j)
+            elif symbol in SPACE_SYMBOLS:
+                self.separator(i)
+                if symbol == '\\':
+                    return self.skip_options(j + 1)
+            return j + 1
+
+        while j < self.n and source[j].isalpha():
+            j += 1
+        name = source[i + 1:j]
+        if j < self.n and source[j] == '*':
+            name += '*'
+            j += 1
+        base = name.rstrip('*')
+
+        if base in SECTION_COMMANDS:
+            self.close_section(i)
+            self.separator(i)
+            j = self.skip_options(j)
+            text_start, first_chunk = self.length, len(self.chars)
+            title_end = self.skip_group(j) if j < self.n and source[j] == '{' else j
+            # The title is ordinary text; scan it in place so it keeps its offsets
+            k = j
+            while k < title_end:
+                ch = source[k]
+                if ch == '\\':
+                    k = self.command(k, title_end)
+                elif ch in '{}$':
+                    k += 1
+                elif ch in SEPARATOR_CHARS:
+                    self.separator(k)
+                    k += 1
+                else:
+                    self.emit(ch, k)
+                    k += 1
+            title = ''.join(self.chars[first_chunk:]).strip()
+            self.separator(title_end)
+            self._section_start = (title, text_start, self.length, i)
+            return title_end
+
+        if base == 'begin':
+            j, arguments = self.skip_arguments(j, 1)
+            environment = arguments[0].strip() if arguments else ''
+            extra = ENVIRONMENT_SPEC_ARGUMENTS.get(environment, 0)
+            if extra:
+                j, _ = self.skip_arguments(j, extra)
+            self.separator(i)
+            return j
+
+        if base in DROPPED_ARGUMENTS:
+            j, _ = self.skip_arguments(j, DROPPED_ARGUMENTS[base])
+            self.separator(i)
+            return j
+
+        # Any other command (\textbf, \item, custom resume macros): drop the name and options,
+        # keep brace arguments as text
+        self.separator(i)
+        return self.skip_options(j)
+
+
+def tokenize_latex(source: str) -> LatexDocument:
+    """Tokenize LaTeX in one linear pass (body only when a \\begin{document} is present)"""
+    return _Tokenizer(source).run()
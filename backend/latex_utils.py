@@ -0,0 +1,86 @@
+"""
+LaTeX helpers: format detection, plain-text extraction and section splitting
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from latex_tokenizer import tokenize_latex
+from tracing import span
+
+LATEX_INDICATORS = [
+    re.compile(r'\\documentclass'),
+    re.compile(r'\\begin\{document\}'),
+    re.compile(r'\\section'),
+    re.compile(r'\\textbf'),
+    re.compile(r'\\textit'),
+    re.compile(r'\\usepackage'),
+]
+
+# Plain-text resumes: a short line that is just a common heading (optionally followed by a colon)
+TEXT_HEADING_RE = re.compile(
+    r'^\s*(summary|professional summary|profile|objective|experience|work experience|professional experience|'
+    r'employment|employment history|projects|personal projects|skills|technical skills|education|'
+    r'certifications|publications|awards|leadership|activities|volunteer experience)\s*:?\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def is_latex(resume_text: str) -> bool:
+    """Detect if the resume is LaTeX format"""
+    return any(pattern.search(resume_text) for pattern in LATEX_INDICATORS)
+
+
+def extract_text_from_latex(latex_code: str) -> str:
+    """Extract plain text from LaTeX code for validation"""
+    with span("latex_text"):
+        return tokenize_latex(latex_code).text
+
+
+def split_resume_sections(resume: str, is_latex_format: bool) -> List[Tuple[str, str]]:
+    """
+    Split a resume into (section title, plain text) pairs in document order
+    Content before the first heading is returned under the title "header"
+    """
+    sections = []
+    if is_latex_format:
+        document = tokenize_latex(resume)
+        header_end = document.sections[0].text_start if document.sections else len(document.text)
+        header = document.text[:header_end].strip()
+        if header:
+            sections.append(("header", header))
+        sections.extend((section.title, document.section_text(section)) for section in document.sections)
+        return sections
+
+    matches = list(TEXT_HEADING_RE.finditer(resume))
+    boundaries = [(m.start(), m.end(), m.group(1).strip()) for m in matches]
+    to_text = lambda chunk: re.sub(r'\s+', ' ', chunk).strip()
+
+    header_end = boundaries[0][0] if boundaries else len(resume)
+    header = to_text(resume[:header_end])
+    if header:
+        sections.append(("header", header))
+
+    for i, (_, body_start, title) in enumerate(boundaries):
+        body_end = boundaries[i + 1][0] if i + 1 < len(boundaries) else len(resume)
+        sections.append((title, to_text(resume[body_start:body_end])))
+    return sections
+
+
+def split_latex_sections(latex_code: str) -> Optional[Tuple[str, List[Tuple[str, str]], str]]:
+    """
+    Split LaTeX source into (prefix, [(section title, section source)], suffix) for section-wise edits
+    prefix holds the preamble and header up to the first \\section, suffix holds \\end{document} onward;
+    joining prefix + all section sources + suffix reproduces the input exactly
+    Returns None if the document has no \\section commands
+    """
+    document_sections = tokenize_latex(latex_code).sections
+    if not document_sections:
+        return None
+
+    sections = [
+        (section.title, latex_code[section.source_start:section.source_end])
+        for section in document_sections
+    ]
+    prefix = latex_code[:document_sections[0].source_start]
+    return prefix, sections, latex_code[document_sections[-1].source_end:]
@@ -0,0 +1,605 @@
+"""
+Async LLM client for SanaAI backend
+Holds one app-lifetime AsyncOpenAI client with a pooled keep-alive httpx connection
+"""
+
+import asyncio
+import os
+import random
+import time
+import traceback
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Optional
+
+import httpx
+import openai
+from fastapi import HTTPException
+
+from disk_cache import DiskCache, make_cache_key
+from prompts import PROMPT_VERSION
+from metrics import observe_llm_call, prompt_type
+from tracing import span
+from llm_scheduler import LLMRateLimited, PRIORITY_INTERACTIVE, estimate_tokens, llm_priority, llm_scheduler
+from single_flight import SingleFlight
+
+# Read from the environment: export OPENAI_API_KEY=your-key-here
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "your-openai-api-key-here")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-5-mini")  # Default: gpt-5-mini (uses responses.create API)
+
+# Connection pool sizing - one worker can keep this many LLM calls in flight
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+
+# Persistent response cache - identical requests return without calling the provider
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = Path(os.getenv(
+    "LLM_CACHE_PATH", str(Path(__file__).resolve().parent / ".cache" / "llm_cache.sqlite3")
+))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Back-off applied when the provider returns 429 without a Retry-After header
+LLM_RATE_LIMIT_BACKOFF = float(os.getenv("LLM_RATE_LIMIT_BACKOFF", "10"))
+
+# Deadlines and retries: each provider attempt gets LLM_ATTEMPT_TIMEOUT seconds, the whole call
+# (including back-off sleeps) LLM_CALL_DEADLINE; retryable failures back off exponentially with full jitter
+LLM_ATTEMPT_TIMEOUT = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "90"))
+LLM_CALL_DEADLINE = float(os.getenv("LLM_CALL_DEADLINE", "240"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "20"))
+LLM_STREAM_IDLE_TIMEOUT = float(os.getenv("LLM_STREAM_IDLE_TIMEOUT", "60"))
+
+# Hedging (interactive calls only): the call is streamed, and if its first token has not arrived by the
+# LLM_HEDGE_PERCENTILE time-to-first-token of recent calls with the same prompt type, a duplicate is sent;
+# whichever starts answering first is kept
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "30"))  # until enough samples exist
+LLM_HEDGE_MIN_SAMPLES = 20
+
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    openai.RateLimitError,
+)
+
+# Recent times to first token (seconds) per prompt type, used to pick the hedge delay
+_first_token_samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=200))
+llm_call_stats = {"attempts": 0, "retries": 0, "timeouts": 0, "deadline_exceeded": 0, "hedges": 0, "hedge_wins": 0}
+
+_client: Optional[openai.AsyncOpenAI] = None
+
+llm_cache: Optional[DiskCache] = DiskCache(
+    LLM_CACHE_PATH,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    max_bytes=LLM_CACHE_MAX_BYTES,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+) if LLM_CACHE_ENABLED else None
+
+# Identical calls already in flight share one generation (panel + overlay loading together, proxy retries)
+llm_single_flight = SingleFlight("llm-coalesce")
+
+
+def _check_api_key():
+    """Raise if the OpenAI API key has not been configured"""
+    if OPENAI_API_KEY == "your-openai-api-key-here" or not OPENAI_API_KEY:
+        raise ValueError(
+            "OpenAI API key not set. Please set OPENAI_API_KEY environment variable "
+            "or update OPENAI_API_KEY in llm_client.py"
+        )
+
+
+def llm_api_key_configured() -> bool:
+    """Whether an OpenAI API key is set (without raising)"""
+    try:
+        _check_api_key()
+    except ValueError:
+        return False
+    return True
+
+
+def init_llm_client() -> Optional[openai.AsyncOpenAI]:
+    """
+    Create the shared AsyncOpenAI client (called once at app startup)
+    All endpoints reuse its connection pool instead of opening a new client per call.
+    Without an API key no client is created, so the app still starts and the non-LLM endpoints keep
+    working; LLM calls then fail individually with the "API key not set" error.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    try:
+        _check_api_key()
+    except ValueError as e:
+        print(f"[LLM] {e} LLM endpoints will fail until it is set.")
+        return None
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(600.0, connect=10.0),
+    )
+
+    # Initialize client with only api_key to avoid any proxy/environment variable conflicts
+    # Retries are handled in _call_llm_uncached (with deadlines and jitter), not by the SDK
+    client_kwargs = {"api_key": OPENAI_API_KEY, "http_client": http_client, "max_retries": 0}
+    # Only add base_url if explicitly set (for custom endpoints)
+    base_url = os.getenv("OPENAI_BASE_URL")
+    if base_url:
+        client_kwargs["base_url"] = base_url
+
+    _client = openai.AsyncOpenAI(**client_kwargs)
+    return _client
+
+
+async def close_llm_client():
+    """Close the shared client and its connection pool (called at app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_llm_client() -> openai.AsyncOpenAI:
+    """Return the shared client, creating it lazily if startup did not run (or had no API key)"""
+    _check_api_key()
+    return _client if _client is not None else init_llm_client()
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove markdown code fences the LLM sometimes wraps around raw LaTeX"""
+    if text and text.startswith('```'):
+        lines = text.split('\n')
+        if lines[-1].strip() == '```':
+            lines = lines[1:-1]
+        elif lines[0].startswith('```'):
+            lines = lines[1:]
+        text = '\n'.join(lines)
+    return text.strip() if text else text
+
+
+def _retry_after_seconds(error: openai.APIStatusError) -> float:
+    """Retry-After from a provider error response, or the default back-off"""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return LLM_RATE_LIMIT_BACKOFF
+
+
+def llm_cache_key(prompt: str, system_prompt: str = None, temperature: float = 0.0) -> str:
+    """SHA-256 of everything that determines the completion, including the prompt template version"""
+    return make_cache_key(
+        model=OPENAI_MODEL,
+        system_prompt=system_prompt,
+        prompt=prompt,
+        temperature=temperature,
+        prompt_version=PROMPT_VERSION,
+    )
+
+
+async def call_llm(
+    prompt: str,
+    system_prompt: str = None,
+    temperature: float = 0.0,
+    use_cache: bool = True,
+    validate: Optional[Callable[[str], object]] = None
+) -> str:
+    """
+    Call LLM API (OpenAI), returning a cached response when the same request was seen before
+    Concurrent identical calls are coalesced into one provider request; use_cache=False bypasses both
+    With validate (e.g. the caller's JSON parser), a response is cached only if validate accepts it
+    (does not raise), and a cached response it rejects is dropped and fetched again
+    """
+    with span("llm"):
+        if not use_cache:
+            return await _call_llm_uncached(prompt, system_prompt, temperature)
+
+        cache_key = llm_cache_key(prompt, system_prompt, temperature)
+        return await llm_single_flight.do(
+            cache_key,
+            lambda: _call_llm_cached(cache_key, prompt, system_prompt, temperature, validate)
+        )
+
+
+def _is_valid(response_text: str, validate: Optional[Callable[[str], object]]) -> bool:
+    if validate is None:
+        return True
+    try:
+        validate(response_text)
+    except Exception as e:
+        print(f"[LLM-CACHE] Response failed validation, not caching it: {e}")
+        return False
+    return True
+
+
+async def _call_llm_cached(
+    cache_key: str,
+    prompt: str,
+    system_prompt: str = None,
+    temperature: float = 0.0,
+    validate: Optional[Callable[[str], object]] = None
+) -> str:
+    if llm_cache is not None:
+        cached = await asyncio.to_thread(llm_cache.get, cache_key)
+        if cached is not None:
+            if _is_valid(cached, validate):
+                return cached
+            await asyncio.to_thread(llm_cache.delete, cache_key)
+
+    response_text = await _call_llm_uncached(prompt, system_prompt, temperature)
+
+    if llm_cache is not None and response_text and _is_valid(response_text, validate):
+        await asyncio.to_thread(llm_cache.set, cache_key, response_text)
+    return response_text
+
+
+async def _call_llm_uncached(prompt: str, system_prompt: str = None, temperature: float = 0.0) -> str:
+    """
+    Call LLM API (OpenAI) without blocking the event loop
+    Requires OPENAI_API_KEY to be set as environment variable
+
+    Supports both:
+    - gpt-5-mini: Uses responses.create() API
+    - Other models: Uses chat.completions.create() API
+
+    Timeouts, connection errors, 5xx and short 429s are retried with jittered exponential back-off
+    until LLM_MAX_RETRIES is reached. The whole call (scheduler waits, attempts and back-off sleeps)
+    is bounded by LLM_CALL_DEADLINE.
+    """
+    # Check if API key is set
+    _check_api_key()
+
+    try:
+        return await asyncio.wait_for(_call_with_retries(prompt, system_prompt, temperature), LLM_CALL_DEADLINE)
+    except asyncio.TimeoutError:
+        # Attempt timeouts are handled inside; only the overall deadline gets here
+        llm_call_stats["deadline_exceeded"] += 1
+        raise HTTPException(status_code=504, detail=f"LLM call exceeded its {LLM_CALL_DEADLINE:g}s deadline")
+
+
+async def _call_with_retries(prompt: str, system_prompt: str = None, temperature: float = 0.0) -> str:
+    deadline = time.monotonic() + LLM_CALL_DEADLINE
+    hedge = LLM_HEDGE_ENABLED and llm_priority.get() == PRIORITY_INTERACTIVE
+    attempt = 0
+    while True:
+        try:
+            if hedge:
+                return await _hedged_completion(prompt, system_prompt, temperature)
+            return await _completion(prompt, system_prompt, temperature)
+        except LLMRateLimited:
+            raise
+        except RETRYABLE_ERRORS as e:
+            delay = _retry_delay(attempt, e)
+            if attempt >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                raise _to_http_error(e)
+            attempt += 1
+            llm_call_stats["retries"] += 1
+            print(f"[LLM] Attempt {attempt} failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            raise _to_http_error(e)
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """Full-jitter exponential back-off; a provider 429 waits at least its Retry-After"""
+    delay = random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * (2 ** attempt)))
+    if isinstance(error, openai.RateLimitError):
+        retry_after = _retry_after_seconds(error)
+        llm_scheduler.pause(retry_after)
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _to_http_error(e: Exception) -> HTTPException:
+    """Map a final provider failure to the HTTPException the endpoints return"""
+    if isinstance(e, openai.RateLimitError):
+        retry_after = _retry_after_seconds(e)
+        print(f"[LLM] Provider rate limit hit, pausing admissions for {retry_after:.0f}s")
+        return LLMRateLimited(f"LLM provider rate limit reached: {e}", retry_after)
+    if isinstance(e, asyncio.TimeoutError):
+        return HTTPException(status_code=504, detail=f"LLM API call timed out after {LLM_ATTEMPT_TIMEOUT:g}s")
+
+    # Log full error for debugging
+    error_details = traceback.format_exc()
+    print(f"LLM API call error: {error_details}")  # Log to console
+    error_msg = str(e) if str(e) else f"Unknown error: {type(e).__name__}"
+    if not error_msg or error_msg.strip() == "":
+        error_msg = f"Empty error message from {type(e).__name__}"
+    return HTTPException(
+        status_code=500,
+        detail=f"LLM API call failed: {error_msg}. Check your API key and model name."
+    )
+
+
+async def _completion(prompt: str, system_prompt: str = None, temperature: float = 0.0) -> str:
+    """One provider attempt: wait for a scheduler slot, then call with a per-attempt timeout"""
+    client = get_llm_client()
+    async with llm_scheduler.slot(estimate_tokens(system_prompt, prompt, model=OPENAI_MODEL), llm_priority.get()):
+        llm_call_stats["attempts"] += 1
+        started = time.monotonic()
+        try:
+            # gpt-5-mini uses the responses.create() API
+            if OPENAI_MODEL == "gpt-5-mini":
+                # Combine system prompt and user prompt for gpt-5-mini
+                full_prompt = prompt
+                if system_prompt:
+                    full_prompt = f"{system_prompt}\n\n{prompt}"
+
+                response = await asyncio.wait_for(
+                    client.responses.create(model="gpt-5-mini", input=full_prompt),
+                    LLM_ATTEMPT_TIMEOUT
+                )
+                text = response.output_text
+                usage = getattr(response, "usage", None)
+                prompt_tokens = getattr(usage, "input_tokens", 0) or 0
+                completion_tokens = getattr(usage, "output_tokens", 0) or 0
+            else:
+                # Other models use chat.completions.create() API
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=OPENAI_MODEL,
+                        messages=[
+                            {"role": "system", "content": system_prompt or "You are a helpful assistant."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=temperature
+                    ),
+                    LLM_ATTEMPT_TIMEOUT
+                )
+                text = response.choices[0].message.content
+                usage = getattr(response, "usage", None)
+                prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+                completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        except asyncio.TimeoutError:
+            llm_call_stats["timeouts"] += 1
+            observe_llm_call(OPENAI_MODEL, system_prompt, time.monotonic() - started, "timeout")
+            raise
+        except asyncio.CancelledError:
+            observe_llm_call(OPENAI_MODEL, system_prompt, time.monotonic() - started, "cancelled")
+            raise
+        except Exception:
+            observe_llm_call(OPENAI_MODEL, system_prompt, time.monotonic() - started, "error")
+            raise
+        elapsed = time.monotonic() - started
+        observe_llm_call(OPENAI_MODEL, system_prompt, elapsed, "ok", prompt_tokens, completion_tokens)
+        return text
+
+
+def _record_first_token(system_prompt: Optional[str], seconds: float):
+    _first_token_samples[prompt_type(system_prompt)].append(seconds)
+
+
+def _hedge_delay(system_prompt: Optional[str]) -> float:
+    """Seconds to wait for the primary attempt's first token before sending a hedge"""
+    samples = _first_token_samples.get(prompt_type(system_prompt))
+    if not samples or len(samples) < LLM_HEDGE_MIN_SAMPLES:
+        return LLM_HEDGE_DEFAULT_DELAY
+    samples = sorted(samples)
+    index = min(len(samples) - 1, int(len(samples) * LLM_HEDGE_PERCENTILE / 100))
+    return samples[index]
+
+
+async def _stream_deltas(client: openai.AsyncOpenAI, prompt: str, system_prompt: str = None,
+                         temperature: float = 0.0) -> AsyncIterator[str]:
+    """Text deltas of one streamed provider call"""
+    if OPENAI_MODEL == "gpt-5-mini":
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+
+        stream = await asyncio.wait_for(
+            client.responses.create(model="gpt-5-mini", input=full_prompt, stream=True),
+            LLM_ATTEMPT_TIMEOUT
+        )
+        async for event in _with_idle_timeout(stream):
+            if event.type == "response.output_text.delta" and event.delta:
+                yield event.delta
+    else:
+        stream = await asyncio.wait_for(
+            client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt or "You are a helpful assistant."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature,
+                stream=True
+            ),
+            LLM_ATTEMPT_TIMEOUT
+        )
+        async for chunk in _with_idle_timeout(stream):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+async def _streamed_completion(prompt: str, system_prompt: str, temperature: float,
+                               first_token: asyncio.Future, on_delta: Optional[Callable[[str], None]] = None) -> str:
+    """
+    One streamed provider attempt; resolves first_token as soon as the model starts answering
+    and hands each delta to on_delta as it arrives
+    """
+    client = get_llm_client()
+    async with llm_scheduler.slot(estimate_tokens(system_prompt, prompt, model=OPENAI_MODEL), llm_priority.get()):
+        llm_call_stats["attempts"] += 1
+        started = time.monotonic()
+        parts = []
+        try:
+            async for delta in _stream_deltas(client, prompt, system_prompt, temperature):
+                if not parts:
+                    _record_first_token(system_prompt, time.monotonic() - started)
+                    if not first_token.done():
+                        first_token.set_result(None)
+                parts.append(delta)
+                if on_delta is not None:
+                    on_delta(delta)
+        except asyncio.TimeoutError:
+            llm_call_stats["timeouts"] += 1
+            observe_llm_call(OPENAI_MODEL, system_prompt, time.monotonic() - started, "timeout")
+            raise
+        except asyncio.CancelledError:
+            observe_llm_call(OPENAI_MODEL, system_prompt, time.monotonic() - started, "cancelled")
+            raise
+        except Exception:
+            observe_llm_call(OPENAI_MODEL, system_prompt, time.monotonic() - started, "error")
+            raise
+        text = "".join(parts)
+        # Streams carry no usage block by default; count tokens from text size
+        observe_llm_call(OPENAI_MODEL, system_prompt, time.monotonic() - started, "ok",
+                         estimate_tokens(system_prompt, prompt, model=OPENAI_MODEL),
+                         estimate_tokens(text, model=OPENAI_MODEL))
+        return text
+
+
+async def _hedged_completion(prompt: str, system_prompt: str = None, temperature: float = 0.0) -> str:
+    """
+    Streamed primary attempt plus, if its first token is later than usual for this prompt type, one
+    duplicate; the attempt that starts answering first is kept and the other is cancelled
+    """
+    loop = asyncio.get_running_loop()
+    attempts = []  # (task, first-token future)
+
+    def start_attempt():
+        first_token = loop.create_future()
+        task = asyncio.ensure_future(_streamed_completion(prompt, system_prompt, temperature, first_token))
+        attempts.append((task, first_token))
+
+    start_attempt()
+    hedge_at = time.monotonic() + _hedge_delay(system_prompt)
+    try:
+        while True:
+            winner = next((task for task, first_token in attempts if first_token.done()), None)
+            winner = winner or next((task for task, _ in attempts if task.done() and not task.exception()), None)
+            if winner is not None:
+                if winner is not attempts[0][0]:
+                    llm_call_stats["hedge_wins"] += 1
+                for task, _ in attempts:
+                    if task is not winner:
+                        task.cancel()
+                return await winner
+
+            running = [(task, first_token) for task, first_token in attempts if not task.done()]
+            if not running:
+                raise attempts[-1][0].exception()
+            timeout = max(0.0, hedge_at - time.monotonic()) if len(attempts) == 1 else None
+            done, _ = await asyncio.wait(
+                [awaitable for attempt in running for awaitable in attempt],
+                timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done and len(attempts) == 1:
+                llm_call_stats["hedges"] += 1
+                print("[LLM] No first token yet, sending hedged request")
+                start_attempt()
+    finally:
+        # The loser (or both, if the caller went away) is cancelled and frees its scheduler slot
+        for task, first_token in attempts:
+            task.cancel()
+            first_token.cancel()
+            if task.done() and not task.cancelled():
+                task.exception()  # retrieved, so a failed loser is not logged as unhandled
+
+
+async def _with_idle_timeout(stream):
+    """Iterate a provider stream, failing if no event arrives for LLM_STREAM_IDLE_TIMEOUT seconds"""
+    iterator = stream.__aiter__()
+    while True:
+        try:
+            yield await asyncio.wait_for(iterator.__anext__(), LLM_STREAM_IDLE_TIMEOUT)
+        except StopAsyncIteration:
+            return
+
+
+async def stream_llm(
+    prompt: str,
+    system_prompt: str = None,
+    temperature: float = 0.0,
+    use_cache: bool = True
+) -> AsyncIterator[str]:
+    """
+    Stream LLM output as text deltas while the model is generating
+    A cached response is yielded as a single chunk; a completed stream is written back to the cache.
+    Like call_llm, the whole stream is bounded by LLM_CALL_DEADLINE, and an attempt that fails before
+    its first delta is retried.
+    """
+    cache_key = None
+    if use_cache and llm_cache is not None:
+        cache_key = llm_cache_key(prompt, system_prompt, temperature)
+        cached = await asyncio.to_thread(llm_cache.get, cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    _check_api_key()
+    deltas: asyncio.Queue = asyncio.Queue()
+    producer = asyncio.ensure_future(_produce_stream(prompt, system_prompt, temperature, deltas))
+    parts = []
+    try:
+        while True:
+            delta = await deltas.get()
+            if delta is None:
+                break
+            parts.append(delta)
+            yield delta
+        await producer  # raises the stream's failure, if any
+    finally:
+        # The client went away or the stream failed: stop generating and free the scheduler slot
+        producer.cancel()
+        if producer.done() and not producer.cancelled():
+            producer.exception()
+
+    response_text = "".join(parts)
+    if cache_key is not None and response_text:
+        await asyncio.to_thread(llm_cache.set, cache_key, response_text)
+
+
+async def _produce_stream(prompt: str, system_prompt: str, temperature: float, deltas: asyncio.Queue):
+    """Put the deltas of a deadline-bounded, retried stream on deltas; None marks the end"""
+    try:
+        await asyncio.wait_for(
+            _stream_with_retries(prompt, system_prompt, temperature, deltas.put_nowait), LLM_CALL_DEADLINE
+        )
+    except asyncio.TimeoutError:
+        # Attempt and idle timeouts are handled inside; only the overall deadline gets here
+        llm_call_stats["deadline_exceeded"] += 1
+        raise HTTPException(status_code=504, detail=f"LLM stream exceeded its {LLM_CALL_DEADLINE:g}s deadline")
+    finally:
+        deltas.put_nowait(None)
+
+
+async def _stream_with_retries(prompt: str, system_prompt: str, temperature: float,
+                               on_delta: Callable[[str], None]):
+    """
+    Streamed attempts with the same back-off as _call_with_retries
+    Once a delta has reached the client the attempt cannot be replayed, so later failures are final
+    """
+    deadline = time.monotonic() + LLM_CALL_DEADLINE
+    attempt = 0
+    while True:
+        first_token = asyncio.get_running_loop().create_future()
+        try:
+            # The slot is held for the whole stream, so streaming calls count against the concurrency cap
+            await _streamed_completion(prompt, system_prompt, temperature, first_token, on_delta)
+            return
+        except LLMRateLimited:
+            raise
+        except RETRYABLE_ERRORS as e:
+            delay = _retry_delay(attempt, e)
+            if first_token.done() or attempt >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                raise _to_http_error(e)
+            attempt += 1
+            llm_call_stats["retries"] += 1
+            print(f"[LLM] Stream attempt {attempt} failed before its first token ({type(e).__name__}), "
+                  f"retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            raise _to_http_error(e)
+        finally:
+            first_token.cancel()
@@ -0,0 +1,223 @@
+"""
+LLM request scheduler
+Admits provider calls under a global concurrency cap and a tokens-per-minute budget, in priority order,
+and rejects work with 429 + Retry-After when the wait queue is full instead of piling it up
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from metrics import LLM_ACTIVE, LLM_QUEUE_DEPTH
+from prompt_budget import count_tokens
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))  # 0 disables the token budget
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "64"))
+
+# Priority classes: lower runs first
+PRIORITY_INTERACTIVE = 0   # user is watching: /fast-rewrite, /fast-rewrite-stream, /analyze-form
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2    # prefetch / bulk: /parse-resume, /fast-rewrite-batch
+
+# Priority of the LLM calls made by the current request; the first (outermost) setter wins
+llm_priority: ContextVar[Optional[int]] = ContextVar("llm_priority", default=None)
+
+
+def set_llm_priority(priority: int):
+    """Set the priority for LLM calls in this request unless an outer caller already chose one"""
+    if llm_priority.get() is None:
+        llm_priority.set(priority)
+
+
+def estimate_tokens(*texts: Optional[str], model: str = "gpt-5-mini") -> int:
+    """
+    Tokens charged to the tokens-per-minute bucket for these texts
+    Counted with prompt_budget's counter, so the debit matches what the prompt was budgeted at
+    """
+    return sum(count_tokens(text, model) for text in texts if text)
+
+
+class LLMRateLimited(HTTPException):
+    """The scheduler queue is full or the provider returned 429; the client should retry later"""
+
+    def __init__(self, detail: str, retry_after: float):
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(status_code=429, detail=detail, headers={"Retry-After": str(self.retry_after)})
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tokens", "future")
+
+    def __init__(self, priority: int, seq: int, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class LLMScheduler:
+    """
+    Priority admission control for LLM calls
+    A call is admitted when a concurrency slot is free and the token bucket holds its estimated tokens.
+    Waiters are served strictly by (priority, arrival), so a large interactive prompt is never starved
+    by a stream of small background ones.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+        max_queue: int = LLM_MAX_QUEUE,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self.max_queue = max_queue
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.provider_rate_limits = 0
+        self.total_call_seconds = 0.0
+        self.completed = 0
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: List[_Waiter] = []
+        self._queued = 0  # live waiters; cancelled ones stay in the heap until popped
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    # --- token bucket -------------------------------------------------------------------------
+
+    def _refill(self, now: float):
+        if self.tokens_per_minute > 0:
+            elapsed = now - self._refilled_at
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + elapsed * self.tokens_per_minute / 60.0)
+        self._refilled_at = now
+
+    def _seconds_until(self, tokens: int, now: float) -> float:
+        """Time until the bucket holds `tokens` (and any provider pause has passed)"""
+        wait = max(0.0, self._paused_until - now)
+        if self.tokens_per_minute > 0 and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60.0 / self.tokens_per_minute)
+        return wait
+
+    # --- admission ----------------------------------------------------------------------------
+
+    def _dispatch(self):
+        """Admit waiters from the head of the queue while capacity allows"""
+        self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters and self.active < self.max_concurrency:
+            head = self._waiters[0]
+            if head.future.done():  # caller gave up while waiting
+                heapq.heappop(self._waiters)
+                continue
+            wait = self._seconds_until(head.tokens, now)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self._queued -= 1
+            self._admit(head.tokens)
+            head.future.set_result(None)
+
+    def _admit(self, tokens: int):
+        self.active += 1
+        self.admitted += 1
+        if self.tokens_per_minute > 0:
+            self._tokens -= tokens
+
+    def _release(self, elapsed: float):
+        self.active -= 1
+        self.completed += 1
+        self.total_call_seconds += elapsed
+        if self._timer is None:
+            self._dispatch()
+
+    def _forget_waiter(self):
+        """A waiter gave up: stop counting it and drop dead entries once they outnumber live ones"""
+        self._queued -= 1
+        if len(self._waiters) > 2 * self._queued + 8:
+            self._waiters = [waiter for waiter in self._waiters if not waiter.future.done()]
+            heapq.heapify(self._waiters)
+
+    def retry_after(self) -> float:
+        """Rough seconds until a new request would be admitted"""
+        average = self.total_call_seconds / self.completed if self.completed else 5.0
+        backlog = average * (self._queued + 1) / self.max_concurrency
+        return max(backlog, self._paused_until - time.monotonic())
+
+    @asynccontextmanager
+    async def slot(self, tokens: int, priority: Optional[int] = None):
+        """Hold one admitted LLM call for the duration of the block"""
+        priority = PRIORITY_NORMAL if priority is None else priority
+        if self.tokens_per_minute > 0:
+            tokens = min(tokens, self.tokens_per_minute)  # an oversized prompt waits for a full bucket
+
+        now = time.monotonic()
+        self._refill(now)
+        if not self._queued and self.active < self.max_concurrency and self._seconds_until(tokens, now) == 0:
+            self._admit(tokens)
+        else:
+            if self._queued >= self.max_queue:
+                self.rejected += 1
+                raise LLMRateLimited(
+                    f"LLM queue is full ({self.active} running, {self._queued} waiting)",
+                    self.retry_after()
+                )
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, _Waiter(priority, next(self._seq), tokens, future))
+            self._queued += 1
+            if self._timer is None:
+                self._dispatch()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release(0.0)  # admitted just as the caller was cancelled
+                else:
+                    self._forget_waiter()
+                raise
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    def pause(self, seconds: float):
+        """Provider said 429: hold back new admissions for `seconds`"""
+        self.provider_rate_limits += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "tokens_per_minute": self.tokens_per_minute,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self._queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "provider_rate_limits": self.provider_rate_limits,
+            "tokens_available": int(self._tokens),
+        }
+
+
+llm_scheduler = LLMScheduler()
+LLM_ACTIVE.set_function(lambda: llm_scheduler.active)
+LLM_QUEUE_DEPTH.set_function(lambda: llm_scheduler._queued)
@@ -2,18 +2,19 @@
 FastAPI backend for SanaAI Job Application Assistant
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import json
 import re
 import os
-import subprocess
-import tempfile
+import time
 import traceback
 from pathlib import Path
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 from dotenv import load_dotenv
 from prompts import (
     JD_PARSE_PROMPT, JD_PARSE_SYSTEM_PROMPT,
@@ -21,19 +22,48 @@ from prompts import (
     RESUME_REWRITE_LATEX_PROMPT, RESUME_REWRITE_LATEX_SYSTEM_PROMPT,
     COMBINED_PROCESS_PROMPT, COMBINED_PROCESS_SYSTEM_PROMPT,
     FAST_REWRITE_PROMPT, FAST_REWRITE_SYSTEM_PROMPT,
-    ATS_SCORE_PROMPT, ATS_SCORE_SYSTEM_PROMPT
+    ATS_FEEDBACK_PROMPT, ATS_FEEDBACK_SYSTEM_PROMPT
 )
 
 # Load environment variables from .env file if it exists
 load_dotenv()
-from validation import (
-    extract_skills_from_resume,
-    extract_companies_from_resume,
-    extract_dates_from_resume,
-    validate_resume_changes
-)
-
-app = FastAPI(title="SanaAI Job Assistant API")
+from validation import validate_resume_changes
+from latex_utils import is_latex, extract_text_from_latex
+from ats_scorer import score_resume
+from section_rewriter import rewrite_sections_parallel
+from latex_compiler import latex_compiler, CompileQueueFull, LatexCompileError, LatexCompileTimeout
+from keyword_extractor import extract_keywords, flatten_keywords, categorize_for_rewrite
+from memory_cache import content_digest
+from prompt_budget import budget_prompt_input, preload_encoding
+from jd_cleaner import clean_job_description, is_irrelevant_keyword
+from form_minifier import minify_form_html
+from form_cache import form_analysis_cache
+from form_sessions import application_key, form_sessions
+from file_snapshots import FileSnapshotCache, ResumeIndex, snapshot_response
+from resume_artifacts import resume_artifacts
+from form_rules import detect_site, extract_form_fields, map_form_fields, public_field, file_upload_entries, render_fields_html
+from tracing import TRACE_LOG_PATH, span, start_trace, write_trace_line
+from metrics import REQUEST_LATENCY, monitor_event_loop_lag, register_cache
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from llm_scheduler import LLMRateLimited, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, set_llm_priority, llm_scheduler
+from llm_client import OPENAI_MODEL, call_llm, stream_llm, strip_code_fences, init_llm_client, close_llm_client, llm_api_key_configured, llm_cache, llm_single_flight, llm_call_stats
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources at startup and release them at shutdown"""
+    init_llm_client()
+    # tiktoken may download its encoding on first use; do it now, not inside the first request
+    await asyncio.to_thread(preload_encoding, OPENAI_MODEL)
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    artifact_warmup = asyncio.create_task(warm_resume_artifacts())
+    yield
+    artifact_warmup.cancel()
+    lag_monitor.cancel()
+    await close_llm_client()
+
+
+app = FastAPI(title="SanaAI Job Assistant API", lifespan=lifespan)
 
 # CORS middleware for Chrome extension
 app.add_middleware(
@@ -44,13 +74,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# TODO: Add OpenAI API key here
-# You can set it as an environment variable: export OPENAI_API_KEY=your-key-here
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "your-openai-api-key-here")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-5-mini")  # Default: gpt-5-mini (uses responses.create API)
+# Profiles and the original resume are served from memory, revalidated by mtime
+BACKEND_DIR = Path(__file__).resolve().parent
+PROFILES_DIR = BACKEND_DIR / "profiles"
+ORIGINAL_RESUMES_DIR = BACKEND_DIR / "resumes" / "original"
+ORIGINAL_RESUME_FOLDER = "AnishDhandoreResume"
+RESUME_FILE_NAMES = ["resume.tex", "main.tex", "cv.tex", "curriculum.tex", "AnishDhandoreResume.tex"]
+
+# Precompute artifacts (and the LLM parse) for the original resumes at startup
+RESUME_ARTIFACT_PREPARSE = os.getenv("RESUME_ARTIFACT_PREPARSE", "true").lower() in ("1", "true", "yes")
+
+file_snapshot_cache = FileSnapshotCache()
+resume_index = ResumeIndex(ORIGINAL_RESUMES_DIR, ORIGINAL_RESUME_FOLDER, RESUME_FILE_NAMES)
 
-# Cache for resume metadata to avoid re-extraction
-resume_metadata_cache: Dict[str, Dict] = {}
+# Cache hit ratios exported at /metrics
+register_cache("resume_artifacts", resume_artifacts.stats)
+register_cache("files", file_snapshot_cache.stats)
+if llm_cache is not None:
+    register_cache("llm", llm_cache.stats)
+if latex_compiler.cache is not None:
+    register_cache("pdf", latex_compiler.cache.stats)
+if form_analysis_cache is not None:
+    register_cache("form_analysis", form_analysis_cache.stats)
+
+
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    """
+    Per-endpoint latency histogram plus a Server-Timing header with the stage spans of the request
+    For streaming responses both cover the time until the stream starts
+    """
+    trace = start_trace(request.method, request.url.path)
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["Server-Timing"] = trace.server_timing()
+        # Browsers only show Server-Timing for cross-origin callers (the extension) when this is present
+        response.headers["Timing-Allow-Origin"] = "*"
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        REQUEST_LATENCY.labels(request.method, endpoint, str(status)).observe(time.perf_counter() - trace.started)
+        if TRACE_LOG_PATH:
+            await asyncio.to_thread(write_trace_line, trace, status)
 
 
 class JDParseRequest(BaseModel):
@@ -72,6 +140,7 @@ class ResumeRewriteRequest(BaseModel):
     parsed_jd: JDParseResponse = Field(..., description="Parsed job description")
     resume_format: Optional[str] = Field("text", description="Format: 'text' or 'latex'")
     skip_validation: Optional[bool] = Field(False, description="Skip validation for faster processing")
+    parallel_sections: Optional[bool] = Field(False, description="Rewrite LaTeX sections concurrently (faster for long resumes)")
 
 
 class CombinedProcessRequest(BaseModel):
@@ -111,6 +180,7 @@ class ResumeParseResponse(BaseModel):
 class FormAnalysisRequest(BaseModel):
     form_html: str = Field(..., description="HTML of the form to analyze")
     url: Optional[str] = Field(None, description="URL of the page for site-specific detection")
+    session_id: Optional[str] = Field(None, description="Application session; later steps only analyze new or changed controls")
 
 
 class FormAnalysisResponse(BaseModel):
@@ -120,86 +190,6 @@ class FormAnalysisResponse(BaseModel):
     file_uploads: List[Dict] = Field(..., description="File upload fields")
 
 
-def truncate_prompt_if_needed(text: str, max_length: int = 12000) -> str:
-    """
-    Truncate very long text while preserving structure
-    Keeps beginning and end, removes middle portion
-    """
-    if len(text) <= max_length:
-        return text
-    
-    # Keep first 60% and last 40% to preserve structure
-    first_part = text[:int(max_length * 0.6)]
-    last_part = text[-int(max_length * 0.4):]
-    
-    return first_part + "\n\n[... content truncated for efficiency ...]\n\n" + last_part
-
-
-def call_llm(prompt: str, system_prompt: str = None, temperature: float = 0.0) -> str:
-    """
-    Call LLM API (OpenAI)
-    Requires OPENAI_API_KEY to be set as environment variable or in main.py
-    
-    Supports both:
-    - gpt-5-mini: Uses responses.create() API
-    - Other models: Uses chat.completions.create() API
-    """
-    import openai
-    
-    # Check if API key is set
-    if OPENAI_API_KEY == "your-openai-api-key-here" or not OPENAI_API_KEY:
-        raise ValueError(
-            "OpenAI API key not set. Please set OPENAI_API_KEY environment variable "
-            "or update OPENAI_API_KEY in main.py"
-        )
-    
-    try:
-        # Initialize client with only api_key to avoid any proxy/environment variable conflicts
-        client_kwargs = {"api_key": OPENAI_API_KEY}
-        # Only add base_url if explicitly set (for custom endpoints)
-        base_url = os.getenv("OPENAI_BASE_URL")
-        if base_url:
-            client_kwargs["base_url"] = base_url
-        
-        client = openai.OpenAI(**client_kwargs)
-        
-        # gpt-5-mini uses the responses.create() API
-        if OPENAI_MODEL == "gpt-5-mini":
-            # Combine system prompt and user prompt for gpt-5-mini
-            full_prompt = prompt
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\n{prompt}"
-            
-            response = client.responses.create(
-                model="gpt-5-mini",
-                input=full_prompt
-            )
-            return response.output_text
-        else:
-            # Other models use chat.completions.create() API
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt or "You are a helpful assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature
-            )
-            return response.choices[0].message.content
-    except Exception as e:
-        # Log full error for debugging
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"LLM API call error: {error_details}")  # Log to console
-        error_msg = str(e) if str(e) else f"Unknown error: {type(e).__name__}"
-        if not error_msg or error_msg.strip() == "":
-            error_msg = f"Empty error message from {type(e).__name__}"
-        raise HTTPException(
-            status_code=500,
-            detail=f"LLM API call failed: {error_msg}. Check your API key and model name."
-        )
-
-
 def extract_structured_json(text: str) -> Dict:
     """
     Extract JSON from LLM response safely.
@@ -227,13 +217,14 @@ async def parse_job_description(request: JDParseRequest):
     """
     Parse job description into structured JSON format
     """
-    prompt = JD_PARSE_PROMPT.format(job_description=request.job_description)
     system_prompt = JD_PARSE_SYSTEM_PROMPT
 
     try:
-        # Truncate JD if very long to speed up processing
-        prompt = JD_PARSE_PROMPT.format(job_description=truncate_prompt_if_needed(request.job_description, max_length=8000))
-        response_text = call_llm(prompt, system_prompt, temperature=0.0)
+        # Drop boilerplate, then fit the JD into its token budget
+        with span("jd_clean"):
+            job_description = clean_job_description(request.job_description, "PARSE-JD").text
+        prompt = JD_PARSE_PROMPT.format(job_description=budget_prompt_input(job_description, "job_description", OPENAI_MODEL))
+        response_text = await call_llm(prompt, system_prompt, temperature=0.0, validate=extract_structured_json)
         
         # Debug: log the response
         print(f"LLM response length: {len(response_text) if response_text else 0}")
@@ -265,115 +256,12 @@ async def parse_job_description(request: JDParseRequest):
         raise HTTPException(status_code=500, detail=f"Failed to parse JD: {error_msg}")
 
 
-def is_latex(resume_text: str) -> bool:
-    """Detect if the resume is LaTeX format"""
-    latex_indicators = [
-        r'\\documentclass',
-        r'\\begin\{document\}',
-        r'\\section',
-        r'\\textbf',
-        r'\\textit',
-        r'\\usepackage',
-    ]
-    return any(re.search(pattern, resume_text) for pattern in latex_indicators)
-
-
 def extract_keywords_from_text(text: str) -> list:
     """
     Extract keywords from text for logging/comparison purposes
     Returns list of unique keywords (technical terms, tools, concepts)
     """
-    keywords = []
-    text_lower = text.lower()
-    
-    # Extract technical terms (capitalized words, acronyms)
-    caps_words = re.findall(r'\b[A-Z][A-Za-z0-9+#.]*(?:\s+[A-Z][A-Za-z0-9+#.]*)*\b', text)
-    keywords.extend([w for w in caps_words if len(w) > 2])
-    
-    # Extract acronyms
-    acronyms = re.findall(r'\b[A-Z]{2,6}(?:[/-][A-Z]{2,6})?\b', text)
-    keywords.extend(acronyms)
-    
-    # Extract multi-word technical phrases
-    multi_word = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b', text)
-    keywords.extend([p for p in multi_word if len(p.split()) >= 2])
-    
-    # Common tech keywords
-    tech_keywords = [
-        'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue', 'node.js',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
-        'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
-        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-        'go', 'golang', 'rust', 'c++', 'c#', '.net', 'spring boot', 'django', 'flask', 'fastapi',
-        'git', 'linux', 'unix', 'bash', 'shell scripting', 'graphql', 'rest api', 'ci/cd',
-        'machine learning', 'deep learning', 'data science', 'nlp', 'computer vision',
-        'microservices', 'distributed systems', 'cloud-native', 'serverless',
-        'agile', 'scrum', 'devops', 'continuous integration',
-        'api design', 'restful', 'event-driven', 'reactive',
-        'monitoring', 'observability', 'logging', 'metrics', 'tracing'
-    ]
-    
-    for tech in tech_keywords:
-        pattern = r'\b' + re.escape(tech.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            keywords.append(tech.title() if ' ' not in tech else tech)
-    
-    # Remove duplicates and filter out common words
-    exclude_words = ['The', 'This', 'That', 'With', 'From', 'For', 'And', 'Are', 'You', 'Your', 
-                     'Our', 'Company', 'Team', 'Work', 'Job', 'Position', 'Role', 'Will', 
-                     'Must', 'Should', 'Have', 'Has', 'Been', 'Being', 'Apply', 'Submit']
-    keywords = [kw for kw in set(keywords) if kw not in exclude_words and len(kw) > 2]
-    
-    return sorted(keywords, key=str.lower)
-
-
-def extract_keywords_from_text(text: str) -> list:
-    """
-    Extract keywords from text for logging/comparison purposes
-    Returns list of unique keywords (technical terms, tools, concepts)
-    """
-    keywords = []
-    text_lower = text.lower()
-    
-    # Extract technical terms (capitalized words, acronyms)
-    caps_words = re.findall(r'\b[A-Z][A-Za-z0-9+#.]*(?:\s+[A-Z][A-Za-z0-9+#.]*)*\b', text)
-    keywords.extend([w for w in caps_words if len(w) > 2])
-    
-    # Extract acronyms
-    acronyms = re.findall(r'\b[A-Z]{2,6}(?:[/-][A-Z]{2,6})?\b', text)
-    keywords.extend(acronyms)
-    
-    # Extract multi-word technical phrases
-    multi_word = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b', text)
-    keywords.extend([p for p in multi_word if len(p.split()) >= 2])
-    
-    # Common tech keywords
-    tech_keywords = [
-        'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue', 'node.js',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
-        'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
-        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-        'go', 'golang', 'rust', 'c++', 'c#', '.net', 'spring boot', 'django', 'flask', 'fastapi',
-        'git', 'linux', 'unix', 'bash', 'shell scripting', 'graphql', 'rest api', 'ci/cd',
-        'machine learning', 'deep learning', 'data science', 'nlp', 'computer vision',
-        'microservices', 'distributed systems', 'cloud-native', 'serverless',
-        'agile', 'scrum', 'devops', 'continuous integration',
-        'api design', 'restful', 'event-driven', 'reactive',
-        'monitoring', 'observability', 'logging', 'metrics', 'tracing'
-    ]
-    
-    for tech in tech_keywords:
-        pattern = r'\b' + re.escape(tech.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            keywords.append(tech.title() if ' ' not in tech else tech)
-    
-    # Remove duplicates and filter out common words
-    exclude_words = ['The', 'This', 'That', 'With', 'From', 'For', 'And', 'Are', 'You', 'Your', 
-                     'Our', 'Company', 'Team', 'Work', 'Job', 'Position', 'Role', 'Will', 
-                     'Must', 'Should', 'Have', 'Has', 'Been', 'Being', 'Apply', 'Submit']
-    keywords = [kw for kw in set(keywords) if kw not in exclude_words and len(kw) > 2]
-    
-    return sorted(keywords, key=str.lower)
+    return flatten_keywords(extract_keywords(text))
 
 
 def enforce_keyword_minimums(text: str, keywords: list, min_count: int) -> list:
@@ -391,16 +279,13 @@ def enforce_keyword_minimums(text: str, keywords: list, min_count: int) -> list:
     return missing
 
 
-def extract_text_from_latex(latex_code: str) -> str:
-    """Extract plain text from LaTeX code for validation"""
-    # Remove LaTeX commands but keep content
-    text = latex_code
-    # Remove LaTeX commands (basic cleanup)
-    text = re.sub(r'\\[a-zA-Z]+\*?(\[[^\]]*\])?(\{[^\}]*\})*', '', text)
-    text = re.sub(r'\{([^\}]+)\}', r'\1', text)  # Remove braces, keep content
-    text = re.sub(r'%.*', '', text)  # Remove comments
-    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-    return text.strip()
+async def get_resume_metadata(resume: str, is_latex_format: bool) -> Dict:
+    """
+    Return extracted text plus skills/companies/dates for a resume
+    Served from the resume artifact store, so each resume version is only extracted once; a miss reads
+    and writes SQLite, so the lookup runs in a worker thread
+    """
+    return await asyncio.to_thread(resume_artifacts.get, resume, is_latex_format)
 
 
 @app.post("/rewrite-resume", response_model=ResumeRewriteResponse)
@@ -413,30 +298,11 @@ async def rewrite_resume(request: ResumeRewriteRequest):
     is_latex_format = request.resume_format == "latex" or is_latex(request.resume)
     
     # Extract original resume metadata for validation (use cache if available)
-    resume_hash = str(hash(request.resume))
-    if resume_hash in resume_metadata_cache:
-        resume_text = resume_metadata_cache[resume_hash]["resume_text"]
-        original_skills = resume_metadata_cache[resume_hash]["skills"]
-        original_companies = resume_metadata_cache[resume_hash]["companies"]
-        original_dates = resume_metadata_cache[resume_hash]["dates"]
-    else:
-        if is_latex_format:
-            # Extract text from LaTeX for validation
-            resume_text = extract_text_from_latex(request.resume)
-        else:
-            resume_text = request.resume
-        
-        original_skills = extract_skills_from_resume(resume_text)
-        original_companies = extract_companies_from_resume(resume_text)
-        original_dates = extract_dates_from_resume(resume_text)
-        
-        # Cache metadata
-        resume_metadata_cache[resume_hash] = {
-            "resume_text": resume_text,
-            "skills": original_skills,
-            "companies": original_companies,
-            "dates": original_dates
-        }
+    metadata = await get_resume_metadata(request.resume, is_latex_format)
+    resume_text = metadata["resume_text"]
+    original_skills = metadata["skills"]
+    original_companies = metadata["companies"]
+    original_dates = metadata["dates"]
     
     # Use appropriate prompt based on format
     # Handle empty lists gracefully
@@ -445,7 +311,7 @@ async def rewrite_resume(request: ResumeRewriteRequest):
     requirements_str = ', '.join(request.parsed_jd.requirements) if request.parsed_jd.requirements else "Not specified"
     
     # Truncate resume if very long to speed up processing
-    resume_for_prompt = truncate_prompt_if_needed(request.resume, max_length=10000)
+    resume_for_prompt = budget_prompt_input(request.resume, "resume", OPENAI_MODEL)
     
     if is_latex_format:
         prompt = RESUME_REWRITE_LATEX_PROMPT.format(
@@ -469,7 +335,14 @@ async def rewrite_resume(request: ResumeRewriteRequest):
     
     try:
         # Use temperature 0.0 for faster, more deterministic responses
-        rewritten_resume = call_llm(prompt, system_prompt, temperature=0.0)
+        rewritten_resume = None
+        if request.parallel_sections and is_latex_format:
+            rewritten_resume = await rewrite_sections_parallel(
+                request.resume,
+                f"Skills: {skills_str}\nKeywords: {keywords_str}\nRequirements: {requirements_str}"
+            )
+        if rewritten_resume is None:
+            rewritten_resume = await call_llm(prompt, system_prompt, temperature=0.0)
         
         # Log response preview
         print(f"Rewritten resume length: {len(rewritten_resume) if rewritten_resume else 0}")
@@ -489,13 +362,14 @@ async def rewrite_resume(request: ResumeRewriteRequest):
             else:
                 rewritten_text = rewritten_resume
             
-            validation_result = validate_resume_changes(
-                original_resume=resume_text,
-                rewritten_resume=rewritten_text,
-                original_skills=original_skills,
-                original_companies=original_companies,
-                original_dates=original_dates
-            )
+            with span("validation"):
+                validation_result = validate_resume_changes(
+                    original_resume=resume_text,
+                    rewritten_resume=rewritten_text,
+                    original_skills=original_skills,
+                    original_companies=original_companies,
+                    original_dates=original_dates
+                )
         
         return ResumeRewriteResponse(
             rewritten_resume=rewritten_resume,
@@ -503,6 +377,8 @@ async def rewrite_resume(request: ResumeRewriteRequest):
             validation_passed=validation_result["passed"],
             resume_format="latex" if is_latex_format else "text"
         )
+    except LLMRateLimited:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to rewrite resume: {str(e)}")
 
@@ -513,6 +389,7 @@ class FastRewriteRequest(BaseModel):
     resume: str = Field(..., description="Resume text or LaTeX code")
     resume_format: Optional[str] = Field("latex", description="Format: 'text' or 'latex'")
     skip_reinforcement: Optional[bool] = Field(False, description="Skip reinforcement pass for faster processing (may reduce ATS score)")
+    parallel_sections: Optional[bool] = Field(False, description="Rewrite LaTeX sections concurrently (faster for long resumes)")
 
 
 class FastRewriteResponse(BaseModel):
@@ -526,6 +403,7 @@ class ATSScoreRequest(BaseModel):
     job_description: str = Field(..., description="Job description text")
     resume: str = Field(..., description="Resume text or LaTeX code")
     resume_format: Optional[str] = Field("latex", description="Format: 'text' or 'latex'")
+    include_feedback: Optional[bool] = Field(True, description="Call the LLM for strengths/recommendations (scores are always computed locally)")
 
 
 class ATSScoreBreakdown(BaseModel):
@@ -545,6 +423,27 @@ class ATSScoreResponse(BaseModel):
     recommendations: List[str] = Field(default_factory=list, description="Recommendations for improvement")
 
 
+def extract_fast_rewrite_keywords(job_description: str) -> Dict[str, List[str]]:
+    """
+    Categorize JD keywords for the fast rewrite prompt
+    Returns {"core": [...], "tool": [...], "secondary": [...]}
+    """
+    return categorize_for_rewrite(extract_keywords(job_description))
+
+
+def summarize_keyword_coverage(rewritten: str, core_keywords: List[str], tool_keywords: List[str]) -> Dict:
+    """Report which core/tool keywords made it into the rewritten resume"""
+    rewritten_lower = rewritten.lower()
+    core_found = [kw for kw in core_keywords if kw.lower() in rewritten_lower]
+    core_missing = [kw for kw in core_keywords if kw.lower() not in rewritten_lower]
+    return {
+        "core_found": core_found,
+        "core_missing": core_missing,
+        "core_underrepresented": enforce_keyword_minimums(rewritten, core_keywords, min_count=5),
+        "tool_underrepresented": enforce_keyword_minimums(rewritten, tool_keywords, min_count=3),
+    }
+
+
 @app.post("/fast-rewrite", response_model=FastRewriteResponse)
 async def fast_rewrite(request: FastRewriteRequest):
     """
@@ -553,75 +452,14 @@ async def fast_rewrite(request: FastRewriteRequest):
     - No validation step
     - Uses FAST_REWRITE_PROMPT from prompts.py
     """
-    # Enhanced keyword extraction with categorization (CORE, TOOLS, SECONDARY)
-    jd_lower = request.job_description.lower()
-    jd_text = request.job_description
-    
-    # Define tool/platform keywords (programming languages, frameworks, tools)
-    tool_keywords_list = [
-        'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue', 'node.js',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
-        'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
-        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-        'go', 'golang', 'rust', 'c++', 'c#', '.net', 'spring boot', 'django', 'flask', 'fastapi',
-        'git', 'linux', 'unix', 'bash', 'shell scripting', 'graphql', 'rest api', 'ci/cd'
-    ]
-    
-    # Extract tool keywords
-    tool_keywords = []
-    for tool in tool_keywords_list:
-        pattern = r'\b' + re.escape(tool.lower()) + r'\b'
-        if re.search(pattern, jd_lower):
-            tool_keywords.append(tool.title() if ' ' not in tool else tool)
-    
-    # Extract acronyms as tools (API, AWS, ML, AI, CI/CD, etc.)
-    acronyms = re.findall(r'\b[A-Z]{2,6}(?:[/-][A-Z]{2,6})?\b', jd_text)
-    tool_keywords.extend([a for a in acronyms if a not in tool_keywords])
-    tool_keywords = list(set(tool_keywords))[:25]
-    
-    # Extract core keywords (concepts, methodologies, domain terms)
-    # Multi-word technical phrases (2-4 words)
-    multi_word_phrases = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b', jd_text)
-    exclude_phrases = {'The', 'This', 'That', 'With', 'From', 'For', 'And', 'Are', 'You', 'Your', 'Our', 'Company', 'Team', 'Work', 'Job', 'Position', 'Role', 'Will', 'Must', 'Should', 'Have', 'Has', 'Been', 'Being'}
-    technical_phrases = [p for p in multi_word_phrases if p not in exclude_phrases and len(p.split()) >= 2]
-    
-    # Core keywords: domain concepts, methodologies, important terms
-    core_keywords = []
-    core_patterns = [
-        r'\b(machine learning|deep learning|data science|nlp|computer vision)\b',
-        r'\b(microservices|distributed systems|cloud-native|serverless)\b',
-        r'\b(agile|scrum|devops|ci/cd|continuous integration)\b',
-        r'\b(inference|model serving|latency|throughput|scalability|concurrency)\b',
-        r'\b(api design|restful|graphql|event-driven|reactive)\b',
-        r'\b(monitoring|observability|logging|metrics|tracing)\b'
-    ]
-    
-    for pattern in core_patterns:
-        matches = re.findall(pattern, jd_lower, re.IGNORECASE)
-        core_keywords.extend([m.title() if isinstance(m, str) else m[0].title() for m in matches])
-    
-    # Add technical phrases to core keywords
-    core_keywords.extend(technical_phrases[:15])
-    core_keywords = list(set(core_keywords))[:20]
-    
-    # Secondary keywords: contextual terms, soft skills, domain-specific
-    secondary_keywords = []
-    secondary_patterns = [
-        r'\b(communication|leadership|problem solving|teamwork|collaboration)\b',
-        r'\b(architecture|design|implementation|optimization|performance)\b',
-        r'\b(testing|quality assurance|automation|deployment)\b'
-    ]
-    
-    for pattern in secondary_patterns:
-        matches = re.findall(pattern, jd_lower, re.IGNORECASE)
-        secondary_keywords.extend([m.title() if isinstance(m, str) else m[0].title() for m in matches])
-    
-    # Extract capitalized words that aren't tools or core
-    caps_words = re.findall(r'\b[A-Z][A-Za-z0-9+#.]*(?:\s+[A-Z][A-Za-z0-9+#.]*)*\b', jd_text)
-    exclude_words = ['The', 'This', 'That', 'With', 'From', 'For', 'And', 'Are', 'You', 'Your', 'Our', 'Company', 'Team', 'Work', 'Job', 'Position', 'Role', 'Will', 'Must', 'Should', 'Have', 'Has', 'Been', 'Being']
-    additional_secondary = [w for w in caps_words if len(w) > 2 and w not in exclude_words and w not in tool_keywords and w not in core_keywords]
-    secondary_keywords.extend(additional_secondary[:15])
-    secondary_keywords = list(set(secondary_keywords))[:20]
+    set_llm_priority(PRIORITY_INTERACTIVE)
+    with span("jd_clean"):
+        job_description = clean_job_description(request.job_description, "FAST-REWRITE").text
+    with span("jd_keywords"):
+        keywords = extract_fast_rewrite_keywords(job_description)
+    core_keywords = keywords["core"]
+    tool_keywords = keywords["tool"]
+    secondary_keywords = keywords["secondary"]
     
     # Format for prompt
     core_keywords_str = ', '.join(core_keywords) if core_keywords else 'Not specified'
@@ -631,7 +469,7 @@ async def fast_rewrite(request: FastRewriteRequest):
     print("\n" + "="*80)
     print("[FAST-REWRITE] ========== STARTING RESUME OPTIMIZATION ==========")
     print("="*80)
-    print(f"[FAST-REWRITE] JD length: {len(request.job_description)} chars")
+    print(f"[FAST-REWRITE] JD length: {len(job_description)} chars")
     print(f"[FAST-REWRITE] Resume length: {len(request.resume)} chars")
     print(f"[FAST-REWRITE] Resume format: {request.resume_format}")
     print(f"[FAST-REWRITE] Model: {OPENAI_MODEL}")
@@ -663,7 +501,17 @@ async def fast_rewrite(request: FastRewriteRequest):
         print(f"[FAST-REWRITE] Prompt length: {len(prompt)} chars")
         
         # Initial LLM call - returns raw LaTeX, no JSON parsing needed
-        rewritten = call_llm(prompt, FAST_REWRITE_SYSTEM_PROMPT, temperature=0.0)
+        rewritten = None
+        if request.parallel_sections:
+            print("[FAST-REWRITE] Section-parallel mode: rewriting sections concurrently")
+            rewritten = await rewrite_sections_parallel(
+                request.resume,
+                f"CORE KEYWORDS (HIGH PRIORITY):\n{core_keywords_str}\n\n"
+                f"TOOLS / PLATFORMS:\n{tool_keywords_str}\n\n"
+                f"SECONDARY / CONTEXTUAL:\n{secondary_keywords_str}"
+            )
+        if rewritten is None:
+            rewritten = await call_llm(prompt, FAST_REWRITE_SYSTEM_PROMPT, temperature=0.0)
         
         print(f"[FAST-REWRITE] LLM returned {len(rewritten) if rewritten else 0} chars")
         
@@ -686,35 +534,28 @@ async def fast_rewrite(request: FastRewriteRequest):
                 print(f"  Missing: {', '.join(core_missing[:10])}")
         
         # Clean up any markdown code fences if present
-        if rewritten and rewritten.startswith('```'):
-            lines = rewritten.split('\n')
-            if lines[-1].strip() == '```':
-                lines = lines[1:-1]
-            elif lines[0].startswith('```'):
-                lines = lines[1:]
-            rewritten = '\n'.join(lines)
-        
-        rewritten = rewritten.strip()
+        rewritten = strip_code_fences(rewritten)
         
         # POST-REWRITE ATS REINFORCEMENT PASS (Optional - can be skipped for speed)
         # Only runs if skip_reinforcement=False AND significant keywords are missing
         if not request.skip_reinforcement and core_keywords:
-            print("\n[FAST-REWRITE] --- CHECKING KEYWORD FREQUENCY (REINFORCEMENT PASS) ---")
-            missing_core = enforce_keyword_minimums(rewritten, core_keywords, min_count=5)
-            # Only trigger if >30% of core keywords are missing (avoid unnecessary second LLM call)
-            missing_ratio = len(missing_core) / len(core_keywords) if core_keywords else 0
+            with span("reinforcement"):
+                print("\n[FAST-REWRITE] --- CHECKING KEYWORD FREQUENCY (REINFORCEMENT PASS) ---")
+                missing_core = enforce_keyword_minimums(rewritten, core_keywords, min_count=5)
+                # Only trigger if >30% of core keywords are missing (avoid unnecessary second LLM call)
+                missing_ratio = len(missing_core) / len(core_keywords) if core_keywords else 0
             
-            print(f"[FAST-REWRITE] Core keywords check: {len(missing_core)}/{len(core_keywords)} need more mentions (threshold: >30%)")
-            if missing_core:
-                print(f"[FAST-REWRITE] Keywords needing reinforcement: {', '.join([kw.split('(')[0].strip() for kw in missing_core[:10]])}")
+                print(f"[FAST-REWRITE] Core keywords check: {len(missing_core)}/{len(core_keywords)} need more mentions (threshold: >30%)")
+                if missing_core:
+                    print(f"[FAST-REWRITE] Keywords needing reinforcement: {', '.join([kw.split('(')[0].strip() for kw in missing_core[:10]])}")
             
-            if missing_core and missing_ratio > 0.3:  # Only if >30% missing
-                print(f"[FAST-REWRITE] ⚠️  Reinforcement needed: {missing_ratio*100:.0f}% of core keywords underrepresented")
-                print(f"[FAST-REWRITE] Triggering reinforcement pass...")
+                if missing_core and missing_ratio > 0.3:  # Only if >30% missing
+                    print(f"[FAST-REWRITE] ⚠️  Reinforcement needed: {missing_ratio*100:.0f}% of core keywords underrepresented")
+                    print(f"[FAST-REWRITE] Triggering reinforcement pass...")
                 
-                # More targeted reinforcement prompt - only fix missing keywords, not full rewrite
-                missing_keywords_only = [kw.split('(')[0].strip() for kw in missing_core[:8]]  # Limit to top 8
-                reinforcement_prompt = f"""
+                    # More targeted reinforcement prompt - only fix missing keywords, not full rewrite
+                    missing_keywords_only = [kw.split('(')[0].strip() for kw in missing_core[:8]]  # Limit to top 8
+                    reinforcement_prompt = f"""
 IMPORTANT: The following core keywords are missing or underrepresented in the resume:
 {', '.join(missing_keywords_only)}
 
@@ -731,34 +572,28 @@ Current resume (first 1500 chars for context):
 Return the COMPLETE resume with these keywords added naturally.
 """
                 
-                try:
-                    # Use a shorter, more targeted prompt for reinforcement
-                    reinforcement_response = call_llm(
-                        reinforcement_prompt + "\n\n" + rewritten[:3000],  # Include more context
-                        "You are a resume keyword optimization assistant. Add missing keywords naturally to existing content without rewriting everything.",
-                        temperature=0.0
-                    )
+                    try:
+                        # Use a shorter, more targeted prompt for reinforcement
+                        reinforcement_response = await call_llm(
+                            reinforcement_prompt + "\n\n" + rewritten[:3000],  # Include more context
+                            "You are a resume keyword optimization assistant. Add missing keywords naturally to existing content without rewriting everything.",
+                            temperature=0.0
+                        )
                     
-                    # Clean up markdown fences
-                    if reinforcement_response and reinforcement_response.startswith('```'):
-                        lines = reinforcement_response.split('\n')
-                        if lines[-1].strip() == '```':
-                            lines = lines[1:-1]
-                        elif lines[0].startswith('```'):
-                            lines = lines[1:]
-                        reinforcement_response = '\n'.join(lines).strip()
+                        # Clean up markdown fences
+                        reinforcement_response = strip_code_fences(reinforcement_response)
                     
-                    # Use reinforcement response if it's longer (likely has more content)
-                    if reinforcement_response and len(reinforcement_response) > len(rewritten) * 0.8:
-                        rewritten = reinforcement_response
-                        print(f"[FAST-REWRITE] ✓ Reinforcement pass completed (added {len(missing_keywords_only)} keywords)")
-                    else:
-                        print(f"[FAST-REWRITE] ⚠️  Reinforcement response too short, using original")
-                except Exception as e:
-                    print(f"[FAST-REWRITE] ❌ Reinforcement pass failed (using original): {e}")
-                    # Continue with original rewritten resume
-            elif missing_core:
-                print(f"[FAST-REWRITE] ✓ {len(missing_core)} keywords missing but below threshold ({missing_ratio*100:.0f}% < 30%), skipping reinforcement for speed")
+                        # Use reinforcement response if it's longer (likely has more content)
+                        if reinforcement_response and len(reinforcement_response) > len(rewritten) * 0.8:
+                            rewritten = reinforcement_response
+                            print(f"[FAST-REWRITE] ✓ Reinforcement pass completed (added {len(missing_keywords_only)} keywords)")
+                        else:
+                            print(f"[FAST-REWRITE] ⚠️  Reinforcement response too short, using original")
+                    except Exception as e:
+                        print(f"[FAST-REWRITE] ❌ Reinforcement pass failed (using original): {e}")
+                        # Continue with original rewritten resume
+                elif missing_core:
+                    print(f"[FAST-REWRITE] ✓ {len(missing_core)} keywords missing but below threshold ({missing_ratio*100:.0f}% < 30%), skipping reinforcement for speed")
         elif request.skip_reinforcement:
             print(f"[FAST-REWRITE] ⏭️  Reinforcement pass skipped (skip_reinforcement=True)")
         
@@ -783,32 +618,201 @@ Return the COMPLETE resume with these keywords added naturally.
             rewritten_resume=rewritten,
             resume_format=request.resume_format or "latex"
         )
+    except LLMRateLimited:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Fast rewrite failed: {str(e)}")
 
 
+def format_sse(event: str, data: Dict) -> str:
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/fast-rewrite-stream")
+async def fast_rewrite_stream(request: FastRewriteRequest):
+    """
+    STREAMING variant of /fast-rewrite (Server-Sent Events)
+    - "token" events carry text deltas as the model produces them
+    - A final "done" event carries the cleaned resume and the keyword coverage summary
+    - An "error" event is sent instead of "done" if generation fails
+    The reinforcement pass is not run in streaming mode (use /fast-rewrite for that)
+    """
+    set_llm_priority(PRIORITY_INTERACTIVE)
+    with span("jd_clean"):
+        job_description = clean_job_description(request.job_description, "FAST-REWRITE").text
+    with span("jd_keywords"):
+        keywords = extract_fast_rewrite_keywords(job_description)
+    core_keywords = keywords["core"]
+    tool_keywords = keywords["tool"]
+    secondary_keywords = keywords["secondary"]
+    
+    prompt = FAST_REWRITE_PROMPT.format(
+        core_keywords=', '.join(core_keywords) if core_keywords else 'Not specified',
+        tool_keywords=', '.join(tool_keywords) if tool_keywords else 'Not specified',
+        secondary_keywords=', '.join(secondary_keywords) if secondary_keywords else 'Not specified',
+        resume=request.resume
+    )
+    
+    async def event_stream():
+        parts = []
+        try:
+            async for delta in stream_llm(prompt, FAST_REWRITE_SYSTEM_PROMPT, temperature=0.0):
+                parts.append(delta)
+                yield format_sse("token", {"text": delta})
+            
+            rewritten = strip_code_fences("".join(parts))
+            coverage = summarize_keyword_coverage(rewritten, core_keywords, tool_keywords)
+            print(f"[FAST-REWRITE-STREAM] Streamed {len(rewritten)} chars, core keywords found: {len(coverage['core_found'])}/{len(core_keywords)}")
+            
+            yield format_sse("done", {
+                "rewritten_resume": rewritten,
+                "resume_format": request.resume_format or "latex",
+                "keywords": keywords,
+                "keyword_coverage": coverage
+            })
+        except LLMRateLimited as e:
+            yield format_sse("error", {"detail": f"Fast rewrite failed: {e.detail}", "retry_after": e.retry_after})
+        except Exception as e:
+            error_msg = e.detail if isinstance(e, HTTPException) else str(e)
+            yield format_sse("error", {"detail": f"Fast rewrite failed: {error_msg}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Batch rewrites: one resume against many job descriptions
+BATCH_REWRITE_CONCURRENCY = int(os.getenv("BATCH_REWRITE_CONCURRENCY", "4"))
+BATCH_REWRITE_MAX_JOBS = int(os.getenv("BATCH_REWRITE_MAX_JOBS", "50"))
+
+
+class BatchRewriteRequest(BaseModel):
+    """One resume rewritten against several job descriptions"""
+    resume: str = Field(..., description="Resume text or LaTeX code")
+    resume_format: Optional[str] = Field("latex", description="Format: 'text' or 'latex'")
+    job_descriptions: List[str] = Field(..., description="Job description texts, one rewrite per entry")
+    skip_reinforcement: Optional[bool] = Field(False, description="Skip reinforcement pass for faster processing (may reduce ATS score)")
+    parallel_sections: Optional[bool] = Field(False, description="Rewrite LaTeX sections concurrently (faster for long resumes)")
+    skip_validation: Optional[bool] = Field(False, description="Skip validation against the original resume")
+    concurrency: Optional[int] = Field(None, description="Rewrites in flight at once (capped at BATCH_REWRITE_CONCURRENCY)")
+
+
+@app.post("/fast-rewrite-batch")
+async def fast_rewrite_batch(request: BatchRewriteRequest):
+    """
+    BATCH variant of /fast-rewrite (NDJSON stream)
+    - Resume metadata is extracted once and shared by every job
+    - Rewrites run concurrently, at most `concurrency` at a time
+    - One JSON line per job as soon as it finishes ({"index", "status": "ok" | "error", ...}),
+      then a final {"done": true, ...} summary line
+    """
+    if not request.job_descriptions:
+        raise HTTPException(status_code=400, detail="job_descriptions must not be empty")
+    if len(request.job_descriptions) > BATCH_REWRITE_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_REWRITE_MAX_JOBS} job descriptions per batch")
+    
+    is_latex_format = request.resume_format == "latex" or is_latex(request.resume)
+    resume_format = "latex" if is_latex_format else "text"
+    metadata = None if request.skip_validation else await get_resume_metadata(request.resume, is_latex_format)
+    concurrency = max(1, min(request.concurrency or BATCH_REWRITE_CONCURRENCY, BATCH_REWRITE_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    print(f"[FAST-REWRITE-BATCH] {len(request.job_descriptions)} jobs, concurrency {concurrency}")
+    
+    async def run_job(index: int, job_description: str) -> Dict:
+        # Bulk work yields to interactive requests in the LLM scheduler
+        set_llm_priority(PRIORITY_BACKGROUND)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await fast_rewrite(FastRewriteRequest(
+                    job_description=job_description,
+                    resume=request.resume,
+                    resume_format=resume_format,
+                    skip_reinforcement=request.skip_reinforcement,
+                    parallel_sections=request.parallel_sections
+                ))
+            except Exception as e:
+                error_msg = e.detail if isinstance(e, HTTPException) else str(e)
+                result = {"index": index, "status": "error", "detail": error_msg,
+                          "elapsed_seconds": round(time.perf_counter() - started, 3)}
+                if isinstance(e, LLMRateLimited):
+                    result["retry_after"] = e.retry_after
+                return result
+        
+        result = {
+            "index": index,
+            "status": "ok",
+            "rewritten_resume": response.rewritten_resume,
+            "resume_format": response.resume_format,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+        if metadata is not None:
+            rewritten_text = extract_text_from_latex(response.rewritten_resume) if is_latex_format else response.rewritten_resume
+            with span("validation"):
+                validation_result = validate_resume_changes(
+                    original_resume=metadata["resume_text"],
+                    rewritten_resume=rewritten_text,
+                    original_skills=metadata["skills"],
+                    original_companies=metadata["companies"],
+                    original_dates=metadata["dates"]
+                )
+            result["validation_passed"] = validation_result["passed"]
+            result["changes_made"] = validation_result["changes"]
+        return result
+    
+    async def result_stream():
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(run_job(i, jd)) for i, jd in enumerate(request.job_descriptions)]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                succeeded += result["status"] == "ok"
+                yield json.dumps(result) + "\n"
+            
+            elapsed = time.perf_counter() - started
+            print(f"[FAST-REWRITE-BATCH] {succeeded}/{len(tasks)} succeeded in {elapsed:.2f}s")
+            yield json.dumps({
+                "done": True,
+                "total": len(tasks),
+                "succeeded": succeeded,
+                "failed": len(tasks) - succeeded,
+                "elapsed_seconds": round(elapsed, 3)
+            }) + "\n"
+        finally:
+            # Client went away: stop the rewrites that have not finished yet
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        result_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/calculate-ats-score", response_model=ATSScoreResponse)
 async def calculate_ats_score(request: ATSScoreRequest):
     """
     Calculate ATS compatibility score for resume against job description
-    Uses LLM to analyze keyword matching, placement, density, and relevance
+    Keyword matching, placement, density, and relevance are computed locally (deterministic, milliseconds)
+    The LLM is only used, if include_feedback is set, to write strengths and recommendations
     """
     try:
-        # Extract text from LaTeX if needed
-        if request.resume_format == "latex" or is_latex(request.resume):
-            resume_text = extract_text_from_latex(request.resume)
-        else:
-            resume_text = request.resume
+        # Extracted text and section index come from the resume artifact store
+        is_latex_format = request.resume_format == "latex" or is_latex(request.resume)
+        resume_text = (await get_resume_metadata(request.resume, is_latex_format))["resume_text"]
+        resume_sections = await asyncio.to_thread(resume_artifacts.sections, request.resume, is_latex_format)
         
-        # Truncate if very long (to avoid token limits)
-        jd_truncated = truncate_prompt_if_needed(request.job_description, max_length=8000)
-        resume_truncated = truncate_prompt_if_needed(resume_text, max_length=10000)
-        
-        # Format prompt
-        prompt = ATS_SCORE_PROMPT.format(
-            job_description=jd_truncated,
-            resume=resume_truncated
-        )
+        # Drop boilerplate, then fit inputs into their token budgets
+        with span("jd_clean"):
+            job_description = clean_job_description(request.job_description, "ATS-SCORE").text
+        jd_truncated = budget_prompt_input(job_description, "job_description", OPENAI_MODEL)
+        resume_truncated = budget_prompt_input(resume_text, "resume", OPENAI_MODEL)
         
         print("\n" + "="*80)
         print("[ATS-SCORE] ========== STARTING ATS SCORE CALCULATION ==========")
@@ -819,7 +823,8 @@ async def calculate_ats_score(request: ATSScoreRequest):
         
         # Extract and log keywords from JD for comparison
         print("\n[ATS-SCORE] --- EXTRACTING KEYWORDS FROM JOB DESCRIPTION ---")
-        jd_keywords_extracted = extract_keywords_from_text(jd_truncated)
+        with span("jd_keywords"):
+            jd_keywords_extracted = extract_keywords_from_text(jd_truncated)
         print(f"[ATS-SCORE] Found {len(jd_keywords_extracted)} unique keywords in JD:")
         for i, kw in enumerate(jd_keywords_extracted[:30], 1):  # Show first 30
             print(f"  {i}. {kw}")
@@ -828,7 +833,8 @@ async def calculate_ats_score(request: ATSScoreRequest):
         
         # Extract and log keywords from Resume
         print("\n[ATS-SCORE] --- EXTRACTING KEYWORDS FROM RESUME ---")
-        resume_keywords_extracted = extract_keywords_from_text(resume_truncated)
+        with span("resume_keywords"):
+            resume_keywords_extracted = extract_keywords_from_text(resume_truncated)
         print(f"[ATS-SCORE] Found {len(resume_keywords_extracted)} unique keywords in Resume:")
         for i, kw in enumerate(resume_keywords_extracted[:30], 1):  # Show first 30
             print(f"  {i}. {kw}")
@@ -837,8 +843,9 @@ async def calculate_ats_score(request: ATSScoreRequest):
         
         # Compare and find missing keywords
         print("\n[ATS-SCORE] --- COMPARING KEYWORDS ---")
-        missing_from_resume = [kw for kw in jd_keywords_extracted if kw.lower() not in [r.lower() for r in resume_keywords_extracted]]
-        found_in_resume = [kw for kw in jd_keywords_extracted if kw.lower() in [r.lower() for r in resume_keywords_extracted]]
+        resume_keywords_lower = {r.lower() for r in resume_keywords_extracted}
+        missing_from_resume = [kw for kw in jd_keywords_extracted if kw.lower() not in resume_keywords_lower]
+        found_in_resume = [kw for kw in jd_keywords_extracted if kw.lower() in resume_keywords_lower]
         print(f"[ATS-SCORE] JD keywords FOUND in resume: {len(found_in_resume)}/{len(jd_keywords_extracted)}")
         if found_in_resume:
             print(f"[ATS-SCORE] Found keywords: {', '.join(found_in_resume[:20])}")
@@ -850,139 +857,51 @@ async def calculate_ats_score(request: ATSScoreRequest):
             if len(missing_from_resume) > 20:
                 print(f"  ... and {len(missing_from_resume) - 20} more")
         
-        print("\n[ATS-SCORE] --- CALLING LLM FOR DETAILED ANALYSIS ---")
-        # Call LLM for ATS score calculation
-        response_text = call_llm(prompt, ATS_SCORE_SYSTEM_PROMPT, temperature=0.0)
-        
-        print(f"[ATS-SCORE] LLM returned {len(response_text) if response_text else 0} chars")
-        
-        # Parse JSON response
-        score_data = extract_structured_json(response_text)
-        
-        # Validate response structure
-        if "ats_score" not in score_data:
-            raise ValueError("Invalid ATS score response: missing 'ats_score' field")
-        
-        if "breakdown" not in score_data:
-            raise ValueError("Invalid ATS score response: missing 'breakdown' field")
-        
-        breakdown = score_data["breakdown"]
-        if not all(key in breakdown for key in ["keyword_matching", "keyword_placement", "keyword_density", "relevance_alignment"]):
-            raise ValueError("Invalid ATS score response: incomplete breakdown")
-        
-        # Ensure scores are within valid range
-        ats_score = max(0, min(100, float(score_data["ats_score"])))
-        breakdown["keyword_matching"] = max(0, min(100, float(breakdown["keyword_matching"])))
-        breakdown["keyword_placement"] = max(0, min(100, float(breakdown["keyword_placement"])))
-        breakdown["keyword_density"] = max(0, min(100, float(breakdown["keyword_density"])))
-        breakdown["relevance_alignment"] = max(0, min(100, float(breakdown["relevance_alignment"])))
-        
-        # Filter out irrelevant keywords from missing_keywords and recommendations
-        # These are cookie/privacy/form-related keywords that should NOT appear in job requirements
-        irrelevant_keywords_exact = [
-            'cookie', 'cookies', 'consent', 'privacy policy', 'privacy', 'personal data', 
-            'data protection', 'gdpr', 'tracking', 'targeting',
-            'apply now', 'submit', 'upload', 'browse', 'choose file', 'required field',
-            'first name', 'last name', 'email', 'phone', 'address', 'city', 'state', 'zip',
-            'click here', 'learn more', 'read more', 'view job', 'share job', 'save job',
-            'follow us', 'connect with us', 'social media', 'copyright', 'all rights reserved'
-        ]
-        
-        # Non-actionable requirements that shouldn't be in missing_keywords
-        # (These are qualifications/eligibility requirements, not technical skills)
-        non_actionable_patterns = [
-            r'\b\d+\s*(months?|years?|weeks?)\s*(of\s*)?(experience|work|employment)',
-            r'\bless\s+than\s+or\s+equal\s+to\s+\d+',
-            r'\bmore\s+than\s+\d+',
-            r'\bat\s+least\s+\d+',
-            r'\bminimum\s+of\s+\d+',
-            r'\bmaximum\s+of\s+\d+',
-            r'\bsecurity\s+clearance',
-            r'\bability\s+to\s+obtain\s+clearance',
-            r'\bobtain\s+and\s+maintain\s+clearance',
-            r'\beligible\s+for\s+clearance',
-            r'\bBachelor\'?s?\s+(degree|of\s+Science|of\s+Arts)',
-            r'\bMaster\'?s?\s+(degree|of\s+Science|of\s+Arts)',
-            r'\bPhD\b',
-            r'\bDoctorate\b',
-            r'\bdegree\s+in\s+[A-Z]',
-            r'\bmust\s+be\s+located',
-            r'\bwilling\s+to\s+relocate',
-            r'\bwork\s+authorization',
-            r'\blegal\s+right\s+to\s+work',
-            r'\bUS\s+citizen',
-            r'\bpermanent\s+resident',
-        ]
-        
-        # Keywords that are only irrelevant in certain contexts (e.g., "analytics" in cookie context)
-        # But we'll filter them if they appear alone or with cookie-related terms
-        context_dependent = ['analytics', 'performance']
-        
-        def is_irrelevant(text):
-            """Check if text contains irrelevant keywords or non-actionable requirements"""
-            if not text:
-                return False
-            text_lower = text.lower().strip()
-            
-            # Check for exact matches (case-insensitive) - cookie/privacy/form keywords
-            for irrelevant in irrelevant_keywords_exact:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(irrelevant.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    return True
-            
-            # Check for non-actionable requirements (experience duration, clearance, degree, etc.)
-            for pattern in non_actionable_patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    return True
-            
-            # Check for context-dependent keywords when they appear alone or with cookie terms
-            for kw in context_dependent:
-                pattern = r'\b' + re.escape(kw.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    # If it's just the word alone or with cookie-related terms, filter it
-                    # But allow it if it's part of a technical phrase
-                    if text_lower == kw.lower() or text_lower == kw.lower() + 's':
-                        return True
-                    # Check if it's mentioned with cookie/privacy terms
-                    if any(cookie_term in text_lower for cookie_term in ['cookie', 'privacy', 'consent', 'tracking', 'targeting']):
-                        return True
-            
-            # Check for phrases that indicate cookie/privacy context
-            cookie_phrases = [
-                'cookie', 'cookies', 'privacy', 'consent', 'personal data', 
-                'data privacy', 'cookie consent', 'cookie policy'
-            ]
-            if any(phrase in text_lower for phrase in cookie_phrases):
-                return True
-            
-            # Check for generic non-technical requirements
-            generic_non_technical = [
-                'must be', 'required to be', 'must have', 'should have',
-                'team player', 'good communication', 'strong communication',
-                'work well in', 'collaborative', 'self-motivated'
-            ]
-            # Only filter if the entire phrase is generic (not part of technical description)
-            if any(phrase in text_lower and len(text_lower.split()) < 8 for phrase in generic_non_technical):
-                return True
-            
-            return False
+        print("\n[ATS-SCORE] --- COMPUTING LOCAL ATS SCORE ---")
+        with span("ats_scoring"):
+            local_score = score_resume(
+                job_description,
+                resume_text,
+                resume_sections,
+                is_irrelevant=is_irrelevant_keyword
+            )
+        ats_score = local_score["ats_score"]
+        breakdown = local_score["breakdown"]
+        filtered_missing = local_score["missing_keywords"][:20]
+        print(f"[ATS-SCORE] Local score: {ats_score}% ({len(local_score['found_keywords'])} JD keywords found, {len(local_score['missing_keywords'])} missing)")
         
-        # Filter missing keywords
-        missing_keywords = score_data.get("missing_keywords", [])
-        filtered_missing = [kw for kw in missing_keywords if not is_irrelevant(kw)]
+        strengths = []
+        recommendations = []
+        if request.include_feedback:
+            print("\n[ATS-SCORE] --- CALLING LLM FOR STRENGTHS & RECOMMENDATIONS ---")
+            prompt = ATS_FEEDBACK_PROMPT.format(
+                job_description=jd_truncated,
+                resume=resume_truncated,
+                ats_score=ats_score,
+                found_keywords=', '.join(local_score["found_keywords"][:30]) or 'None',
+                missing_keywords=', '.join(filtered_missing) or 'None',
+                **breakdown
+            )
+            try:
+                response_text = await call_llm(
+                    prompt, ATS_FEEDBACK_SYSTEM_PROMPT, temperature=0.0, validate=extract_structured_json
+                )
+                print(f"[ATS-SCORE] LLM returned {len(response_text) if response_text else 0} chars")
+                feedback = extract_structured_json(response_text)
+                strengths = feedback.get("strengths", [])
+                recommendations = feedback.get("recommendations", [])
+            except Exception as e:
+                # Scores are already computed; return them without prose rather than failing
+                error_msg = e.detail if isinstance(e, HTTPException) else str(e)
+                print(f"[ATS-SCORE] Feedback generation failed (returning scores only): {error_msg}")
         
         # Filter recommendations
-        recommendations = score_data.get("recommendations", [])
-        filtered_recommendations = [rec for rec in recommendations if not is_irrelevant(rec)]
+        filtered_recommendations = [rec for rec in recommendations if not is_irrelevant_keyword(rec)]
         
         # Filter strengths (less critical, but still filter obvious irrelevant ones)
-        strengths = score_data.get("strengths", [])
-        filtered_strengths = [s for s in strengths if not is_irrelevant(s)]
+        filtered_strengths = [s for s in strengths if not is_irrelevant_keyword(s)]
         
         print("\n[ATS-SCORE] --- FILTERING IRRELEVANT KEYWORDS ---")
-        print(f"[ATS-SCORE] Original missing keywords from LLM: {missing_keywords}")
-        print(f"[ATS-SCORE] Filtered {len(missing_keywords) - len(filtered_missing)} irrelevant missing keywords")
         print(f"[ATS-SCORE] Final missing keywords (after filtering): {filtered_missing}")
         print(f"[ATS-SCORE] Filtered {len(recommendations) - len(filtered_recommendations)} irrelevant recommendations")
         print(f"[ATS-SCORE] Final recommendations: {filtered_recommendations}")
@@ -1022,33 +941,17 @@ async def process_and_rewrite(request: CombinedProcessRequest):
     is_latex_format = request.resume_format == "latex" or is_latex(request.resume)
     
     # Extract original resume metadata for validation (use cache if available)
-    resume_hash = str(hash(request.resume))
-    if resume_hash in resume_metadata_cache:
-        resume_text = resume_metadata_cache[resume_hash]["resume_text"]
-        original_skills = resume_metadata_cache[resume_hash]["skills"]
-        original_companies = resume_metadata_cache[resume_hash]["companies"]
-        original_dates = resume_metadata_cache[resume_hash]["dates"]
-    else:
-        if is_latex_format:
-            resume_text = extract_text_from_latex(request.resume)
-        else:
-            resume_text = request.resume
-        
-        original_skills = extract_skills_from_resume(resume_text)
-        original_companies = extract_companies_from_resume(resume_text)
-        original_dates = extract_dates_from_resume(resume_text)
-        
-        # Cache metadata
-        resume_metadata_cache[resume_hash] = {
-            "resume_text": resume_text,
-            "skills": original_skills,
-            "companies": original_companies,
-            "dates": original_dates
-        }
+    metadata = await get_resume_metadata(request.resume, is_latex_format)
+    resume_text = metadata["resume_text"]
+    original_skills = metadata["skills"]
+    original_companies = metadata["companies"]
+    original_dates = metadata["dates"]
     
-    # Truncate inputs if very long
-    jd_truncated = truncate_prompt_if_needed(request.job_description, max_length=8000)
-    resume_truncated = truncate_prompt_if_needed(request.resume, max_length=10000)
+    # Drop JD boilerplate, then fit inputs into their token budgets
+    with span("jd_clean"):
+        job_description = clean_job_description(request.job_description, "PROCESS-REWRITE").text
+    jd_truncated = budget_prompt_input(job_description, "job_description", OPENAI_MODEL)
+    resume_truncated = budget_prompt_input(request.resume, "resume", OPENAI_MODEL)
     
     # Use combined prompt
     prompt = COMBINED_PROCESS_PROMPT.format(
@@ -1059,7 +962,7 @@ async def process_and_rewrite(request: CombinedProcessRequest):
     
     try:
         # Single LLM call for both parsing and rewriting
-        response_text = call_llm(prompt, system_prompt, temperature=0.0)
+        response_text = await call_llm(prompt, system_prompt, temperature=0.0, validate=extract_structured_json)
         
         # Parse the combined response
         combined_data = extract_structured_json(response_text)
@@ -1084,13 +987,14 @@ async def process_and_rewrite(request: CombinedProcessRequest):
             else:
                 rewritten_text = rewritten_resume
             
-            validation_result = validate_resume_changes(
-                original_resume=resume_text,
-                rewritten_resume=rewritten_text,
-                original_skills=original_skills,
-                original_companies=original_companies,
-                original_dates=original_dates
-            )
+            with span("validation"):
+                validation_result = validate_resume_changes(
+                    original_resume=resume_text,
+                    rewritten_resume=rewritten_text,
+                    original_skills=original_skills,
+                    original_companies=original_companies,
+                    original_dates=original_dates
+                )
         
         return ResumeRewriteResponse(
             rewritten_resume=rewritten_resume,
@@ -1098,6 +1002,8 @@ async def process_and_rewrite(request: CombinedProcessRequest):
             validation_passed=validation_result["passed"],
             resume_format="latex" if is_latex_format else "text"
         )
+    except LLMRateLimited:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process and rewrite: {str(e)}")
 
@@ -1107,81 +1013,50 @@ async def latex_to_pdf(request: LaTeXToPDFRequest):
     """
     Convert LaTeX code to PDF
     Returns the PDF file for download
+    Compiles run in a bounded async pdflatex pool; identical LaTeX is served from the PDF cache
     """
-    # Create temporary directory for LaTeX compilation
-    with tempfile.TemporaryDirectory() as tmpdir:
-        latex_file = Path(tmpdir) / "resume.tex"
-        pdf_file = Path(tmpdir) / "resume.pdf"
-        
-        # Write LaTeX code to file
-        latex_file.write_text(request.latex_code, encoding='utf-8')
-        
-        try:
-            # Compile LaTeX to PDF using pdflatex
-            # Run pdflatex twice to resolve references
-            result = subprocess.run(
-                ['pdflatex', '-interaction=nonstopmode', '-output-directory', tmpdir, str(latex_file)],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                # Try second compilation for references
-                subprocess.run(
-                    ['pdflatex', '-interaction=nonstopmode', '-output-directory', tmpdir, str(latex_file)],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-            
-            if not pdf_file.exists():
-                error_msg = result.stderr or result.stdout or "Unknown LaTeX compilation error"
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"LaTeX compilation failed: {error_msg[:500]}"
-                )
-            
-            # Return PDF file
-            return FileResponse(
-                path=str(pdf_file),
-                media_type='application/pdf',
-                filename='resume.pdf',
-                headers={'Content-Disposition': 'attachment; filename=resume.pdf'}
-            )
-            
-        except subprocess.TimeoutExpired:
-            raise HTTPException(status_code=500, detail="LaTeX compilation timed out")
-        except FileNotFoundError:
-            raise HTTPException(
-                status_code=500,
-                detail="pdflatex not found. Please install LaTeX (e.g., MacTeX on macOS, TeX Live on Linux)"
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"PDF conversion failed: {str(e)}")
-
-
+    try:
+        pdf_bytes = await latex_compiler.compile(request.latex_code)
+    except CompileQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except LatexCompileTimeout:
+        raise HTTPException(status_code=500, detail="LaTeX compilation timed out")
+    except LatexCompileError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"LaTeX compilation failed: {str(e)[:500]}"
+        )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail="pdflatex not found. Please install LaTeX (e.g., MacTeX on macOS, TeX Live on Linux)"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF conversion failed: {str(e)}")
+    
+    # Return PDF file
+    return Response(
+        content=pdf_bytes,
+        media_type='application/pdf',
+        headers={'Content-Disposition': 'attachment; filename=resume.pdf'}
+    )
 
 
 @app.get("/get-user-profile")
-async def get_user_profile(profile_name: str = "AnishDhandore"):
+async def get_user_profile(request: Request, profile_name: str = "AnishDhandore"):
     """
     Get user profile from profiles/{profile_name}.json
+    Served from memory until the file changes; supports If-None-Match
     """
-    backend_dir = Path(__file__).resolve().parent
-    profiles_dir = backend_dir / "profiles"
-    profile_file = profiles_dir / f"{profile_name}.json"
+    profile_file = PROFILES_DIR / f"{profile_name}.json"
     
-    if not profile_file.exists():
+    try:
+        snapshot = file_snapshot_cache.get(profile_file, json.loads)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=404,
             detail=f"Profile file not found: {profile_file}. Please create profiles/{profile_name}.json"
         )
-    
-    try:
-        profile_content = profile_file.read_text(encoding='utf-8')
-        profile_data = json.loads(profile_content)
-        return profile_data
     except json.JSONDecodeError as e:
         raise HTTPException(
             status_code=500,
@@ -1192,22 +1067,17 @@ async def get_user_profile(profile_name: str = "AnishDhandore"):
             status_code=500,
             detail=f"Failed to read profile file: {str(e)}"
         )
+    return snapshot_response(request, snapshot)
 
 
 @app.get("/get-original-resume")
-async def get_original_resume():
+async def get_original_resume(request: Request):
     """
     Get the original resume from the resumes/original/AnishDhandoreResume/ directory
-    Automatically finds the main .tex file
+    Automatically finds the main .tex file (indexed at startup, rescanned when the directory changes)
+    Served from memory until the file changes; supports If-None-Match
     """
-    # Resolve path - resumes folder is in backend/resumes/
-    # __file__ is backend/main.py (absolute path), so parent is backend/
-    backend_dir = Path(__file__).resolve().parent  # backend/ (absolute)
-    original_dir = backend_dir / "resumes" / "original"
-    resume_folder = original_dir / "AnishDhandoreResume"
-    
-    # First try the specific folder, then fall back to original_dir
-    search_dir = resume_folder if resume_folder.exists() else original_dir
+    search_dir, main_file = resume_index.lookup()
     
     if not search_dir.exists():
         raise HTTPException(
@@ -1215,32 +1085,13 @@ async def get_original_resume():
             detail=f"Resume directory not found. Please create resumes/original/AnishDhandoreResume/ and place your resume there."
         )
     
-    # Look for common resume file names
-    possible_names = ["resume.tex", "main.tex", "cv.tex", "curriculum.tex", "AnishDhandoreResume.tex"]
-    tex_files = list(search_dir.rglob("*.tex"))
-    
-    if not tex_files:
+    if main_file is None:
         raise HTTPException(
             status_code=404,
             detail=f"No .tex file found in {search_dir.name}/. Please place your resume.tex file there."
         )
     
-    # Prefer files with common names, otherwise use first found
-    main_file = None
-    for name in possible_names:
-        for tex_file in tex_files:
-            if tex_file.name.lower() == name.lower():
-                main_file = tex_file
-                break
-        if main_file:
-            break
-    
-    if not main_file:
-        main_file = tex_files[0]
-    
-    try:
-        resume_content = main_file.read_text(encoding='utf-8')
-        
+    def build(resume_content: str) -> Dict:
         # Detect format
         is_latex_format = is_latex(resume_content)
         
@@ -1248,14 +1099,44 @@ async def get_original_resume():
             "resume": resume_content,
             "filename": main_file.name,
             "format": "latex" if is_latex_format else "text",
-            "path": str(main_file.relative_to(original_dir)),
+            "path": str(main_file.relative_to(ORIGINAL_RESUMES_DIR)),
             "folder": search_dir.name
         }
+    
+    try:
+        snapshot = file_snapshot_cache.get(main_file, build, variant="original-resume")
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to read resume file: {str(e)}"
         )
+    return snapshot_response(request, snapshot)
+
+
+def resume_parser_key() -> str:
+    """Identifies the parser (model + prompts) a stored resume parse came from"""
+    from prompts import RESUME_PARSE_PROMPT, RESUME_PARSE_SYSTEM_PROMPT
+    return content_digest(OPENAI_MODEL + RESUME_PARSE_SYSTEM_PROMPT + RESUME_PARSE_PROMPT)[:16]
+
+
+async def parse_resume_artifact(resume: str, is_latex_format: bool) -> Dict:
+    """
+    Structured parse of a resume, stored in the artifact store per resume version and parser
+    (model + prompts), so each version is sent to the LLM once
+    """
+    from prompts import RESUME_PARSE_PROMPT, RESUME_PARSE_SYSTEM_PROMPT
+    parser_key = resume_parser_key()
+    
+    parsed = await asyncio.to_thread(resume_artifacts.get_parsed, resume, is_latex_format, parser_key)
+    if parsed is not None:
+        return parsed
+    
+    resume_text = (await get_resume_metadata(resume, is_latex_format))["resume_text"]
+    prompt = RESUME_PARSE_PROMPT.format(resume=budget_prompt_input(resume_text, "resume", OPENAI_MODEL))
+    response_text = await call_llm(prompt, RESUME_PARSE_SYSTEM_PROMPT, temperature=0.0, validate=extract_structured_json)
+    parsed = ResumeParseResponse(**extract_structured_json(response_text)).model_dump()
+    await asyncio.to_thread(resume_artifacts.set_parsed, resume, is_latex_format, parser_key, parsed)
+    return parsed
 
 
 @app.post("/parse-resume", response_model=ResumeParseResponse)
@@ -1264,42 +1145,73 @@ async def parse_resume(request: ResumeParseRequest):
     Parse resume into structured JSON format
     Extracts personal info, work history, education, skills, etc.
     """
-    from prompts import RESUME_PARSE_PROMPT, RESUME_PARSE_SYSTEM_PROMPT
-    
-    # Extract text from LaTeX if needed
-    if request.resume_format == "latex" or is_latex(request.resume):
-        resume_text = extract_text_from_latex(request.resume)
-    else:
-        resume_text = request.resume
-    
-    prompt = RESUME_PARSE_PROMPT.format(resume=truncate_prompt_if_needed(resume_text, max_length=12000))
-    system_prompt = RESUME_PARSE_SYSTEM_PROMPT
+    set_llm_priority(PRIORITY_BACKGROUND)
+    is_latex_format = request.resume_format == "latex" or is_latex(request.resume)
     
     try:
-        response_text = call_llm(prompt, system_prompt, temperature=0.0)
-        parsed_data = extract_structured_json(response_text)
-        return ResumeParseResponse(**parsed_data)
+        return ResumeParseResponse(**await parse_resume_artifact(request.resume, is_latex_format))
+    except LLMRateLimited:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse resume: {str(e)}")
 
 
-@app.post("/analyze-form", response_model=FormAnalysisResponse)
-async def analyze_form(request: FormAnalysisRequest):
+async def warm_resume_artifacts():
     """
-    Analyze HTML form and detect fields, types, and structure
-    Uses LLM to intelligently map form fields to user data
+    Precompute artifacts for the resumes under resumes/original at startup
+    The structured parse (an LLM call) is included when RESUME_ARTIFACT_PREPARSE is set and an API key is
+    configured; with several workers, only the one that claims a resume in the shared store parses it
+    """
+    set_llm_priority(PRIORITY_BACKGROUND)
+    preparse = RESUME_ARTIFACT_PREPARSE and llm_api_key_configured()
+    parser_key = resume_parser_key()
+    resume_index.lookup()
+    for tex_file in resume_index.tex_files:
+        try:
+            resume = await asyncio.to_thread(tex_file.read_text, encoding="utf-8")
+            is_latex_format = is_latex(resume)
+            await get_resume_metadata(resume, is_latex_format)
+            if preparse and await asyncio.to_thread(resume_artifacts.claim_preparse, resume, is_latex_format, parser_key):
+                await parse_resume_artifact(resume, is_latex_format)
+            print(f"[RESUME-ARTIFACTS] Ready: {tex_file.name}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error_msg = e.detail if isinstance(e, HTTPException) else str(e)
+            print(f"[RESUME-ARTIFACTS] Could not prepare {tex_file.name}: {error_msg}")
+
+
+async def analyze_form_controls(form_html: str, form_fields: List[Dict], url: Optional[str]) -> FormAnalysisResponse:
+    """
+    Analyze reduced form HTML whose controls are form_fields
+    On a known ATS the rule pack maps the standard fields and only the leftover controls go to the LLM
     """
     from prompts import FORM_ANALYSIS_PROMPT, FORM_ANALYSIS_SYSTEM_PROMPT
     
-    # Truncate HTML if very long (keep structure)
-    form_html = truncate_prompt_if_needed(request.form_html, max_length=15000)
-    url = request.url or ""
+    site = detect_site(url)
+    mapped_fields: List[Dict] = []
+    llm_html = form_html
+    if site is not None and form_fields:
+        with span("form_rules"):
+            mapped_fields, leftover_fields = map_form_fields(form_fields, site)
+        print(f"[FORM-RULES] {site}: {len(mapped_fields)} fields mapped by rules, {len(leftover_fields)} left for the LLM")
+        if not leftover_fields:
+            return FormAnalysisResponse(
+                fields=[public_field(f) for f in mapped_fields],
+                steps=None,
+                site_type=site,
+                file_uploads=file_upload_entries(mapped_fields)
+            )
+        llm_html = render_fields_html(leftover_fields)
     
-    prompt = FORM_ANALYSIS_PROMPT.format(form_html=form_html, url=url)
+    prompt = FORM_ANALYSIS_PROMPT.format(
+        form_html=budget_prompt_input(llm_html, "form_html", OPENAI_MODEL),
+        url=url or ""
+    )
     system_prompt = FORM_ANALYSIS_SYSTEM_PROMPT
     
     try:
-        response_text = call_llm(prompt, system_prompt, temperature=0.0)
+        response_text = await call_llm(prompt, system_prompt, temperature=0.0, validate=extract_structured_json)
         analysis_data = extract_structured_json(response_text)
         
         # Ensure required fields exist
@@ -1308,17 +1220,102 @@ async def analyze_form(request: FormAnalysisRequest):
         if "file_uploads" not in analysis_data:
             analysis_data["file_uploads"] = []
         
+        # Merge in the fields the rules already mapped
+        if mapped_fields:
+            analysis_data["fields"] = [public_field(f) for f in mapped_fields] + analysis_data["fields"]
+            analysis_data["file_uploads"] = file_upload_entries(mapped_fields) + analysis_data["file_uploads"]
+        if site is not None:
+            analysis_data["site_type"] = site
+        
         return FormAnalysisResponse(**analysis_data)
+    except LLMRateLimited:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze form: {str(e)}")
 
 
+def reduce_form_html(form_html: str) -> Tuple[str, List[Dict]]:
+    """The page reduced to its form controls and labels, and the controls extracted from it"""
+    reduced_html = minify_form_html(form_html)
+    return reduced_html, extract_form_fields(reduced_html)
+
+
+@app.post("/analyze-form", response_model=FormAnalysisResponse)
+async def analyze_form(request: FormAnalysisRequest):
+    """
+    Analyze HTML form and detect fields, types, and structure
+    Uses LLM to intelligently map form fields to user data
+    With a session_id, later steps of the same application only analyze new or changed controls
+    """
+    set_llm_priority(PRIORITY_INTERACTIVE)
+    
+    # Reduce the page to its form controls and labels
+    # Parsing a large page is CPU-bound pure Python; keep it off the event loop
+    with span("form_minify"):
+        reduced_html, form_fields = await asyncio.to_thread(reduce_form_html, request.form_html)
+    
+    session = None
+    if request.session_id:
+        session = await asyncio.to_thread(form_sessions.get, request.session_id, application_key(request.url))
+    if session is not None and session.analyzed:
+        new_fields = session.new_controls(form_fields)
+        form_sessions.incremental += 1
+        form_sessions.controls_skipped += len(form_fields) - len(new_fields)
+        print(f"[FORM-SESSION] {request.session_id}: {len(new_fields)} new of {len(form_fields)} controls")
+        if new_fields:
+            response = await analyze_form_controls(render_fields_html(new_fields), new_fields, request.url)
+            session = await asyncio.to_thread(
+                form_sessions.record, request.session_id, session, new_fields, response.model_dump()
+            )
+        return FormAnalysisResponse(**session.response())
+    
+    # Same ATS form seen before (different job IDs only): reuse its analysis
+    cached = None
+    if form_analysis_cache is not None:
+        with span("form_cache"):
+            cached = await asyncio.to_thread(form_analysis_cache.get, reduced_html, request.url)
+    if cached is not None:
+        print(f"[FORM-CACHE] Hit for {request.url or 'unknown url'} ({len(cached.get('fields', []))} fields)")
+        response = FormAnalysisResponse(**cached)
+    else:
+        response = await analyze_form_controls(reduced_html, form_fields, request.url)
+        if form_analysis_cache is not None:
+            await asyncio.to_thread(form_analysis_cache.set, reduced_html, response.model_dump(), request.url)
+    
+    if session is not None:
+        await asyncio.to_thread(form_sessions.record, request.session_id, session, form_fields, response.model_dump())
+    return response
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "ok", "service": "SanaAI Job Assistant API"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/cache-stats")
+async def cache_stats():
+    """Hit/miss counters and sizes of the backend caches"""
+    return {
+        "llm_cache": llm_cache.stats() if llm_cache is not None else {"enabled": False},
+        "llm_coalescing": llm_single_flight.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "llm_calls": llm_call_stats,
+        "resume_artifacts": resume_artifacts.stats(),
+        "pdf_cache": latex_compiler.cache.stats() if latex_compiler.cache is not None else {"enabled": False},
+        "form_analysis_cache": form_analysis_cache.stats() if form_analysis_cache is not None else {"enabled": False},
+        "form_sessions": form_sessions.stats(),
+        "file_snapshots": file_snapshot_cache.stats(),
+        "latex_compiler": latex_compiler.stats()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
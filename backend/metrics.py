@@ -0,0 +1,135 @@
+"""
+Prometheus metrics for the SanaAI backend
+Request, LLM and pdflatex latencies, cache hit ratios, queue depths and event-loop lag; served at /metrics
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+import prompts
+
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+
+# LLM calls take seconds to minutes; HTTP requests range from milliseconds (cache hits) to minutes
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+COMPILE_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+REQUEST_LATENCY = Histogram(
+    "sanaai_http_request_duration_seconds",
+    "Time until the response starts, per endpoint",
+    ["method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+LLM_CALL_LATENCY = Histogram(
+    "sanaai_llm_call_duration_seconds",
+    "Provider call latency per attempt",
+    ["model", "prompt_type", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "sanaai_llm_tokens_total",
+    "Tokens sent to / received from the provider",
+    ["model", "prompt_type", "direction"],
+)
+
+PDFLATEX_COMPILE_SECONDS = Histogram(
+    "sanaai_pdflatex_compile_duration_seconds",
+    "Wall time of one document compile (all pdflatex passes)",
+    ["outcome"],
+    buckets=COMPILE_BUCKETS,
+)
+PDFLATEX_QUEUE_DEPTH = Gauge("sanaai_pdflatex_queue_depth", "Compiles waiting for a pdflatex worker")
+PDFLATEX_ACTIVE = Gauge("sanaai_pdflatex_active", "Compiles currently running")
+
+JD_TOKENS_REMOVED = Counter(
+    "sanaai_jd_boilerplate_tokens_removed_total",
+    "Job description tokens dropped as boilerplate before prompting",
+    ["rule"],
+)
+
+LLM_QUEUE_DEPTH = Gauge("sanaai_llm_queue_depth", "LLM calls waiting in the scheduler")
+LLM_ACTIVE = Gauge("sanaai_llm_active", "LLM calls currently admitted")
+
+EVENT_LOOP_LAG = Gauge("sanaai_event_loop_lag_seconds", "Most recent event-loop scheduling delay")
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    "sanaai_event_loop_lag_distribution_seconds",
+    "Event-loop scheduling delay",
+    buckets=LAG_BUCKETS,
+)
+
+# System prompt text -> short prompt type label, e.g. FAST_REWRITE_SYSTEM_PROMPT -> "fast_rewrite"
+PROMPT_TYPES = {
+    value: name[:-len("_SYSTEM_PROMPT")].lower()
+    for name, value in vars(prompts).items()
+    if name.endswith("_SYSTEM_PROMPT") and isinstance(value, str)
+}
+
+
+def prompt_type(system_prompt: Optional[str]) -> str:
+    """Label for an LLM call, derived from which system prompt it uses"""
+    return PROMPT_TYPES.get(system_prompt or "", "other")
+
+
+def observe_llm_call(model: str, system_prompt: Optional[str], seconds: float, outcome: str,
+                     prompt_tokens: int = 0, completion_tokens: int = 0):
+    """Record one provider attempt"""
+    kind = prompt_type(system_prompt)
+    LLM_CALL_LATENCY.labels(model, kind, outcome).observe(seconds)
+    if prompt_tokens:
+        LLM_TOKENS.labels(model, kind, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(model, kind, "completion").inc(completion_tokens)
+
+
+class _CacheCollector:
+    """Reads hit/miss counters from the caches' own stats() at scrape time"""
+
+    def __init__(self):
+        self.caches: Dict[str, Callable[[], Dict]] = {}
+
+    def collect(self):
+        hits = CounterMetricFamily("sanaai_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("sanaai_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("sanaai_cache_hit_ratio", "Hits / lookups since start", labels=["cache"])
+        entries = GaugeMetricFamily("sanaai_cache_entries", "Entries currently cached", labels=["cache"])
+        size = GaugeMetricFamily("sanaai_cache_bytes", "Bytes currently cached", labels=["cache"])
+        for name, stats_fn in self.caches.items():
+            try:
+                stats = stats_fn()
+            except Exception as e:
+                print(f"[METRICS] Could not read stats for cache '{name}': {e}")
+                continue
+            hits.add_metric([name], stats.get("hits", 0))
+            misses.add_metric([name], stats.get("misses", 0))
+            ratio.add_metric([name], stats.get("hit_ratio", 0.0))
+            if "entries" in stats:
+                entries.add_metric([name], stats["entries"])
+            if "bytes" in stats:
+                size.add_metric([name], stats["bytes"])
+        yield from (hits, misses, ratio, entries, size)
+
+
+_cache_collector = _CacheCollector()
+REGISTRY.register(_cache_collector)
+
+
+def register_cache(name: str, stats_fn: Callable[[], Dict]):
+    """Expose a cache's stats() (hits, misses, hit_ratio, entries, bytes) under the given label"""
+    _cache_collector.caches[name] = stats_fn
+
+
+async def monitor_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL):
+    """Measure how late the loop wakes up from a fixed sleep; runs for the app lifetime"""
+    while True:
+        started = time.monotonic()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.monotonic() - started - interval)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
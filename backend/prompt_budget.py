@@ -0,0 +1,243 @@
+"""
+Token-aware prompt budgeting
+Counts tokens locally with tiktoken (a close regex approximation, with a startup warning, if it is missing) and fits
+prompt inputs into per-model token budgets. Job descriptions keep their highest-value paragraphs
+(requirements, skills, responsibilities) and drop boilerplate first, instead of a blind head/tail cut.
+
+tiktoken downloads its BPE files on first use; they are kept in TIKTOKEN_CACHE_DIR (default .cache/tiktoken
+beside this file) and loaded at startup by preload_encoding(), so no request ever waits on the download.
+Pre-populate that directory (e.g. `python -c "import prompt_budget; prompt_budget.preload_encoding()"`
+at build time) on hosts without network access.
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Tuple
+
+from skill_matcher import get_skill_matcher
+
+os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(Path(__file__).resolve().parent / ".cache" / "tiktoken"))
+
+try:
+    import tiktoken
+except ImportError:  # listed in requirements.txt; without it budgets are enforced on approximate counts
+    tiktoken = None
+    print("[PROMPT-BUDGET] WARNING: tiktoken is not installed, token budgets use an approximate count")
+
+# Token budgets per prompt input; models with larger context windows get more room
+PROMPT_TOKEN_BUDGETS = {
+    "default": {"job_description": 2000, "resume": 2500, "form_html": 4000},
+    "gpt-5-mini": {"job_description": 3000, "resume": 4000, "form_html": 6000},
+    "gpt-4o": {"job_description": 3000, "resume": 4000, "form_html": 6000},
+    "gpt-4o-mini": {"job_description": 3000, "resume": 4000, "form_html": 6000},
+    "gpt-3.5-turbo": {"job_description": 1200, "resume": 1800, "form_html": 2500},
+}
+PROMPT_BUDGET_SCALE = float(os.getenv("PROMPT_BUDGET_SCALE", "1.0"))
+
+OMISSION_MARKER = "[...]"
+
+# BPE splits English into ~4-character pieces; this approximates it when tiktoken is missing
+_APPROX_TOKEN_RE = re.compile(r"[A-Za-z]{1,4}|\d{1,3}|[^\sA-Za-z\d]")
+
+# Headings that start high- or low-value stretches of a job description
+HIGH_VALUE_HEADING_RE = re.compile(
+    r"requirement|qualification|skill|responsibilit|what you.?ll (do|bring|need)|you (will|have|bring)|"
+    r"must.have|nice.to.have|preferred|experience|the role|about the (role|job|position)|tech stack|duties",
+    re.IGNORECASE
+)
+LOW_VALUE_HEADING_RE = re.compile(
+    r"benefit|perk|about (us|the company)|who we are|our (culture|values|mission)|equal (employment|opportunity)|"
+    r"eeo|diversity|privacy|compensation|salary|how to apply|accommodation",
+    re.IGNORECASE
+)
+BOILERPLATE_RE = re.compile(
+    r"equal opportunity|without regard to|race, color|veteran status|reasonable accommodation|"
+    r"cookie|privacy (policy|notice)|e-verify|background check|apply now|click here|all rights reserved",
+    re.IGNORECASE
+)
+REQUIREMENT_CUE_RE = re.compile(
+    r"\b(\d+\+? years?|experience (with|in)|proficien|knowledge of|familiar|degree|must|required|ability to)\b",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """tiktoken encoding for model; None when tiktoken or its encoding files are unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        pass  # model unknown to this tiktoken version
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"[PROMPT-BUDGET] WARNING: could not load a tiktoken encoding ({e}), using an approximate count")
+        return None
+
+
+def preload_encoding(model: str = "gpt-5-mini") -> bool:
+    """
+    Load (downloading if needed) the encoding for model; blocking, so call it at startup off the event loop
+    Returns whether exact token counts are available
+    """
+    return _encoding(model) is not None
+
+
+def count_tokens(text: str, model: str = "gpt-5-mini") -> int:
+    """Number of tokens text costs for model"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_APPROX_TOKEN_RE.findall(text))
+
+
+def _head(text: str, tokens: int, model: str) -> str:
+    """Longest prefix of text within `tokens` tokens"""
+    if tokens <= 0:
+        return ""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:tokens])
+    matches = _APPROX_TOKEN_RE.finditer(text)
+    end = 0
+    for i, match in enumerate(matches):
+        if i >= tokens:
+            break
+        end = match.end()
+    return text[:end]
+
+
+def _tail(text: str, tokens: int, model: str) -> str:
+    """Longest suffix of text within `tokens` tokens"""
+    if tokens <= 0:
+        return ""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[-tokens:])
+    starts = [match.start() for match in _APPROX_TOKEN_RE.finditer(text)]
+    return text[starts[-tokens]:] if len(starts) > tokens else text
+
+
+def token_budget(kind: str, model: str) -> int:
+    """Token budget for one prompt input ("job_description", "resume" or "form_html") under model"""
+    budgets = PROMPT_TOKEN_BUDGETS.get(model, PROMPT_TOKEN_BUDGETS["default"])
+    return int(budgets[kind] * PROMPT_BUDGET_SCALE)
+
+
+def fit_to_budget(text: str, budget: int, model: str = "gpt-5-mini") -> str:
+    """
+    Fit text that must stay in document order (resume, HTML) into budget tokens
+    Keeps the first 60% and last 40% of the budget left after the [...] marker, as whole tokens
+    """
+    if count_tokens(text, model) <= budget:
+        return text
+    budget = max(budget - count_tokens(f"\n\n{OMISSION_MARKER}\n\n", model), 0)
+    head = _head(text, int(budget * 0.6), model)
+    tail = _tail(text, budget - int(budget * 0.6), model)
+    return f"{head}\n\n{OMISSION_MARKER}\n\n{tail}"
+
+
+def _split_units(text: str) -> Tuple[List[str], str]:
+    """
+    Paragraphs of a job description and the separator that joins them back
+    Single-newline text (scraped pages) falls back to lines
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(paragraphs) >= 4:
+        return paragraphs, "\n\n"
+    return [line.strip() for line in text.splitlines() if line.strip()], "\n"
+
+
+def _is_heading(unit: str) -> bool:
+    words = unit.split()
+    return len(words) <= 8 and (unit.endswith(":") or not re.search(r"[.!?]$", unit)) and len(unit) < 80
+
+
+def score_paragraphs(text: str) -> List[Tuple[str, float]]:
+    """
+    (paragraph, value) for each paragraph of a job description
+    Value grows with known skills and requirement phrasing, is boosted under requirement-type
+    headings and damped under benefits / about-us / EEO headings and for legal boilerplate
+    """
+    matcher = get_skill_matcher()
+    scored = []
+    section_weight = 1.0
+    for index, unit in enumerate(_split_units(text)[0]):
+        heading = _is_heading(unit)
+        lead = unit.split("\n", 1)[0].strip()
+        if heading or _is_heading(lead):  # a heading alone or on the first line of its paragraph
+            if HIGH_VALUE_HEADING_RE.search(lead):
+                section_weight = 2.0
+            elif LOW_VALUE_HEADING_RE.search(lead):
+                section_weight = 0.2
+        skills = len(matcher.find_spans(unit))
+        cues = len(REQUIREMENT_CUE_RE.findall(unit))
+        value = (1.0 + 2.0 * skills + cues) * section_weight
+        if heading:
+            value += 2.0  # headings are cheap and keep the kept content readable
+        if BOILERPLATE_RE.search(unit):
+            value *= 0.1
+        if index == 0:
+            value += 3.0  # job title / company line
+        scored.append((unit, value))
+    return scored
+
+
+def fit_job_description(job_description: str, budget: int, model: str = "gpt-5-mini") -> str:
+    """
+    Fit a job description into budget tokens, most valuable paragraphs first
+    Paragraphs are chosen by value per token and emitted in their original order;
+    dropped stretches are marked with [...]
+    """
+    if count_tokens(job_description, model) <= budget:
+        return job_description
+
+    scored = score_paragraphs(job_description)
+    separator = _split_units(job_description)[1]
+    costs = [count_tokens(unit, model) + 1 for unit, _ in scored]
+    ranked = sorted(range(len(scored)), key=lambda i: scored[i][1] / costs[i], reverse=True)
+
+    kept = set()
+    used = 0
+    for i in ranked:
+        if used + costs[i] <= budget:
+            kept.add(i)
+            used += costs[i]
+
+    # [...] markers are not in the per-paragraph costs: drop the least valuable paragraphs until it all fits
+    fitted = _join_kept(scored, kept, separator)
+    while kept and count_tokens(fitted, model) > budget:
+        kept.discard(min(kept, key=lambda i: scored[i][1] / costs[i]))
+        fitted = _join_kept(scored, kept, separator)
+    if not kept:
+        return fit_to_budget(job_description, budget, model)
+    return fitted
+
+
+def _join_kept(scored: List[Tuple[str, float]], kept: set, separator: str) -> str:
+    """Kept paragraphs in document order joined by separator, each dropped stretch replaced by one [...]"""
+    output: List[str] = []
+    for i, (unit, _) in enumerate(scored):
+        if i in kept:
+            output.append(unit)
+        elif not output or output[-1] != OMISSION_MARKER:
+            output.append(OMISSION_MARKER)
+    return separator.join(output)
+
+
+def budget_prompt_input(text: str, kind: str, model: str) -> str:
+    """Fit one prompt input ("job_description", "resume" or "form_html") into its budget for model"""
+    budget = token_budget(kind, model)
+    if kind == "job_description":
+        fitted = fit_job_description(text, budget, model)
+    else:
+        fitted = fit_to_budget(text, budget, model)
+    if fitted is not text:
+        print(f"[PROMPT-BUDGET] {kind}: {count_tokens(text, model)} -> {count_tokens(fitted, model)} tokens (budget {budget})")
+    return fitted
@@ -5,6 +5,9 @@ These prompts are designed to be deterministic and structured,
 treating the LLM like a compiler rather than a chatbot.
 """
 
+# Bump whenever a template below changes so cached LLM responses for the old wording are not reused
+PROMPT_VERSION = "1"
+
 JD_PARSE_PROMPT = """Parse the following job description into structured JSON format.
 
 Job Description:
@@ -412,107 +415,67 @@ OUTPUT REQUIREMENTS:
 
 FAST_REWRITE_SYSTEM_PROMPT = """You are an expert LaTeX resume optimization tool specializing in ATS (Applicant Tracking System) compatibility. Your goal is to achieve 95-100% ATS similarity by enforcing keyword frequency requirements, section-aware placement, and job title alignment. You must ensure core keywords appear ≥5 times in Experience + Projects, tool keywords ≥3 times, and prioritize Experience section (60% of keyword usage). While strictly preserving critical facts (companies, dates, no new experiences), be aggressive in embedding keywords naturally in context, not dumping them in lists. Always return valid, compilable LaTeX code. Return ONLY the LaTeX code (no fences, no explanations)."""
 
-# ATS Score Calculation Prompt
-ATS_SCORE_PROMPT = """Calculate the ATS (Applicant Tracking System) compatibility score for this resume against the job description.
+ATS_FEEDBACK_PROMPT = """The resume below has already been scored against the job description by a deterministic ATS scorer. Do NOT re-score it. Write short prose feedback only.
 
 Job Description:
 {job_description}
 
-Resume (LaTeX format):
+Resume:
 {resume}
 
-CRITICAL: IGNORE these irrelevant keywords that may appear in the job description but are NOT actual job requirements:
-- Cookie/privacy-related: "cookies", "cookie", "consent", "privacy policy", "personal data", "data protection", "GDPR", "tracking", "analytics cookies", "performance cookies", "targeting cookies"
-- Form/UI-related: "apply now", "submit", "upload", "browse", "choose file", "required field", "first name", "last name", "email", "phone", "address"
-- Navigation/UI: "click here", "learn more", "read more", "view job", "share job", "save job"
-- Footer/legal: "follow us", "connect with us", "social media", "copyright", "all rights reserved"
-
-ONLY consider actual job requirements, technical skills, qualifications, responsibilities, and experience requirements.
-
-Calculate the ATS score based on these factors:
-
-1. KEYWORD MATCHING (40% weight):
-   - Core keywords from JD appearing in resume (ONLY job-relevant keywords)
-   - Tool/platform keywords from JD appearing in resume
-   - Technical terminology matching
-   - Exact phrase matching (multi-word terms from JD)
-   - IGNORE cookie/privacy/form keywords
-
-2. KEYWORD PLACEMENT (25% weight):
-   - Keywords in Experience section (highest weight)
-   - Keywords in Projects section (medium weight)
-   - Keywords in Skills section (lowest weight)
-   - Keywords in job titles (bonus)
-
-3. KEYWORD DENSITY (15% weight):
-   - Frequency of important keywords (core keywords should appear 3-5+ times)
-   - Natural keyword distribution (not keyword stuffing)
-   - Contextual usage (keywords in meaningful sentences)
+Computed scores (0-100):
+- Overall ATS score: {ats_score}
+- Keyword matching: {keyword_matching}
+- Keyword placement: {keyword_placement}
+- Keyword density: {keyword_density}
+- Relevance & alignment: {relevance_alignment}
 
-4. RELEVANCE & ALIGNMENT (20% weight):
-   - How well experience descriptions match JD requirements
-   - How well projects align with JD needs
-   - Overall thematic alignment with job description
+JD keywords found in the resume: {found_keywords}
+JD keywords missing from the resume: {missing_keywords}
 
 Return ONLY a JSON object with this exact structure:
 {{
-  "ats_score": <number between 0-100>,
-  "breakdown": {{
-    "keyword_matching": <number 0-100>,
-    "keyword_placement": <number 0-100>,
-    "keyword_density": <number 0-100>,
-    "relevance_alignment": <number 0-100>
-  }},
-  "missing_keywords": ["keyword1", "keyword2", ...],
   "strengths": ["strength1", "strength2", ...],
   "recommendations": ["recommendation1", "recommendation2", ...]
 }}
 
-CRITICAL RULES FOR "missing_keywords":
-- "missing_keywords" MUST ONLY contain keywords/phrases that appear in the JOB DESCRIPTION but are NOT found in the RESUME
-- DO NOT list keywords that are in the resume but not in the JD - those are NOT missing
-- DO NOT list keywords from the resume - only list keywords from the JD that are missing
-- Focus EXCLUSIVELY on TECHNICAL skills, tools, platforms, frameworks, methodologies that can be added to a resume
-- DO NOT include non-actionable requirements such as:
-  * Experience duration requirements (e.g., "6 months experience", "5 years", "less than X months")
-  * Eligibility requirements (e.g., "security clearance", "ability to obtain clearance", "must be eligible")
-  * Degree requirements (e.g., "Bachelor's degree", "Master's degree") - these are qualifications, not skills
-  * Location requirements (e.g., "must be located in", "willing to relocate")
-  * Work authorization requirements
-  * Soft skills that are too generic (e.g., "team player", "good communication")
-- ONLY include actionable technical keywords like:
-  * Programming languages (Java, Python, JavaScript, etc.)
-  * Tools/Platforms (Docker, Kubernetes, AWS, etc.)
-  * Frameworks (Spring, React, Django, etc.)
-  * Methodologies (Agile, CI/CD, DevOps, etc.)
-  * Technical concepts (Object-Oriented Design, REST APIs, Microservices, etc.)
-  * Specific technologies or libraries
-- If a keyword appears in both JD and resume, it should NOT be in missing_keywords
-- DO NOT include cookie/privacy/form/UI keywords
-- If the JD doesn't mention a keyword, it should NOT be in missing_keywords (even if it's in the resume)
-
-IMPORTANT RULES:
-- "strengths" should highlight what the resume does well in matching the JD
-- "recommendations" should suggest how to incorporate missing JD keywords into the resume
+RULES:
+- "strengths" should highlight what the resume does well in matching the JD (3-5 items)
+- "recommendations" should suggest how to incorporate the missing JD keywords into Experience and Projects bullet points (3-5 items)
+- Only recommend actionable technical skills, tools, frameworks and methodologies - never experience duration, degrees, clearance, location or work authorization
 - DO NOT include cookie/privacy/form/UI keywords in any field
-- If the JD mentions cookies/privacy in the context of actual job requirements (e.g., "implement cookie-based authentication"), that's valid - but generic cookie consent/privacy policy text is NOT
-
-Be precise and realistic. A score of 95-100% means the resume is nearly perfect for the JD. A score of 80-94% is good but could be improved. Below 80% needs significant optimization.
 
 Return ONLY the JSON object, no additional text."""
 
-ATS_SCORE_SYSTEM_PROMPT = """You are an ATS (Applicant Tracking System) scoring expert. You analyze resumes against job descriptions and calculate precise compatibility scores. You understand how real ATS systems work - they scan for keywords, check placement, measure density, and assess relevance. 
-
-CRITICAL: When identifying "missing_keywords", you MUST:
-1. Extract important TECHNICAL keywords/phrases FROM THE JOB DESCRIPTION
-2. Check if each keyword appears IN THE RESUME
-3. Only list TECHNICAL keywords that are IN THE JD but NOT IN THE RESUME
-4. NEVER list keywords that are only in the resume - those are NOT missing from the JD's perspective
-5. EXCLUDE non-actionable requirements like:
-   - Experience duration (e.g., "6 months", "5 years", "less than X")
-   - Eligibility requirements (e.g., "security clearance", "ability to obtain")
-   - Degree requirements (e.g., "Bachelor's degree")
-   - Location/authorization requirements
-6. ONLY include actionable technical skills: programming languages, tools, frameworks, technologies, methodologies
-
-Be accurate, realistic, and provide actionable feedback. Return ONLY valid JSON, no markdown, no code fences."""
+ATS_FEEDBACK_SYSTEM_PROMPT = """You are an ATS (Applicant Tracking System) resume coach. Scores are computed for you; you only explain strengths and give concrete recommendations. Return only valid JSON."""
+
+SECTION_REWRITE_PROMPT = """Rewrite ONE section of a LaTeX resume to maximize ATS (Applicant Tracking System) similarity for this specific job. The other sections are being rewritten separately and will be spliced back around your output.
+
+CRITICAL CONSTRAINTS (ABSOLUTE — DO NOT VIOLATE):
+1. DO NOT add new companies, roles, projects, or experiences
+2. DO NOT change any dates
+3. DO NOT invent tools, platforms, or achievements
+4. Preserve all company names exactly
+5. Preserve valid LaTeX: every environment opened in this section must be closed in it
+6. Keep the \\section{{...}} heading line exactly as given
+7. DO NOT add a preamble, \\begin{{document}} or \\end{{document}}
+
+KEYWORD STRATEGY:
+- Use EXACT terminology from the JD and embed keywords in context, not in lists
+- Experience and Projects carry most of the keyword weight; Skills is low priority
+- DO NOT fabricate numbers
+
+Job Requirements:
+{keywords}
+
+Section: {section_title}
+
+Original LaTeX for this section:
+{section}
+
+OUTPUT REQUIREMENTS:
+- Return ONLY the rewritten LaTeX for this section, starting with its \\section line
+- No explanations
+- No markdown fences"""
+
+SECTION_REWRITE_SYSTEM_PROMPT = """You are an expert LaTeX resume optimization tool. You rewrite a single resume section for ATS compatibility while strictly preserving facts (companies, dates, no new experiences) and keeping the LaTeX of the section self-contained and compilable. Return ONLY the LaTeX code for the section (no fences, no explanations)."""
@@ -0,0 +1,108 @@
+"""
+Persistent store of derived resume artifacts, keyed by content digest
+For each resume version it holds the extracted text, the validation metadata (skills, companies, dates),
+the section index and, once parsed, the ResumeParseResponse. The base resume almost never changes, so
+requests look these up instead of recomputing them; entries survive restarts in a SQLite file.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from disk_cache import DiskCache
+from latex_utils import extract_text_from_latex, split_resume_sections
+from memory_cache import LRUCache, content_digest
+from skill_matcher import SKILLS_FILE
+from tracing import span
+from validation import extract_companies_from_resume, extract_dates_from_resume, extract_skills_from_resume
+
+RESUME_ARTIFACT_PATH = Path(os.getenv(
+    "RESUME_ARTIFACT_PATH",
+    os.getenv("RESUME_CACHE_SHARED_PATH") or str(Path(__file__).resolve().parent / ".cache" / "resume_artifacts.sqlite3")
+))
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256"))
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESUME_ARTIFACT_MAX_ENTRIES = int(os.getenv("RESUME_ARTIFACT_MAX_ENTRIES", "2000"))
+RESUME_ARTIFACT_TTL_SECONDS = float(os.getenv("RESUME_ARTIFACT_TTL_SECONDS", str(90 * 24 * 3600)))
+# How long one worker's claim on a startup pre-parse keeps the other workers from repeating it
+RESUME_ARTIFACT_PREPARSE_LEASE_SECONDS = float(os.getenv("RESUME_ARTIFACT_PREPARSE_LEASE_SECONDS", "600"))
+
+# Bump when text extraction, section splitting or skill matching changes what is derived from a resume;
+# the skills taxonomy is versioned by its digest, so editing data/skills.txt needs no bump
+RESUME_ARTIFACT_VERSION = "2"
+ARTIFACT_KEY_VERSION = f"{RESUME_ARTIFACT_VERSION}.{content_digest(SKILLS_FILE.read_text(encoding='utf-8'))[:12]}"
+
+
+def compute_artifacts(resume: str, is_latex_format: bool) -> Dict:
+    """Extracted text, validation metadata and section index of a resume"""
+    resume_text = extract_text_from_latex(resume) if is_latex_format else resume
+    with span("resume_metadata"):
+        return {
+            "resume_text": resume_text,
+            "skills": extract_skills_from_resume(resume_text),
+            "companies": extract_companies_from_resume(resume_text),
+            "dates": extract_dates_from_resume(resume_text),
+            "sections": split_resume_sections(resume, is_latex_format),
+        }
+
+
+class ResumeArtifactStore:
+    """Bounded in-memory LRU in front of a persistent SQLite store shared by all workers"""
+
+    def __init__(self, cache: LRUCache):
+        self.cache = cache
+        self.computed = 0
+
+    @staticmethod
+    def key(resume: str, is_latex_format: bool) -> str:
+        return f"resume:{ARTIFACT_KEY_VERSION}:{'latex' if is_latex_format else 'text'}:{content_digest(resume)}"
+
+    @staticmethod
+    def parsed_key(resume: str, is_latex_format: bool, parser_key: str) -> str:
+        """Each parse has its own entry, so workers storing different parsers never overwrite each other"""
+        kind = 'latex' if is_latex_format else 'text'
+        return f"resume-parse:{RESUME_ARTIFACT_VERSION}:{kind}:{content_digest(resume)}:{parser_key}"
+
+    def get(self, resume: str, is_latex_format: bool) -> Dict:
+        """Artifacts for a resume, computed and stored on first sight"""
+        key = self.key(resume, is_latex_format)
+        artifacts = self.cache.get(key)
+        if artifacts is None:
+            artifacts = compute_artifacts(resume, is_latex_format)
+            self.cache.set(key, artifacts)
+            self.computed += 1
+        return artifacts
+
+    def sections(self, resume: str, is_latex_format: bool) -> List[Tuple[str, str]]:
+        """Section index as (title, text) pairs"""
+        return [tuple(section) for section in self.get(resume, is_latex_format)["sections"]]
+
+    def get_parsed(self, resume: str, is_latex_format: bool, parser_key: str) -> Optional[Dict]:
+        """Stored ResumeParseResponse for this resume from the given parser (model + prompt), if any"""
+        return self.cache.get(self.parsed_key(resume, is_latex_format, parser_key))
+
+    def set_parsed(self, resume: str, is_latex_format: bool, parser_key: str, parsed: Dict):
+        self.cache.set(self.parsed_key(resume, is_latex_format, parser_key), parsed)
+
+    def claim_preparse(self, resume: str, is_latex_format: bool, parser_key: str) -> bool:
+        """
+        Whether this worker should run the startup pre-parse of a resume: the first worker to ask takes
+        a lease marker in the shared store, and the others skip until it expires
+        """
+        if self.cache.backend is None:
+            return True
+        marker = f"preparse:{self.parsed_key(resume, is_latex_format, parser_key)}"
+        return self.cache.backend.add(marker, str(time.time()), max_age=RESUME_ARTIFACT_PREPARSE_LEASE_SECONDS)
+
+    def stats(self) -> Dict:
+        stats = self.cache.stats()
+        stats["computed"] = self.computed
+        return stats
+
+
+resume_artifacts = ResumeArtifactStore(LRUCache(
+    max_entries=RESUME_CACHE_MAX_ENTRIES,
+    max_bytes=RESUME_CACHE_MAX_BYTES,
+    backend=DiskCache(RESUME_ARTIFACT_PATH, max_entries=RESUME_ARTIFACT_MAX_ENTRIES, ttl_seconds=RESUME_ARTIFACT_TTL_SECONDS)
+))
@@ -0,0 +1,86 @@
+"""
+Section-parallel resume rewriting
+Splits a LaTeX resume on \\section{...}, rewrites the sections concurrently and splices the results
+back into the untouched preamble, so wall-clock time tracks the longest section instead of the document
+"""
+
+import asyncio
+import os
+import re
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+from latex_utils import split_latex_sections
+from llm_client import call_llm, strip_code_fences
+from prompts import SECTION_REWRITE_PROMPT, SECTION_REWRITE_SYSTEM_PROMPT
+
+SECTION_REWRITE_CONCURRENCY = int(os.getenv("SECTION_REWRITE_CONCURRENCY", "4"))
+
+# Only sections where keywords matter are sent to the LLM; Education, Awards, etc. are kept verbatim
+REWRITABLE_SECTION_RE = re.compile(
+    r'experience|employment|work|project|skill|technolog|summary|profile|objective|leadership',
+    re.IGNORECASE
+)
+
+
+def _clean_section_output(rewritten: str, original: str) -> str:
+    """Strip fences and make sure the section keeps its heading and trailing whitespace"""
+    rewritten = strip_code_fences(rewritten or "")
+    if not rewritten:
+        return original
+    if "\\section" not in rewritten:
+        heading = original.split("\n", 1)[0]
+        rewritten = f"{heading}\n{rewritten}"
+    trailing = original[len(original.rstrip()):]
+    return rewritten + (trailing or "\n")
+
+
+async def rewrite_sections_parallel(
+    latex_code: str,
+    keywords: str,
+    system_prompt: str = SECTION_REWRITE_SYSTEM_PROMPT,
+    concurrency: int = SECTION_REWRITE_CONCURRENCY
+) -> Optional[str]:
+    """
+    Rewrite each keyword-relevant section concurrently (at most `concurrency` LLM calls at once)
+    `keywords` is the job-requirements block inserted into every section prompt
+    Returns None when the resume has no \\section commands or no rewritable section could be rewritten
+    (caller should rewrite it whole); if those rewrites failed with an HTTPException (429, 504, ...) it is re-raised
+    A section whose rewrite fails while others succeed is kept as in the original
+    """
+    split = split_latex_sections(latex_code)
+    if split is None:
+        return None
+    prefix, sections, suffix = split
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    errors: List[Exception] = []
+    rewritten_count = 0
+
+    async def rewrite_one(title: str, source: str) -> str:
+        nonlocal rewritten_count
+        if not REWRITABLE_SECTION_RE.search(title):
+            return source
+        prompt = SECTION_REWRITE_PROMPT.format(keywords=keywords, section_title=title, section=source)
+        async with semaphore:
+            try:
+                rewritten = await call_llm(prompt, system_prompt, temperature=0.0)
+            except Exception as e:
+                errors.append(e)
+                error_msg = getattr(e, "detail", None) or str(e)
+                print(f"[SECTION-REWRITE] Section '{title}' failed, keeping original: {error_msg}")
+                return source
+        rewritten_count += 1
+        return _clean_section_output(rewritten, source)
+
+    print(f"[SECTION-REWRITE] Rewriting {len(sections)} sections with concurrency {concurrency}")
+    rewritten_sections = await asyncio.gather(*(rewrite_one(title, source) for title, source in sections))
+    if rewritten_count == 0:
+        print(f"[SECTION-REWRITE] No section was rewritten ({len(errors)} failed)")
+        if errors and isinstance(errors[0], HTTPException):
+            raise errors[0]
+        return None
+    if errors:
+        print(f"[SECTION-REWRITE] {len(errors)} section(s) failed and were kept as in the original")
+    return prefix + "".join(rewritten_sections) + suffix
@@ -0,0 +1,44 @@
+"""
+Request coalescing ("single flight")
+Concurrent calls with the same key share one in-flight task instead of each starting duplicate work
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent async work by key
+    The first caller for a key starts the work; callers arriving while it runs await the same task
+    and receive its result (or its exception). The key is forgotten as soon as the task finishes.
+    """
+
+    def __init__(self, name: str = "single-flight"):
+        self.name = name
+        self.started = 0
+        self.coalesced = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        """Run work() for key, or join the run already in flight for it"""
+        pending = self._in_flight.get(key)
+        if pending is None:
+            self.started += 1
+            pending = asyncio.ensure_future(work())
+            self._in_flight[key] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Retrieve the exception even when every caller has gone away, so it is not logged as unhandled
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+        else:
+            self.coalesced += 1
+            print(f"[{self.name.upper()}] Joined in-flight request {key[:12]}")
+        # One caller being cancelled (client disconnect) must not cancel the others' shared task
+        return await asyncio.shield(pending)
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
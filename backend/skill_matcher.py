@@ -0,0 +1,121 @@
+"""
+Aho-Corasick multi-pattern matcher for the skills taxonomy
+Finds every known skill in a single linear pass over the text
+"""
+
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+SKILLS_FILE = Path(__file__).resolve().parent / "data" / "skills.txt"
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as regex \\w"""
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """
+    Case-insensitive Aho-Corasick automaton over a fixed list of terms
+    Matches must start and end on word boundaries; overlapping matches resolve leftmost-longest
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = []
+        # Trie as parallel arrays: goto transitions, failure links, and (term index, length) outputs
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]
+
+        seen = set()
+        for term in terms:
+            key = term.strip().lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._add(key, len(self.terms))
+            self.terms.append(key)
+
+        self._build_failure_links()
+
+    def _add(self, key: str, index: int):
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((index, len(key)))
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links; outputs are merged along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return non-overlapping (start, end, term) matches in the lowercased text"""
+        lowered = text.lower()
+        n = len(lowered)
+        goto, fail, out = self._goto, self._fail, self._out
+        candidates = []
+        node = 0
+
+        for i, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+
+            end = i + 1
+            if end < n and _is_word_char(lowered[end]):
+                continue
+            for index, length in out[node]:
+                start = end - length
+                if start == 0 or not _is_word_char(lowered[start - 1]):
+                    candidates.append((start, -length, index))
+
+        # Leftmost-longest, non-overlapping selection (like a single regex scan)
+        candidates.sort()
+        spans = []
+        last_end = 0
+        for start, neg_length, index in candidates:
+            if start >= last_end:
+                last_end = start - neg_length
+                spans.append((start, last_end, self.terms[index]))
+        return spans
+
+    def find_all(self, text: str) -> List[str]:
+        """Return the distinct (lowercased) terms present in text"""
+        return list({term for _, _, term in self.find_spans(text)})
+
+
+def load_skill_terms(path: Path = SKILLS_FILE) -> List[str]:
+    """Read the skills taxonomy (one skill per line, # comments allowed)"""
+    terms = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            terms.append(line)
+    return terms
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Compile the skills taxonomy once per process"""
+    return SkillMatcher(load_skill_terms())
@@ -17,6 +17,9 @@ if ! python -c "import fastapi" 2>/dev/null; then
     pip install -r requirements.txt
 fi
 
+# Fetch the tokenizer encoding into TIKTOKEN_CACHE_DIR now rather than at server startup
+python -c "import prompt_budget; prompt_budget.preload_encoding()"
+
 # Start the server
 echo "Starting server on http://localhost:8000"
 python main.py
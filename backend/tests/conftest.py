@@ -0,0 +1,19 @@
+"""
+Backend modules are imported flat (`from jd_cleaner import ...`), as uvicorn runs them from backend/
+Caches that main.py opens at import time go to a temporary directory, and nothing calls the provider.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_cache_dir = Path(tempfile.mkdtemp(prefix="sanaai-tests-"))
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("RESUME_ARTIFACT_PATH", str(_cache_dir / "resume_artifacts.sqlite3"))
+os.environ.setdefault("RESUME_ARTIFACT_PREPARSE", "false")
+os.environ.setdefault("FORM_SESSION_PATH", str(_cache_dir / "form_sessions.sqlite3"))
+os.environ.setdefault("PDF_CACHE_DIR", str(_cache_dir / "pdf"))
+os.environ.setdefault("LATEX_FORMAT_DIR", str(_cache_dir / "fmt"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,72 @@
+import pytest
+
+from ats_scorer import SCORE_WEIGHTS, STUFFING_THRESHOLD, collect_jd_keywords, score_resume
+
+JOB_DESCRIPTION = "We need a backend engineer with Python, Kubernetes and PostgreSQL. Experience with Docker is required."
+FILLER = " ".join(["Led the design and delivery of billing services for merchants"] * 3)
+
+
+def resume(experience, skills):
+    sections = [("header", "Jane Doe"), ("Experience", experience), ("Skills", skills)]
+    return "\n".join(text for _, text in sections), sections
+
+
+def test_jd_keywords_are_weighted_and_deduplicated():
+    keywords = collect_jd_keywords(JOB_DESCRIPTION + " Python again.")
+    assert [keyword.lower() for keyword, _, _ in keywords] == ["python", "kubernetes", "postgresql", "docker"]
+    assert all((weight, target) == (3.0, 3) for _, weight, target in keywords)
+    assert collect_jd_keywords(JOB_DESCRIPTION, lambda keyword: keyword == "Docker")[-1][0] == "Postgresql"
+
+
+def test_score_is_the_40_25_15_20_weighted_breakdown():
+    assert SCORE_WEIGHTS == {
+        "keyword_matching": 0.40, "keyword_placement": 0.25, "keyword_density": 0.15, "relevance_alignment": 0.20,
+    }
+    text, sections = resume(f"{FILLER}. Built services in Python on Kubernetes.", "PostgreSQL, Go")
+    result = score_resume(JOB_DESCRIPTION, text, sections)
+    breakdown = result["breakdown"]
+    expected = sum(breakdown[name] * weight for name, weight in SCORE_WEIGHTS.items())
+    assert result["ats_score"] == pytest.approx(expected, abs=0.05)
+    assert breakdown["keyword_matching"] == 75.0  # 3 of 4 equally weighted keywords
+    assert result["missing_keywords"] == ["Docker"]
+
+
+def test_experience_placement_beats_skills_placement():
+    in_experience = resume(f"{FILLER}. Python, Kubernetes, PostgreSQL and Docker in production.", "Go")
+    in_skills = resume(f"{FILLER}. Shipped payment features.", "Python, Kubernetes, PostgreSQL, Docker")
+    experience_score = score_resume(JOB_DESCRIPTION, *in_experience)["breakdown"]["keyword_placement"]
+    skills_score = score_resume(JOB_DESCRIPTION, *in_skills)["breakdown"]["keyword_placement"]
+    assert experience_score == 100.0
+    assert skills_score == 40.0
+
+
+def test_density_reaches_its_target_and_stuffing_is_penalized():
+    once = resume(f"{FILLER} {FILLER}. Python, Kubernetes, PostgreSQL and Docker.", "")
+    three_times = resume(f"{FILLER} {FILLER}. " + " ".join(["Python, Kubernetes, PostgreSQL and Docker."] * 3), "")
+    assert score_resume(JOB_DESCRIPTION, *once)["breakdown"]["keyword_density"] == pytest.approx(33.3)
+    assert score_resume(JOB_DESCRIPTION, *three_times)["breakdown"]["keyword_density"] == 100.0
+
+    stuffed_text = " ".join(["Python Kubernetes PostgreSQL Docker"] * 5) + " engineer"
+    stuffed = resume(stuffed_text, "")
+    density = score_resume(JOB_DESCRIPTION, *stuffed)["breakdown"]["keyword_density"]
+    ratio = 20 / len(" ".join(["Jane Doe", stuffed_text, ""]).split())
+    assert ratio > STUFFING_THRESHOLD
+    assert density == pytest.approx(100.0 * STUFFING_THRESHOLD / ratio, abs=0.051)
+
+
+def test_identical_inputs_give_identical_scores():
+    text, sections = resume(f"{FILLER}. Built services in Python on Kubernetes.", "PostgreSQL, Docker")
+    results = [score_resume(JOB_DESCRIPTION, text, list(sections)) for _ in range(3)]
+    assert results[0] == results[1] == results[2]
+
+
+def test_empty_resume_and_empty_job_description():
+    empty_resume = score_resume(JOB_DESCRIPTION, "", [])
+    assert empty_resume["ats_score"] == 0.0
+    assert empty_resume["found_keywords"] == []
+    assert [keyword.lower() for keyword in empty_resume["missing_keywords"]] == ["python", "kubernetes", "postgresql", "docker"]
+
+    empty_jd = score_resume("", "Python developer", [])
+    assert empty_jd["ats_score"] == 0.0
+    assert empty_jd["found_keywords"] == empty_jd["missing_keywords"] == []
+    assert set(empty_jd["breakdown"].values()) == {0.0}
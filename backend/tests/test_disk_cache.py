@@ -0,0 +1,93 @@
+import sqlite3
+
+from disk_cache import DiskCache, make_cache_key
+
+
+def accessed_at(path, key):
+    with sqlite3.connect(str(path)) as conn:
+        return conn.execute("SELECT accessed_at FROM cache WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_set_get_and_stats(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+    cache.set("a", "alpha")
+    cache.set("a", "alphabet")
+    cache.set("b", "beta")
+
+    assert cache.get("a") == "alphabet"
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == (2, len("alphabet") + len("beta"))
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    cache.delete("a")
+    assert cache.stats()["entries"] == 1
+
+
+def test_read_hits_are_not_written_until_flushed(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = DiskCache(path, access_flush_batch=100, access_flush_seconds=3600)
+    cache.set("a", "alpha")
+    written = accessed_at(path, "a")
+
+    cache.get("a")
+    assert accessed_at(path, "a") == written
+    cache.flush()
+    assert accessed_at(path, "a") > written
+
+
+def test_evicts_least_recently_used_only_when_over_capacity(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3", max_entries=3, access_flush_batch=1)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.stats()["evictions"] == 0
+
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.stats()["entries"] == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_is_enforced(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3", max_bytes=10)
+    cache.set("a", "12345")
+    cache.set("b", "67890")
+    cache.set("c", "xyz")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] <= 10
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3", ttl_seconds=-1)
+    cache.set("a", "alpha")
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] >= 1
+
+
+def test_totals_are_backfilled_for_an_existing_file(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute(
+            "CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO cache VALUES ('old', 'value', 5, strftime('%s','now'), strftime('%s','now'))")
+
+    cache = DiskCache(path)
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (1, 5)
+    assert cache.get("old") == "value"
+
+
+def test_cache_keys_are_stable():
+    assert make_cache_key(prompt="p", temperature=0.0) == make_cache_key(temperature=0.0, prompt="p")
+    assert make_cache_key(prompt="p") != make_cache_key(prompt="q")
+
+
+def test_update_reads_and_writes_in_one_transaction(tmp_path):
+    first = DiskCache(tmp_path / "cache.sqlite3")
+    second = DiskCache(tmp_path / "cache.sqlite3")
+    assert first.update("n", lambda current: str(int(current or 0) + 1)) == "1"
+    assert second.update("n", lambda current: str(int(current or 0) + 1)) == "2"
+    assert first.get("n") == "2"
@@ -0,0 +1,107 @@
+import json
+import os
+
+from starlette.requests import Request
+
+from file_snapshots import FileSnapshotCache, ResumeIndex, etag_matches, snapshot_response
+
+
+def request_with(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def bump_mtime(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_etag_matching_is_weak_and_accepts_lists_and_star():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"old", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches('W/"ab"', etag)
+    assert not etag_matches(None, etag) and not etag_matches("", etag)
+
+
+def test_matching_etag_gets_an_empty_304(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text('{"name": "Jane"}', encoding="utf-8")
+    snapshot = FileSnapshotCache().get(path, json.loads)
+
+    full = snapshot_response(request_with(), snapshot)
+    assert full.status_code == 200 and json.loads(full.body) == {"name": "Jane"}
+    assert full.headers["etag"] == snapshot.etag
+
+    for header in (snapshot.etag, "W/" + snapshot.etag, "*"):
+        revalidated = snapshot_response(request_with(header), snapshot)
+        assert revalidated.status_code == 304 and revalidated.body == b""
+        assert revalidated.headers["etag"] == snapshot.etag
+    assert snapshot_response(request_with('"stale"'), snapshot).status_code == 200
+
+
+def test_snapshot_is_rebuilt_when_mtime_or_size_changes(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text('{"name": "Jane"}', encoding="utf-8")
+    cache = FileSnapshotCache()
+    builds = []
+
+    def build(text):
+        builds.append(text)
+        return json.loads(text)
+
+    first = cache.get(path, build)
+    assert cache.get(path, build) is first and len(builds) == 1
+
+    path.write_text('{"name": "Janet"}', encoding="utf-8")  # size changes
+    resized = cache.get(path, build)
+    assert resized.value == {"name": "Janet"} and resized.etag != first.etag
+
+    path.write_text('{"name": "Jenny"}', encoding="utf-8")  # same size, only mtime moves
+    bump_mtime(path)
+    assert cache.get(path, build).value == {"name": "Jenny"}
+    assert len(builds) == 3
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+
+
+def test_variants_of_one_file_are_cached_separately(tmp_path):
+    path = tmp_path / "resume.tex"
+    path.write_text("x", encoding="utf-8")
+    cache = FileSnapshotCache()
+    assert cache.get(path, lambda text: {"a": text}).value == {"a": "x"}
+    assert cache.get(path, lambda text: {"b": text}, variant="other").value == {"b": "x"}
+
+
+def test_resume_index_rescans_only_when_a_directory_changes(tmp_path):
+    folder = tmp_path / "Preferred"
+    folder.mkdir()
+    (folder / "other.tex").write_text("x")
+    index = ResumeIndex(tmp_path, "Preferred", ["resume.tex"])
+
+    assert index.lookup() == (folder, folder / "other.tex")
+    assert index.lookup() == (folder, folder / "other.tex")
+    assert index.scans == 1
+
+    nested = folder / "v2"
+    nested.mkdir()
+    bump_mtime(folder)
+    assert index.lookup() == (folder, folder / "other.tex")
+    assert index.scans == 2
+
+    (nested / "resume.tex").write_text("x")
+    bump_mtime(nested)
+    assert index.lookup() == (folder, nested / "resume.tex")
+    assert index.scans == 3
+
+
+def test_resume_index_falls_back_to_the_root(tmp_path):
+    (tmp_path / "cv.tex").write_text("x")
+    index = ResumeIndex(tmp_path, "Missing", ["resume.tex"])
+    assert index.lookup() == (tmp_path, tmp_path / "cv.tex")
+
+    (tmp_path / "Missing").mkdir()
+    bump_mtime(tmp_path)
+    assert index.lookup() == (tmp_path / "Missing", None)
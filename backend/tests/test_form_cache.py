@@ -0,0 +1,50 @@
+from form_cache import FormAnalysisCache, form_fingerprint, form_scope
+
+FORM_JOB_1 = (
+    '<form><label for="question_1234567">LinkedIn Profile</label>'
+    '<input id="question_1234567" name="job_application[answers][1234567]" type="text">'
+    '<label for="question_1234568">Website</label>'
+    '<input id="question_1234568" name="job_application[answers][1234568]" type="text"></form>'
+)
+FORM_JOB_2 = FORM_JOB_1.replace("1234567", "7654321").replace("1234568", "7654322")
+
+ANALYSIS = {
+    "fields": [
+        {"selector": "#question_1234567", "name": "job_application[answers][1234567]", "mapping": "linkedin"},
+        {"selector": "#question_1234568", "name": "job_application[answers][1234568]", "mapping": "website"},
+    ],
+    "steps": None,
+    "site_type": "greenhouse",
+    "file_uploads": [],
+}
+
+
+def test_fingerprint_ignores_per_job_ids_but_not_structure():
+    assert form_fingerprint(FORM_JOB_1) == form_fingerprint(FORM_JOB_2)
+    assert form_fingerprint(FORM_JOB_1) != form_fingerprint(FORM_JOB_1.replace("Website", "Portfolio"))
+
+
+def test_scope_is_the_rule_pack_or_the_hostname():
+    assert form_scope("https://boards.greenhouse.io/acme/jobs/1") == "greenhouse"
+    assert form_scope("https://acme.wd5.myworkdayjobs.com/en-US/ext/job/1") == "workday"
+    assert form_scope("https://careers.example.com/jobs/1") == "careers.example.com"
+    assert form_scope(None) == ""
+    assert form_fingerprint(FORM_JOB_1, "greenhouse") != form_fingerprint(FORM_JOB_1, "careers.example.com")
+
+
+def test_hit_remaps_ids_to_the_submitted_form():
+    cache = FormAnalysisCache()
+    cache.set(FORM_JOB_1, ANALYSIS, "https://boards.greenhouse.io/acme/jobs/1")
+
+    hit = cache.get(FORM_JOB_2, "https://boards.greenhouse.io/other/jobs/2")
+    assert [field["selector"] for field in hit["fields"]] == ["#question_7654321", "#question_7654322"]
+    assert hit["fields"][0]["name"] == "job_application[answers][7654321]"
+    assert cache.stats()["remapped"] == 1
+
+
+def test_same_structure_on_another_site_is_a_miss():
+    cache = FormAnalysisCache()
+    cache.set(FORM_JOB_1, ANALYSIS, "https://boards.greenhouse.io/acme/jobs/1")
+
+    assert cache.get(FORM_JOB_1, "https://careers.example.com/apply") is None
+    assert cache.get(FORM_JOB_1, "https://boards.greenhouse.io/acme/jobs/1") == ANALYSIS
@@ -0,0 +1,52 @@
+from form_minifier import FORM_MAX_SELECT_OPTIONS, minify_form_html
+
+PAGE = """<html><head><script>window.dataLayer = [];</script><style>.field { margin: 0 }</style></head>
+<body><nav><a href="/">Home</a><a href="/jobs">All jobs</a></nav>
+<div class="wrap"><div class="row"><form id="application_form" action="/apply">
+  <input type="hidden" name="authenticity_token" value="abc123">
+  <div class="field"><label for="first_name">First Name <span class="req">*</span></label>
+    <input id="first_name" name="first_name" type="text" class="input" style="color: red" value="Jane" required></div>
+  <div class="field"><label for="resume">Resume/CV</label>
+    <input id="resume" name="resume" type="file" accept=".pdf,.docx" data-qa="resume-upload"></div>
+  <div class="field"><div class="question">Are you legally authorized to work in the US?</div>
+    <div><div><input type="radio" name="auth" value="yes"> Yes</div><div><input type="radio" name="auth" value="no"> No</div></div></div>
+  <svg viewBox="0 0 10 10"><path d="M0 0h10v10H0z"/></svg>
+  <button type="submit">Submit application</button>
+</form></div></div><footer>&copy; 2024 Acme Inc.</footer></body></html>"""
+
+
+def test_keeps_controls_labels_and_identifying_attributes():
+    reduced = minify_form_html(PAGE)
+    assert '<label for="first_name">First Name *</label>' in reduced
+    assert 'id="first_name" name="first_name" type="text"' in reduced
+    assert 'accept=".pdf,.docx"' in reduced and 'data-qa="resume-upload"' in reduced
+    assert "Are you legally authorized to work in the US?" in reduced
+    assert "Submit application" in reduced
+
+
+def test_drops_scripts_styles_layout_navigation_and_hidden_inputs():
+    reduced = minify_form_html(PAGE)
+    for dropped in ("dataLayer", "margin", "<svg", "<nav", "All jobs", "© 2024", "authenticity_token",
+                    'class="', "style=", 'value="Jane"', '<div class="wrap"'):
+        assert dropped not in reduced
+    assert len(reduced) < len(PAGE) / 2
+
+
+def test_choice_values_are_kept_but_typed_values_are_not():
+    reduced = minify_form_html(PAGE)
+    assert 'type="radio" name="auth" value="yes"' in reduced
+    assert "Jane" not in reduced
+
+
+def test_long_option_lists_are_capped():
+    html = '<form><select id="country" name="country">' + "".join(
+        f'<option value="c{i}">Country {i}</option>' for i in range(FORM_MAX_SELECT_OPTIONS + 40)
+    ) + "</select></form>"
+    reduced = minify_form_html(html)
+    assert reduced.count("<option") == FORM_MAX_SELECT_OPTIONS
+    assert "<!-- 40 more options -->" in reduced
+
+
+def test_page_without_controls_is_returned_unchanged():
+    html = "<div><p>This job is no longer accepting applications.</p></div>"
+    assert minify_form_html(html) == html
@@ -0,0 +1,92 @@
+from form_minifier import minify_form_html
+from form_rules import (
+    detect_site, extract_form_fields, file_upload_entries, map_form_fields, public_field, render_fields_html
+)
+
+GREENHOUSE_FORM = """<form id="application_form">
+  <label for="first_name">First Name *</label><input id="first_name" name="job_application[first_name]" type="text">
+  <label for="last_name">Last Name *</label><input id="last_name" name="job_application[last_name]" type="text">
+  <label for="email">Email *</label><input id="email" name="job_application[email]" type="text">
+  <label for="resume">Resume/CV</label><input id="resume" name="resume" type="file" accept=".pdf">
+  <label for="question_1">Why do you want to work at Acme?</label><textarea id="question_1" name="question_1"></textarea>
+</form>"""
+
+LEVER_FORM = """<form>
+  <div class="application-question"><div class="application-label">Full name</div><input type="text" name="name"></div>
+  <div><div class="application-label">LinkedIn URL</div><input type="text" name="urls[LinkedIn]"></div>
+  <div><div class="application-label">Resume/CV</div><input type="file" name="resume"></div>
+  <div><div class="application-label">What excites you about this role?</div><textarea name="cards[abc][field0]"></textarea></div>
+</form>"""
+
+WORKDAY_FORM = """<div data-automation-id="applyFlowPage">
+  <label for="i1">First Name</label><input id="i1" data-automation-id="legalNameSection_firstName" type="text">
+  <label for="i2">Last Name</label><input id="i2" data-automation-id="legalNameSection_lastName" type="text">
+  <label id="lbl3">Phone Device Type</label>
+  <button aria-haspopup="listbox" aria-labelledby="lbl3" data-automation-id="phone-device-type">Select One</button>
+  <input type="file" data-automation-id="file-upload-input-ref">
+</div>"""
+
+
+def fields_of(html):
+    return extract_form_fields(minify_form_html(html))
+
+
+def mapping(fields):
+    return {field["selector"]: field["mappedTo"] for field in fields}
+
+
+def test_detect_site():
+    assert detect_site("https://boards.greenhouse.io/acme/jobs/1") == "greenhouse"
+    assert detect_site("https://job-boards.greenhouse.io/acme/jobs/1") == "greenhouse"
+    assert detect_site("https://jobs.lever.co/acme/1111") == "lever"
+    assert detect_site("https://acme.wd1.myworkdayjobs.com/ext/job/1") == "workday"
+    assert detect_site("https://careers.example.com/jobs/1") is None
+    assert detect_site(None) is None
+
+
+def test_greenhouse_standard_fields_are_mapped_and_questions_left_for_the_llm():
+    mapped, leftover = map_form_fields(fields_of(GREENHOUSE_FORM), "greenhouse")
+    assert mapping(mapped) == {
+        "#first_name": "firstName", "#last_name": "lastName", "#email": "email", "#resume": "resume",
+    }
+    assert [field["label"] for field in leftover] == ["Why do you want to work at Acme?"]
+    assert file_upload_entries(mapped) == [{"selector": "#resume", "type": "resume", "accept": ".pdf"}]
+
+
+def test_lever_labels_come_from_question_text():
+    fields = fields_of(LEVER_FORM)
+    assert [field["label"] for field in fields] == [
+        "Full name", "LinkedIn URL", "Resume/CV", "What excites you about this role?",
+    ]
+    mapped, leftover = map_form_fields(fields, "lever")
+    assert mapping(mapped) == {
+        '[name="name"]': "fullName", '[name="urls[LinkedIn]"]': "linkedin", '[name="resume"]': "resume",
+    }
+    assert [field["selector"] for field in leftover] == ['[name="cards[abc][field0]"]']
+
+
+def test_workday_automation_ids_and_listbox_buttons():
+    fields = fields_of(WORKDAY_FORM)
+    phone_type = next(field for field in fields if field["selector"] == '[data-automation-id="phone-device-type"]')
+    assert phone_type["type"] == "combobox"
+    assert phone_type["label"] == "Phone Device Type"
+
+    mapped, leftover = map_form_fields(fields, "workday")
+    assert mapping(mapped) == {
+        "#i1": "firstName", "#i2": "lastName",
+        '[data-automation-id="phone-device-type"]': "phoneType",
+        '[data-automation-id="file-upload-input-ref"]': "resume",
+    }
+    assert leftover == []
+
+
+def test_public_field_and_rendering_of_leftovers():
+    mapped, leftover = map_form_fields(fields_of(GREENHOUSE_FORM), "greenhouse")
+    public = public_field(mapped[0])
+    assert public["mappedTo"] == "firstName"
+    assert not any(key.startswith("_") for key in public)
+
+    rendered = render_fields_html(leftover)
+    assert "Why do you want to work at Acme?" in rendered
+    assert 'id="question_1"' in rendered
+    assert "first_name" not in rendered
@@ -0,0 +1,131 @@
+import asyncio
+import sqlite3
+
+import main
+from disk_cache import DiskCache
+from form_sessions import FormSessionStore, application_key
+from main import FormAnalysisRequest, FormAnalysisResponse
+
+
+def control(selector, label, type_="text", **extra):
+    return {"selector": selector, "label": label, "type": type_, **extra}
+
+
+def analysis(*fields):
+    return {"fields": list(fields), "steps": None, "site_type": "greenhouse", "file_uploads": []}
+
+
+def test_application_key_ignores_apply_steps_but_not_the_job():
+    assert application_key("https://jobs.lever.co/acme/1111-aaaa") == application_key("https://jobs.lever.co/acme/1111-aaaa/apply")
+    assert application_key("https://jobs.lever.co/acme/1111-aaaa/apply") != application_key("https://jobs.lever.co/acme/2222-bbbb/apply")
+    assert application_key(
+        "https://acme.wd5.myworkdayjobs.com/en-US/ext/job/Remote/Engineer_R1/apply/applyManually"
+    ) == "acme.wd5.myworkdayjobs.com/en-US/ext/job/Remote/Engineer_R1"
+    assert application_key("https://boards.greenhouse.io/embed/job_app?for=acme&token=123") == "boards.greenhouse.io?token=123"
+    assert application_key(None) == ""
+
+
+def test_later_step_only_reports_new_controls():
+    store = FormSessionStore()
+    session = store.get("tab-1", "jobs.lever.co/acme/1")
+    step_one = [control("#name", "Full name"), control("#email", "Email", "email")]
+    session.record(step_one, analysis({"selector": "#name", "mapping": "fullName"}, {"selector": "#email", "mapping": "email"}))
+
+    step_two = step_one + [control("#why", "Why us?", "textarea")]
+    session = store.get("tab-1", "jobs.lever.co/acme/1")
+    assert session.new_controls(step_two) == [step_two[2]]
+
+    changed = [control("#email", "Work email", "email")]
+    assert session.new_controls(changed) == changed
+
+
+def test_session_reused_for_another_application_starts_over():
+    store = FormSessionStore()
+    session = store.get("tab-1", "jobs.lever.co/acme/1")
+    session.record([control("#q1", "Salary expectations")], analysis({"selector": "#q1", "mapping": "salary"}))
+
+    other = store.get("tab-1", "jobs.lever.co/acme/2")
+    assert other is not session
+    assert not other.analyzed
+    assert other.response()["fields"] == []
+    assert store.stats()["resets"] == 1
+
+
+def test_sessions_expire_after_ttl():
+    store = FormSessionStore(ttl_seconds=0)
+    session = store.get("tab-1")
+    session.record([control("#a", "A")], analysis({"selector": "#a"}))
+    session.touched -= 1
+    assert not store.get("tab-2").analyzed
+    assert not store.get("tab-1").analyzed
+    assert store.stats()["evictions"] >= 1
+
+
+def test_steps_on_different_workers_share_the_session(tmp_path):
+    first, second = (FormSessionStore(backend=DiskCache(tmp_path / "sessions.sqlite3")) for _ in range(2))
+    step_one = [control("#name", "Full name", options=["a"]), control("#email", "Email", "email")]
+
+    session = first.get("tab-1", "jobs.lever.co/acme/1")
+    first.record("tab-1", session, step_one, analysis({"selector": "#name", "mapping": "fullName"}))
+
+    step_two = step_one + [control("#why", "Why us?", "textarea")]
+    session = second.get("tab-1", "jobs.lever.co/acme/1")
+    assert session.new_controls(step_two) == [step_two[2]]
+    second.record("tab-1", session, [step_two[2]], analysis({"selector": "#why", "mapping": "coverLetter"}))
+
+    assert [field["mapping"] for field in first.get("tab-1", "jobs.lever.co/acme/1").response()["fields"]] == [
+        "fullName", "coverLetter"
+    ]
+    assert not first.get("tab-1", "jobs.lever.co/acme/2").analyzed
+    assert first.stats()["resets"] == 1
+
+
+def test_concurrent_steps_on_different_workers_keep_both_analyses(tmp_path):
+    first, second = (FormSessionStore(backend=DiskCache(tmp_path / "sessions.sqlite3")) for _ in range(2))
+    application = "jobs.lever.co/acme/1"
+    stale_first, stale_second = first.get("tab-1", application), second.get("tab-1", application)
+
+    first.record("tab-1", stale_first, [control("#name", "Full name")], analysis({"selector": "#name", "mapping": "fullName"}))
+    merged = second.record("tab-1", stale_second, [control("#why", "Why us?")], analysis({"selector": "#why", "mapping": "coverLetter"}))
+
+    assert [field["mapping"] for field in merged.response()["fields"]] == ["fullName", "coverLetter"]
+    assert first.get("tab-1", application).new_controls([control("#name", "Full name"), control("#why", "Why us?")]) == []
+
+
+def test_every_step_restarts_the_shared_session_ttl(tmp_path):
+    path = tmp_path / "sessions.sqlite3"
+    store = FormSessionStore(backend=DiskCache(path, ttl_seconds=60))
+    session = store.get("tab-1", "jobs.lever.co/acme/1")
+    store.record("tab-1", session, [control("#name", "Full name")], analysis({"selector": "#name"}))
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("UPDATE cache SET created_at = created_at - 50")
+
+    assert store.get("tab-1", "jobs.lever.co/acme/1").analyzed  # a step with no new controls
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("UPDATE cache SET created_at = created_at - 50")
+    assert store.get("tab-1", "jobs.lever.co/acme/1").analyzed
+
+
+def test_analyze_form_does_not_merge_fields_from_a_previous_application(monkeypatch):
+    calls = []
+
+    async def fake_analyze(form_html, form_fields, url):
+        calls.append(url)
+        return FormAnalysisResponse(
+            fields=[{"selector": f["selector"], "label": f["label"], "mapping": url} for f in form_fields],
+            steps=None, site_type="lever", file_uploads=[],
+        )
+
+    monkeypatch.setattr(main, "analyze_form_controls", fake_analyze)
+    monkeypatch.setattr(main, "form_analysis_cache", None)
+
+    first = '<form><label for="a">Portfolio URL</label><input id="a" name="a" type="text"></form>'
+    second = '<form><label for="b">Years of Go experience</label><input id="b" name="b" type="text"></form>'
+    asyncio.run(main.analyze_form(FormAnalysisRequest(
+        form_html=first, url="https://jobs.lever.co/acme/1111/apply", session_id="tab-42")))
+    response = asyncio.run(main.analyze_form(FormAnalysisRequest(
+        form_html=second, url="https://jobs.lever.co/acme/2222/apply", session_id="tab-42")))
+
+    assert len(calls) == 2
+    assert [field["label"] for field in response.fields] == ["Years of Go experience"]
+    assert response.fields[0]["mapping"] == "https://jobs.lever.co/acme/2222/apply"
@@ -0,0 +1,102 @@
+from jd_cleaner import boilerplate_rule, clean_job_description, is_irrelevant_keyword
+
+PRIVACY_ENGINEER_JD = """Senior Privacy Engineer
+
+About the role
+You will build the privacy infrastructure that lets us honour GDPR and CCPA data subject requests for millions of users.
+
+Requirements:
+- 5+ years of experience building data protection or privacy engineering systems
+- Deep knowledge of GDPR, CCPA and how personal data flows through large systems
+- Familiarity with privacy policy and consent management tooling
+
+We use cookies to improve your experience. By clicking Accept All you consent to our use of cookies. See our Privacy Policy.
+
+Acme is an equal opportunity employer. We consider all applicants without regard to race, color, religion, sex, sexual orientation, gender identity, national origin, disability, or protected veteran status.
+"""
+
+# Scraped pages often come as one line per element with no blank lines
+ACCESSIBILITY_JD = """Accessibility Engineer
+Responsibilities
+Audit our web and mobile apps against WCAG 2.2 and fix what falls short
+Work with designers so people with disabilities can use every flow
+Qualifications
+Screen reader testing with VoiceOver and NVDA
+Apply now
+Copyright 2024 Acme Inc. All rights reserved."""
+
+DATA_PLATFORM_JD = """Data Platform Engineer
+
+We are looking for an engineer to own the pipelines that process personal data for our analytics products.
+
+What you'll do
+- Build GDPR-compliant deletion and retention jobs
+- Operate our Kafka and Spark clusters
+
+Benefits
+Health insurance, 401(k) and a generous learning budget.
+Reasonable accommodations are available for candidates with disabilities; contact recruiting@acme.com.
+
+Apply for this job
+"""
+
+
+def test_privacy_job_keeps_requirements_and_drops_banners():
+    cleaned = clean_job_description(PRIVACY_ENGINEER_JD)
+
+    assert "About the role" in cleaned.text
+    assert "data subject requests" in cleaned.text
+    assert "Deep knowledge of GDPR, CCPA" in cleaned.text
+    assert "privacy policy and consent management tooling" in cleaned.text
+    assert "We use cookies" not in cleaned.text
+    assert "equal opportunity employer" not in cleaned.text
+    assert cleaned.paragraphs_removed == 2
+    assert set(cleaned.rules_hit) == {"cookie", "eeo"}
+    assert cleaned.tokens_removed > 0
+
+
+def test_accessibility_job_keeps_disability_content_and_drops_chrome_lines():
+    cleaned = clean_job_description(ACCESSIBILITY_JD)
+
+    assert "people with disabilities can use every flow" in cleaned.text
+    assert "WCAG 2.2" in cleaned.text
+    assert "Screen reader testing" in cleaned.text
+    assert "Apply now" not in cleaned.text
+    assert "All rights reserved" not in cleaned.text
+
+
+def test_mixed_paragraph_loses_only_its_boilerplate_line():
+    cleaned = clean_job_description(DATA_PLATFORM_JD)
+
+    assert "process personal data for our analytics products" in cleaned.text
+    assert "Build GDPR-compliant deletion and retention jobs" in cleaned.text
+    assert "Health insurance, 401(k)" in cleaned.text
+    assert "Reasonable accommodations" not in cleaned.text
+    assert "Apply for this job" not in cleaned.text
+    assert cleaned.lines_removed == 1
+
+
+def test_text_under_requirement_heading_is_never_removed():
+    jd = "Senior Engineer\nRequirements:\n- Copyright and licensing compliance reviews\n- Cookie consent platform migrations\n"
+    assert clean_job_description(jd).text == jd
+
+
+def test_single_mention_is_not_boilerplate():
+    assert boilerplate_rule("You will partner with legal on GDPR questions for our EU launch.") == ""
+    assert boilerplate_rule("Acme is an equal opportunity employer.") == "eeo"
+    assert boilerplate_rule("First name") == "form"
+
+
+def test_clean_description_is_returned_unchanged():
+    jd = "Backend Engineer\n\nBuild APIs in Go and Postgres.\n\nYou have 3+ years of experience."
+    cleaned = clean_job_description(jd)
+    assert cleaned.text == jd
+    assert cleaned.tokens_removed == 0
+
+
+def test_irrelevant_keyword_rules():
+    assert is_irrelevant_keyword("cookie preferences")
+    assert is_irrelevant_keyword("5 years of experience")
+    assert is_irrelevant_keyword("analytics")
+    assert not is_irrelevant_keyword("Kubernetes")
+    assert not is_irrelevant_keyword("performance tuning of distributed databases")
@@ -0,0 +1,88 @@
+import asyncio
+import errno
+
+import latex_compiler
+from latex_compiler import FormatCache, LatexCompiler, PDFCache, split_preamble
+
+LATEX = "\\documentclass{article}\n\\usepackage{geometry}\n\\begin{document}\nHello\n\\end{document}\n"
+
+
+class FakePdflatex:
+    """Stands in for run_pdflatex: dumps a format for -ini runs, writes a PDF otherwise"""
+
+    def __init__(self, fail_build=False):
+        self.fail_build = fail_build
+        self.calls = []
+
+    async def __call__(self, args, timeout, env=None):
+        self.calls.append(args)
+        outdir = args[args.index("-output-directory") + 1]
+        if "-ini" in args:
+            if self.fail_build:
+                raise RuntimeError("pdflatex missing")
+            jobname = next(arg for arg in args if arg.startswith("-jobname="))[len("-jobname="):]
+            with open(f"{outdir}/{jobname}.fmt", "wb") as fmt:
+                fmt.write(b"fmt")
+            return 0, ""
+        with open(f"{outdir}/resume.pdf", "wb") as pdf:
+            pdf.write(b"%PDF-fast" if any(arg.startswith("-fmt=") for arg in args) else b"%PDF-full")
+        return 0, ""
+
+
+def compile_with(fake, tmp_path):
+    formats = FormatCache(tmp_path / "fmt", max_entries=5, build_timeout=1)
+    compiler = LatexCompiler(max_workers=1, max_queue=1, pass_timeout=1, formats=formats)
+    return asyncio.run(compiler.compile(LATEX)), formats
+
+
+def test_split_preamble():
+    preamble, body = split_preamble(LATEX)
+    assert preamble.startswith("\\documentclass") and body.startswith("\\begin{document}")
+    assert split_preamble("\\begin{document}x\\end{document}") == ("", "\\begin{document}x\\end{document}")
+
+
+def test_cached_format_is_used(monkeypatch, tmp_path):
+    fake = FakePdflatex()
+    monkeypatch.setattr(latex_compiler, "run_pdflatex", fake)
+    pdf, formats = compile_with(fake, tmp_path)
+    assert pdf == b"%PDF-fast"
+    assert formats.stats()["builds"] == 1 and formats.stats()["formats"] == 1
+
+
+def test_cross_device_rename_falls_back_to_full_compile(monkeypatch, tmp_path):
+    fake = FakePdflatex()
+    monkeypatch.setattr(latex_compiler, "run_pdflatex", fake)
+
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(latex_compiler.os, "replace", cross_device)
+    pdf, formats = compile_with(fake, tmp_path)
+    assert pdf == b"%PDF-full"
+    assert formats.build_failures == 1 and formats.builds == 0
+    assert not any(arg.startswith("-fmt=") for args in fake.calls for arg in args)
+    assert list((tmp_path / "fmt").iterdir()) == []  # the build directory is cleaned up
+
+
+def test_build_error_falls_back_and_is_not_retried(monkeypatch, tmp_path):
+    fake = FakePdflatex(fail_build=True)
+    monkeypatch.setattr(latex_compiler, "run_pdflatex", fake)
+    formats = FormatCache(tmp_path / "fmt", max_entries=5, build_timeout=1)
+    compiler = LatexCompiler(max_workers=1, max_queue=1, pass_timeout=1, formats=formats)
+
+    async def run():
+        first = await compiler.compile(LATEX)
+        second = await compiler.compile(LATEX + "% edited\n")
+        return first, second
+
+    assert asyncio.run(run()) == (b"%PDF-full", b"%PDF-full")
+    assert formats.build_failures == 1
+    assert sum("-ini" in args for args in fake.calls) == 1
+
+
+def test_pdf_cache_set_leaves_no_temp_files(tmp_path):
+    cache = PDFCache(tmp_path, max_entries=5, max_bytes=1 << 20)
+    cache.set("abc", b"%PDF-1")
+    cache.set("abc", b"%PDF-2")
+    assert cache.get("abc") == b"%PDF-2"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["abc.pdf"]
@@ -0,0 +1,66 @@
+from latex_tokenizer import tokenize_latex
+
+RESUME = r"""\documentclass[11pt]{article}
+\usepackage{geometry}
+\begin{document}
+\textbf{Jane Doe} \hfill jane@example.com
+% contact details above
+\section{Experience}
+\textbf{Acme Corp}{2020 -- 2024}
+\begin{itemize}
+  \item Cut p99 latency by 40\% with Python~and Kafka
+  \item Led migration to \textit{PostgreSQL} \& Redis
+\end{itemize}
+\section{Skills}
+Python, Go, Kubernetes
+\end{document}
+"""
+
+
+def test_text_drops_markup_comments_and_preamble():
+    document = tokenize_latex(RESUME)
+    assert document.text.startswith("Jane Doe")
+    assert "contact details" not in document.text
+    assert "geometry" not in document.text
+    assert "40% with Python and Kafka" in document.text
+    assert "Acme Corp 2020 -- 2024" in document.text
+    assert "PostgreSQL & Redis" in document.text
+
+
+def test_every_span_maps_text_back_to_the_same_source_characters():
+    document = tokenize_latex(RESUME)
+    for span in document.spans:
+        assert span.text_end - span.text_start == span.source_end - span.source_start
+        for offset in range(span.text_end - span.text_start):
+            text_char = document.text[span.text_start + offset]
+            source_char = RESUME[span.source_start + offset]
+            assert text_char == source_char or text_char == " "
+
+
+def test_source_range_locates_a_keyword_for_patching():
+    document = tokenize_latex(RESUME)
+    start = document.text.index("PostgreSQL")
+    source_start, source_end = document.source_range(start, start + len("PostgreSQL"))
+    assert RESUME[source_start:source_end] == "PostgreSQL"
+
+    start = document.text.index("Kubernetes")
+    source_start, source_end = document.source_range(start, start + len("Kubernetes"))
+    patched = RESUME[:source_start] + "Kubernetes, Terraform" + RESUME[source_end:]
+    assert "Python, Go, Kubernetes, Terraform" in tokenize_latex(patched).text
+
+
+def test_sections_cover_their_text_and_source():
+    document = tokenize_latex(RESUME)
+    assert [section.title for section in document.sections] == ["Experience", "Skills"]
+
+    experience, skills = document.sections
+    assert document.section_text(experience).startswith("Acme Corp")
+    assert document.section_text(skills) == "Python, Go, Kubernetes"
+    assert RESUME[experience.source_start:].startswith(r"\section{Experience}")
+    assert RESUME[skills.source_start:skills.source_end].strip().endswith("Kubernetes")
+
+
+def test_offsets_outside_the_text_have_no_source():
+    document = tokenize_latex(RESUME)
+    assert document.source_offset(len(document.text)) is None
+    assert document.source_offset(-1) is None
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import llm_client
+from disk_cache import DiskCache
+from llm_scheduler import PRIORITY_INTERACTIVE, llm_priority
+from prompts import FAST_REWRITE_SYSTEM_PROMPT, RESUME_PARSE_SYSTEM_PROMPT
+
+
+def test_missing_api_key_does_not_break_startup(monkeypatch):
+    monkeypatch.setattr(llm_client, "OPENAI_API_KEY", "")
+    monkeypatch.setattr(llm_client, "_client", None)
+
+    assert llm_client.init_llm_client() is None
+    with pytest.raises(ValueError, match="API key not set"):
+        llm_client.get_llm_client()
+
+
+def test_client_is_created_once(monkeypatch):
+    monkeypatch.setattr(llm_client, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(llm_client, "_client", None)
+
+    client = llm_client.init_llm_client()
+    assert client is not None
+    assert llm_client.get_llm_client() is client
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """
+    Replaces the provider stream: each call pops (seconds before first token, text[, error]) from `plans`
+    and raises error, if given, after the text
+    """
+    plans = []
+    monkeypatch.setattr(llm_client, "_check_api_key", lambda: None)
+    monkeypatch.setattr(llm_client, "get_llm_client", lambda: None)
+    monkeypatch.setattr(llm_client, "_first_token_samples", llm_client.defaultdict(lambda: llm_client.deque(maxlen=200)))
+    monkeypatch.setattr(llm_client, "llm_call_stats", dict.fromkeys(llm_client.llm_call_stats, 0))
+
+    async def stream(client, prompt, system_prompt=None, temperature=0.0):
+        delay, text, *error = plans.pop(0)
+        await asyncio.sleep(delay)
+        for word in filter(None, text.split(" ")):
+            yield word + " "
+        if error:
+            raise error[0]
+
+    monkeypatch.setattr(llm_client, "_stream_deltas", stream)
+    return plans
+
+
+def test_call_deadline_bounds_slow_attempts(monkeypatch):
+    async def slow_completion(*args):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(llm_client, "_check_api_key", lambda: None)
+    monkeypatch.setattr(llm_client, "_completion", slow_completion)
+    monkeypatch.setattr(llm_client, "LLM_CALL_DEADLINE", 0.05)
+    monkeypatch.setattr(llm_client, "LLM_HEDGE_ENABLED", False)
+
+    started = time.monotonic()
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(llm_client._call_llm_uncached("prompt"))
+    assert error.value.status_code == 504
+    assert time.monotonic() - started < 1
+
+
+def test_hedge_delay_uses_first_token_samples_per_prompt_type(fake_provider, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_HEDGE_DEFAULT_DELAY", 30.0)
+    for i in range(llm_client.LLM_HEDGE_MIN_SAMPLES):
+        llm_client._record_first_token(FAST_REWRITE_SYSTEM_PROMPT, 0.5 + i / 100)
+
+    assert 0.5 < llm_client._hedge_delay(FAST_REWRITE_SYSTEM_PROMPT) < 0.7
+    assert llm_client._hedge_delay(RESUME_PARSE_SYSTEM_PROMPT) == 30.0
+
+
+def test_hedge_keeps_the_attempt_that_answers_first(fake_provider, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_HEDGE_DEFAULT_DELAY", 0.05)
+    fake_provider.extend([(2.0, "slow primary"), (0.0, "fast hedge")])
+
+    async def run():
+        llm_priority.set(PRIORITY_INTERACTIVE)
+        return await llm_client._hedged_completion("prompt", FAST_REWRITE_SYSTEM_PROMPT)
+
+    started = time.monotonic()
+    assert asyncio.run(run()) == "fast hedge "
+    assert time.monotonic() - started < 1
+    assert llm_client.llm_call_stats["hedges"] == 1
+    assert llm_client.llm_call_stats["hedge_wins"] == 1
+    assert len(llm_client._first_token_samples["fast_rewrite"]) == 1
+
+
+def test_no_hedge_when_the_first_token_arrives_in_time(fake_provider, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_HEDGE_DEFAULT_DELAY", 0.5)
+    fake_provider.append((0.0, "primary answer"))
+
+    assert asyncio.run(llm_client._hedged_completion("prompt", FAST_REWRITE_SYSTEM_PROMPT)) == "primary answer "
+    assert llm_client.llm_call_stats["hedges"] == 0
+
+
+def collect_stream():
+    async def run():
+        return [delta async for delta in llm_client.stream_llm("prompt", FAST_REWRITE_SYSTEM_PROMPT, use_cache=False)]
+    return asyncio.run(run())
+
+
+def test_stream_is_retried_when_it_fails_before_the_first_token(fake_provider, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_RETRY_BASE_DELAY", 0.01)
+    fake_provider.extend([(0.0, "", asyncio.TimeoutError()), (0.0, "hello world")])
+
+    assert "".join(collect_stream()) == "hello world "
+    assert llm_client.llm_call_stats["retries"] == 1
+
+
+def test_stream_failure_after_the_first_token_is_final(fake_provider, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_RETRY_BASE_DELAY", 0.01)
+    fake_provider.extend([(0.0, "partial", asyncio.TimeoutError()), (0.0, "never sent")])
+
+    with pytest.raises(HTTPException) as error:
+        collect_stream()
+    assert error.value.status_code == 504
+    assert llm_client.llm_call_stats["retries"] == 0
+    assert fake_provider == [(0.0, "never sent")]
+
+
+def test_stream_deadline_bounds_the_whole_stream(fake_provider, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_CALL_DEADLINE", 0.05)
+    fake_provider.append((5.0, "too late"))
+
+    started = time.monotonic()
+    with pytest.raises(HTTPException) as error:
+        collect_stream()
+    assert error.value.status_code == 504
+    assert "deadline" in error.value.detail
+    assert llm_client.llm_call_stats["deadline_exceeded"] == 1
+    assert time.monotonic() - started < 1
+    assert llm_client.llm_scheduler.active == 0  # the cancelled attempt gave its slot back
+
+
+def test_responses_rejected_by_validate_are_not_cached(monkeypatch, tmp_path):
+    responses = ["not json at all", '{"skills": ["Python"]}']
+
+    async def fake_uncached(prompt, system_prompt=None, temperature=0.0):
+        return responses.pop(0)
+
+    monkeypatch.setattr(llm_client, "llm_cache", DiskCache(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm_client, "_call_llm_uncached", fake_uncached)
+
+    def parse(text):
+        return json.loads(text)
+
+    first = asyncio.run(llm_client.call_llm("parse this", "system", validate=parse))
+    second = asyncio.run(llm_client.call_llm("parse this", "system", validate=parse))
+    third = asyncio.run(llm_client.call_llm("parse this", "system", validate=parse))
+    assert first == "not json at all"
+    assert second == third == '{"skills": ["Python"]}'
+    assert responses == []  # the good response was served from the cache the third time
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from llm_scheduler import (
+    PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, LLMRateLimited, LLMScheduler, estimate_tokens
+)
+from prompt_budget import count_tokens
+
+
+def test_estimate_matches_the_prompt_budget_counter():
+    system_prompt = "You are a resume parser. Return only valid JSON."
+    prompt = "Parse this resume:\nJane Doe - Senior Engineer at Acme (2019-2024), Python, Kafka, AWS."
+    assert estimate_tokens(system_prompt, prompt) == count_tokens(system_prompt) + count_tokens(prompt)
+    assert estimate_tokens(None, "") == 0
+
+
+def test_waiters_are_admitted_by_priority_then_arrival():
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0)
+        order = []
+        release = asyncio.Event()
+
+        async def call(name, priority):
+            async with scheduler.slot(1, priority):
+                order.append(name)
+                if name == "running":
+                    await release.wait()
+
+        running = asyncio.create_task(call("running", PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(call("background-1", PRIORITY_BACKGROUND)),
+            asyncio.create_task(call("interactive", PRIORITY_INTERACTIVE)),
+            asyncio.create_task(call("background-2", PRIORITY_BACKGROUND)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 3
+        release.set()
+        await asyncio.gather(running, *waiting)
+        return order, scheduler
+
+    order, scheduler = asyncio.run(run())
+    assert order == ["running", "interactive", "background-1", "background-2"]
+    assert scheduler.active == 0
+
+
+def test_token_bucket_delays_admission_until_refilled():
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=4, tokens_per_minute=6000)  # 100 tokens per second
+        async with scheduler.slot(6000):
+            pass
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with scheduler.slot(10):
+            return loop.time() - started
+
+    assert 0.05 <= asyncio.run(run()) < 1
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0, max_queue=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(LLMRateLimited) as error:
+            async with scheduler.slot(1):
+                pass
+        release.set()
+        await asyncio.gather(holder, queued)
+        return error.value, scheduler
+
+    error, scheduler = asyncio.run(run())
+    assert error.status_code == 429
+    assert int(error.headers["Retry-After"]) >= 1
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        async with scheduler.slot(1):
+            pass
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.active == 0
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_cancelled_waiters_do_not_fill_the_queue():
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0, max_queue=2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        for _ in range(5):  # callers that disconnect while still queued
+            waiter = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        queued = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 2
+        release.set()
+        await asyncio.gather(holder, *queued)
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.stats()["rejected"] == 0
+    assert scheduler.active == 0 and scheduler.stats()["queued"] == 0
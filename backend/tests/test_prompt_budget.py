@@ -0,0 +1,74 @@
+from prompt_budget import (
+    OMISSION_MARKER, budget_prompt_input, count_tokens, fit_job_description, fit_to_budget, score_paragraphs,
+    token_budget
+)
+
+JOB_DESCRIPTION = """Senior Backend Engineer - Acme Payments
+
+About us
+Acme is a fast-growing fintech company founded in 2015. We believe in transparency, ownership and having fun together. Our offices are in Berlin, Lisbon and Toronto and we love team offsites.
+
+Requirements
+5+ years of experience with Python and PostgreSQL in production.
+Experience with Kafka, Docker and Kubernetes is required.
+
+Benefits
+Generous vacation, a yearly learning budget, home office stipend, gym membership, and free lunch every Friday at the office.
+
+Acme is an equal opportunity employer. We consider all applicants without regard to race, color, religion, sex, national origin, disability or veteran status."""
+
+
+def test_count_tokens():
+    assert count_tokens("") == 0
+    assert count_tokens("Python") >= 1
+    assert count_tokens("Python and PostgreSQL") < count_tokens("Python and PostgreSQL " * 10)
+
+
+def test_requirements_outrank_company_benefits_and_eeo_paragraphs():
+    values = {unit.split("\n")[0]: value for unit, value in score_paragraphs(JOB_DESCRIPTION)}
+    requirements = values["Requirements"]
+    assert requirements > values["About us"]
+    assert requirements > values["Benefits"]
+    assert requirements > values["Acme is an equal opportunity employer. We consider all applicants without regard "
+                                 "to race, color, religion, sex, national origin, disability or veteran status."]
+
+
+def test_job_description_is_cut_to_the_budget_keeping_requirements():
+    budget = count_tokens(JOB_DESCRIPTION) // 3
+    fitted = fit_job_description(JOB_DESCRIPTION, budget)
+
+    assert count_tokens(fitted) <= budget
+    assert "Kafka, Docker and Kubernetes" in fitted
+    assert "Senior Backend Engineer" in fitted
+    assert "Generous vacation" not in fitted and "equal opportunity" not in fitted
+    assert OMISSION_MARKER in fitted
+
+
+def test_every_budget_is_respected():
+    for budget in range(5, count_tokens(JOB_DESCRIPTION), 7):
+        assert count_tokens(fit_job_description(JOB_DESCRIPTION, budget)) <= budget
+
+
+def test_text_within_budget_is_returned_unchanged():
+    assert fit_job_description(JOB_DESCRIPTION, 10_000) is JOB_DESCRIPTION
+    assert budget_prompt_input("short resume", "resume", "gpt-5-mini") == "short resume"
+
+
+def test_ordered_inputs_keep_head_and_tail():
+    text = "\n".join(f"line {i}" for i in range(500))
+    fitted = fit_to_budget(text, 100)
+    assert fitted.startswith("line 0") and fitted.endswith("line 499")
+    assert OMISSION_MARKER in fitted and count_tokens(fitted) <= 100
+
+
+def test_larger_models_get_larger_budgets():
+    assert token_budget("job_description", "gpt-5-mini") > token_budget("job_description", "gpt-3.5-turbo")
+    assert token_budget("resume", "unknown-model") == token_budget("resume", "some-other-model")
+
+
+def test_trimmed_job_description_keeps_paragraph_breaks():
+    fitted = fit_job_description(JOB_DESCRIPTION, count_tokens(JOB_DESCRIPTION) // 2)
+    paragraphs = fitted.split("\n\n")
+    assert "Senior Backend Engineer - Acme Payments" in paragraphs
+    assert any(paragraph.startswith("Requirements\n5+ years") for paragraph in paragraphs)
+    assert OMISSION_MARKER in paragraphs
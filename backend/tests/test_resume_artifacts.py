@@ -0,0 +1,99 @@
+import asyncio
+
+import main
+import resume_artifacts as artifacts_module
+from disk_cache import DiskCache
+from memory_cache import LRUCache
+from resume_artifacts import ResumeArtifactStore
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+Acme Corp, Software Engineer, Jan 2020 -- Present. Built services in Python and Kafka.
+\section{Skills}
+Python, Kafka, PostgreSQL
+\end{document}
+"""
+
+
+def store_at(path):
+    """One worker's view of a shared artifact file"""
+    return ResumeArtifactStore(LRUCache(max_entries=8, backend=DiskCache(path)))
+
+
+def test_artifacts_are_computed_once_and_shared_between_workers(tmp_path):
+    first, second = store_at(tmp_path / "artifacts.sqlite3"), store_at(tmp_path / "artifacts.sqlite3")
+
+    artifacts = first.get(RESUME, True)
+    assert "python" in artifacts["skills"]
+    assert [title for title, _ in first.sections(RESUME, True)] == ["Experience", "Skills"]
+
+    first.set_parsed(RESUME, True, "parser-a", {"name": "Jane"})
+    assert second.get_parsed(RESUME, True, "parser-a") == {"name": "Jane"}
+    assert second.get_parsed(RESUME, True, "parser-b") is None
+    assert first.computed == 1 and second.computed == 0
+
+
+def test_parses_from_different_workers_do_not_overwrite_each_other(tmp_path):
+    first, second = store_at(tmp_path / "artifacts.sqlite3"), store_at(tmp_path / "artifacts.sqlite3")
+    first.get(RESUME, True)
+    second.get(RESUME, True)
+
+    first.set_parsed(RESUME, True, "parser-a", {"name": "A"})
+    second.set_parsed(RESUME, True, "parser-b", {"name": "B"})
+
+    third = store_at(tmp_path / "artifacts.sqlite3")
+    assert third.get_parsed(RESUME, True, "parser-a") == {"name": "A"}
+    assert third.get_parsed(RESUME, True, "parser-b") == {"name": "B"}
+
+
+def test_artifact_key_changes_with_the_extraction_version(tmp_path, monkeypatch):
+    store = store_at(tmp_path / "artifacts.sqlite3")
+    store.get(RESUME, True)
+    old_key = store.key(RESUME, True)
+
+    monkeypatch.setattr(artifacts_module, "ARTIFACT_KEY_VERSION", "next")
+    assert store.key(RESUME, True) != old_key
+    store_at(tmp_path / "artifacts.sqlite3").get(RESUME, True)
+    assert store_at(tmp_path / "artifacts.sqlite3").cache.backend.stats()["entries"] == 2
+
+
+def test_only_one_worker_claims_the_startup_preparse(tmp_path):
+    first, second = store_at(tmp_path / "artifacts.sqlite3"), store_at(tmp_path / "artifacts.sqlite3")
+
+    assert first.claim_preparse(RESUME, True, "parser-a")
+    assert not second.claim_preparse(RESUME, True, "parser-a")
+    assert second.claim_preparse(RESUME, True, "parser-b")
+
+
+def test_expired_claim_can_be_taken_again(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+    assert cache.add("marker", "1", max_age=60)
+    assert not cache.add("marker", "2", max_age=60)
+    assert cache.add("marker", "3", max_age=0)
+    assert cache.get("marker") == "3"
+
+
+def test_warmup_skips_the_llm_parse_without_an_api_key(tmp_path, monkeypatch):
+    resumes = tmp_path / "original"
+    resumes.mkdir()
+    (resumes / "resume.tex").write_text(RESUME, encoding="utf-8")
+    parsed = []
+
+    async def fake_parse(resume, is_latex_format):
+        parsed.append(resume)
+
+    monkeypatch.setattr(main, "resume_index", main.ResumeIndex(resumes, "missing", ["resume.tex"]))
+    monkeypatch.setattr(main, "resume_artifacts", store_at(tmp_path / "artifacts.sqlite3"))
+    monkeypatch.setattr(main, "parse_resume_artifact", fake_parse)
+    monkeypatch.setattr(main, "RESUME_ARTIFACT_PREPARSE", True)
+
+    monkeypatch.setattr(main, "llm_api_key_configured", lambda: False)
+    asyncio.run(main.warm_resume_artifacts())
+    assert parsed == []
+    assert main.resume_artifacts.computed == 1
+
+    monkeypatch.setattr(main, "llm_api_key_configured", lambda: True)
+    asyncio.run(main.warm_resume_artifacts())
+    asyncio.run(main.warm_resume_artifacts())  # a second worker: the claim is taken
+    assert parsed == [RESUME]
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+import section_rewriter
+from llm_scheduler import LLMRateLimited
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+Built things.
+\section{Education}
+BSc.
+\section{Skills}
+Python.
+\end{document}
+"""
+
+
+def fail_with(monkeypatch, error):
+    calls = []
+
+    async def call_llm(prompt, system_prompt, temperature=None):
+        calls.append(prompt)
+        raise error
+
+    monkeypatch.setattr(section_rewriter, "call_llm", call_llm)
+    return calls
+
+
+def test_all_sections_failing_falls_back_to_whole_rewrite(monkeypatch):
+    calls = fail_with(monkeypatch, ValueError("OpenAI API key not set"))
+    assert asyncio.run(section_rewriter.rewrite_sections_parallel(RESUME, "Python")) is None
+    assert len(calls) == 2  # Experience and Skills; Education is kept verbatim
+
+
+def test_all_sections_rate_limited_reraises_429(monkeypatch):
+    fail_with(monkeypatch, LLMRateLimited("queue is full", retry_after=3))
+    with pytest.raises(LLMRateLimited) as excinfo:
+        asyncio.run(section_rewriter.rewrite_sections_parallel(RESUME, "Python"))
+    assert excinfo.value.headers["Retry-After"] == "3"
+
+
+def test_partial_failure_keeps_original_section(monkeypatch):
+    async def call_llm(prompt, system_prompt, temperature=None):
+        if "Built things." in prompt:
+            raise ValueError("boom")
+        return "\\section{Skills}\nPython, Go."
+
+    monkeypatch.setattr(section_rewriter, "call_llm", call_llm)
+    result = asyncio.run(section_rewriter.rewrite_sections_parallel(RESUME, "Python"))
+    assert "Built things." in result and "Python, Go." in result and "BSc." in result
@@ -0,0 +1,28 @@
+from skill_matcher import SkillMatcher, get_skill_matcher
+
+
+def test_whole_word_matches_only():
+    matcher = SkillMatcher(["java", "javascript", "c", "c++"])
+    terms = [term for _, _, term in matcher.find_spans("Java and JavaScript, C++ and C# plus javascripting")]
+    assert terms == ["java", "javascript", "c++", "c"]
+
+
+def test_longest_match_wins_over_nested_term():
+    matcher = SkillMatcher(["learning", "machine learning"])
+    assert matcher.find_spans("applied machine learning") == [(8, 24, "machine learning")]
+
+
+def test_punctuated_terms_and_case_folding():
+    matcher = SkillMatcher(["Node.js", ".NET", "C#", "AWS"])
+    text = "Built with node.js on AWS and .NET (C#); aws-cdk; laws"
+    spans = matcher.find_spans(text)
+    assert [term for _, _, term in spans] == ["node.js", "aws", ".net", "c#", "aws"]
+    assert all(text[start:end].lower() == term for start, end, term in spans)
+
+
+def test_find_all_is_distinct():
+    assert SkillMatcher(["aws"]).find_all("aws AWS Aws") == ["aws"]
+
+
+def test_taxonomy_matcher_is_cached():
+    assert get_skill_matcher() is get_skill_matcher()
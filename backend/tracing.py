@@ -0,0 +1,94 @@
+"""
+Lightweight per-request stage timing
+Handlers wrap stages in `with span("name"):`; the timings go out in a Server-Timing header
+and, if TRACE_LOG_PATH is set, as one JSON line per request ("-" writes to stdout)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH")
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("current_trace", default=None)
+_trace_log_lock = threading.Lock()
+
+
+class RequestTrace:
+    """Stage spans recorded while handling one request"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.spans: List[Dict] = []
+
+    def add(self, name: str, start: float, duration: float):
+        self.spans.append({
+            "name": name,
+            "start_ms": round((start - self.started) * 1000, 2),
+            "duration_ms": round(duration * 1000, 2),
+        })
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; repeated stages (e.g. two LLM calls) are summed"""
+        totals: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        for item in self.spans:
+            totals[item["name"]] = totals.get(item["name"], 0.0) + item["duration_ms"]
+            counts[item["name"]] = counts.get(item["name"], 0) + 1
+        entries = []
+        for name, duration in totals.items():
+            entry = f"{name};dur={duration:.1f}"
+            if counts[name] > 1:
+                entry += f';desc="{counts[name]} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_json(self, status: int) -> str:
+        return json.dumps({
+            "ts": time.time(),
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "spans": self.spans,
+        })
+
+
+def start_trace(method: str, path: str) -> RequestTrace:
+    """Begin recording spans for the current request"""
+    trace = RequestTrace(method, path)
+    _current_trace.set(trace)
+    return trace
+
+
+@contextmanager
+def span(name: str):
+    """Time a stage of the current request (no-op outside a traced request)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter() - start)
+
+
+def write_trace_line(trace: RequestTrace, status: int):
+    """Append the request's spans as one JSON line to TRACE_LOG_PATH (blocking; call off the event loop)"""
+    if not TRACE_LOG_PATH:
+        return
+    line = trace.to_json(status)
+    if TRACE_LOG_PATH == "-":
+        print(line)
+        return
+    with _trace_log_lock, open(TRACE_LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
@@ -5,18 +5,15 @@ Validation logic to detect hallucinated content in rewritten resumes
 import re
 from typing import List, Dict
 
+from skill_matcher import get_skill_matcher
+
 
 def extract_skills_from_resume(resume: str) -> List[str]:
     """
     Extract skills mentioned in resume
-    TODO: Improve skill extraction with better NLP or comprehensive skill database
+    Skills come from data/skills.txt, matched in one pass by the compiled Aho-Corasick automaton
     """
-    # Common technical skills patterns
-    # TODO: Expand this list or use a skills database
-    skills_pattern = r'\b(?:Python|Java|JavaScript|TypeScript|React|Node\.js|SQL|AWS|Docker|Kubernetes|Git|Linux|HTML|CSS|Machine Learning|AI|Data Science|TensorFlow|PyTorch|C\+\+|C#|Go|Rust|PHP|Ruby|Swift|Kotlin|Angular|Vue|Django|Flask|FastAPI|Spring|Express|MongoDB|PostgreSQL|MySQL|Redis|Elasticsearch|GraphQL|REST|API|Microservices|DevOps|CI/CD|Jenkins|GitLab|GitHub|Agile|Scrum|JIRA|Confluence|Tableau|Power BI|Excel|Pandas|NumPy|Scikit-learn|NLP|Computer Vision|Deep Learning|Neural Networks|Statistics|Mathematics|Algorithms|Data Structures|Object-Oriented Programming|Functional Programming|Test-Driven Development|Unit Testing|Integration Testing|System Design|Architecture|Cloud Computing|Azure|GCP|Kubernetes|Terraform|Ansible|Chef|Puppet|Monitoring|Logging|Debugging|Performance Optimization|Security|Authentication|Authorization|Encryption|SSL|TLS|HTTPS|OAuth|JWT|GraphQL|RESTful APIs|Microservices|Serverless|Lambda|S3|EC2|RDS|DynamoDB|ElastiCache|CloudFront|Route53|VPC|IAM|SNS|SQS|Kinesis|Redshift|EMR|SageMaker|Comprehend|Rekognition|Polly|Lex|Alexa|Google Assistant|Siri|Natural Language Processing|Speech Recognition|Computer Vision|Image Processing|Video Processing|Audio Processing|Signal Processing|Data Mining|Data Warehousing|ETL|Data Pipeline|Data Lake|Data Warehouse|Business Intelligence|Analytics|Reporting|Dashboard|Visualization|Data Modeling|Database Design|Normalization|Indexing|Query Optimization|Transaction Management|ACID|CAP Theorem|Distributed Systems|Load Balancing|Caching|CDN|Message Queue|Event Streaming|Pub/Sub|WebSocket|gRPC|GraphQL|REST|SOAP|XML|JSON|YAML|Protobuf|Avro|Parquet|ORC|CSV|TSV|JSON Lines|Avro|Protocol Buffers|MessagePack|BSON|HDF5|NetCDF|Zarr|Arrow|Feather|Pickle|Joblib|H5py|Zarr|Xarray|Dask|Ray|Spark|Hadoop|MapReduce|Hive|Pig|Impala|Presto|Trino|Drill|Kylin|Druid|Pinot|ClickHouse|TimescaleDB|InfluxDB|Prometheus|Grafana|Kibana|Elasticsearch|Solr|Lucene|Whoosh|Sphinx|Xapian|Meilisearch|Typesense|Algolia|MongoDB|Cassandra|CouchDB|Riak|Neo4j|ArangoDB|OrientDB|JanusGraph|Dgraph|TigerGraph|Redis|Memcached|Hazelcast|Ignite|Coherence|GemFire|Terracotta|Ehcache|Caffeine|Guava Cache|Spring Cache|Hibernate|JPA|SQLAlchemy|Django ORM|ActiveRecord|Sequelize|TypeORM|Prisma|Mongoose|Motor|PyMongo|MongoEngine|MongoKit|MongoDB Compass|Robo 3T|Studio 3T|MongoDB Atlas|MongoDB Cloud|MongoDB Realm|MongoDB Stitch|MongoDB Charts|MongoDB Connector|MongoDB Spark Connector|MongoDB Kafka Connector|MongoDB BI Connector|MongoDB Connector for BI|MongoDB Connector for Apache Spark|MongoDB Connector for Apache Kafka|MongoDB Connector for Apache Flink|MongoDB Connector for Apache Storm|MongoDB Connector for Apache Samza|MongoDB Connector for Apache Beam|MongoDB Connector for Apache NiFi|MongoDB Connector for Apache Airflow|MongoDB Connector for Apache Superset|MongoDB Connector for Tableau|MongoDB Connector for Power BI|MongoDB Connector for Qlik|MongoDB Connector for Looker|MongoDB Connector for Metabase|MongoDB Connector for Redash|MongoDB Connector for Grafana|MongoDB Connector for Kibana|MongoDB Connector for Elasticsearch|MongoDB Connector for Solr|MongoDB Connector for Lucene|MongoDB Connector for Whoosh|MongoDB Connector for Sphinx|MongoDB Connector for Xapian|MongoDB Connector for Meilisearch|MongoDB Connector for Typesense|MongoDB Connector for Algolia)\b'
-    
-    skills = re.findall(skills_pattern, resume, re.IGNORECASE)
-    return list(set([s.lower() for s in skills]))
+    return get_skill_matcher().find_all(resume)
 
 
 def extract_companies_from_resume(resume: str) -> List[str]:
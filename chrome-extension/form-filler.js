@@ -30,6 +30,59 @@ class SmartFormFiller {
     };
   }
 
+  /**
+   * Identity of the job application on this page: origin plus requisition ID, or origin plus the
+   * job path without its apply-step segments (mirrors application_key() in backend/form_sessions.py)
+   */
+  getApplicationKey() {
+    const url = new URL(window.location.href);
+    const requisitionParams = ['gh_jid', 'token', 'jobid', 'job_id', 'jid', 'jobreqid', 'requisitionid', 'reqid', 'req', 'postingid'];
+    const params = new Map();
+    url.searchParams.forEach((value, key) => params.set(key.toLowerCase(), value));
+    for (const param of requisitionParams) {
+      if (params.get(param)) {
+        return `${url.hostname}?${param}=${params.get(param)}`;
+      }
+    }
+    const segments = [];
+    for (const segment of url.pathname.split('/')) {
+      if (/^(apply|application$)/i.test(segment)) break;
+      if (segment) segments.push(segment);
+    }
+    return `${url.hostname}/${segments.join('/')}`;
+  }
+
+  /**
+   * ID for the application session on this page, so later steps of a multi-step form are analyzed
+   * incrementally by /analyze-form. A new ID starts whenever the page belongs to a different
+   * application (another job on the same ATS host gets its own session).
+   */
+  getFormSessionId() {
+    const applicationKey = this.getApplicationKey();
+    if (this.formSessionId && this.formSessionKey === applicationKey) {
+      return this.formSessionId;
+    }
+    this.formSessionKey = applicationKey;
+    try {
+      let stored = null;
+      try {
+        stored = JSON.parse(sessionStorage.getItem('sanaai-form-session') || 'null');
+      } catch (e) {
+        stored = null; // value written by an older version (a bare ID)
+      }
+      if (stored && stored.key === applicationKey && stored.id) {
+        this.formSessionId = stored.id;
+      } else {
+        this.formSessionId = crypto.randomUUID();
+        sessionStorage.setItem('sanaai-form-session', JSON.stringify({ key: applicationKey, id: this.formSessionId }));
+      }
+    } catch (e) {
+      // sessionStorage can be unavailable (sandboxed frames); keep the ID for this instance only
+      this.formSessionId = `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    }
+    return this.formSessionId;
+  }
+
   /**
    * Load user profile from backend JSON file
    */
@@ -275,7 +328,8 @@ class SmartFormFiller {
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
               form_html: formHTML,
-              url: window.location.href
+              url: window.location.href,
+              session_id: this.getFormSessionId()
             })
           });
 
@@ -1262,6 +1316,12 @@ class SmartFormFiller {
         return profile.personalInfo?.firstName || profile.personalInfo?.fullName?.split(' ')[0];
       case 'lastName':
         return profile.personalInfo?.lastName || profile.personalInfo?.fullName?.split(' ').slice(1).join(' ');
+      case 'fullName':
+        return profile.personalInfo?.fullName || [profile.personalInfo?.firstName, profile.personalInfo?.lastName].filter(Boolean).join(' ');
+      case 'linkedin':
+        return profile.personalInfo?.linkedin || null;
+      case 'workAuthorization':
+        return profile.personalInfo?.workAuthorization || null;
       case 'email':
         return profile.personalInfo?.email;
       case 'phone':